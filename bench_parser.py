@@ -0,0 +1,343 @@
+"""
+Throughput benchmark for the combat log line parser.
+
+Compares the old sequential parsers (damage -> heal -> taken, regexes built on
+every call) with the compiled `combatlog.LineClassifier` and checks that both
+produce identical event tuples.
+
+    python bench_parser.py                    # 1M synthetic lines (EN + DE mix)
+    python bench_parser.py --lines 200000 --locale en
+    python bench_parser.py --log "C:/.../Combat_2025-10-21.txt"
+    python bench_parser.py --encoding utf-16-le   # raw-bytes path incl. pre-filter
+"""
+
+import argparse
+import random
+import re
+import time
+
+from combatlog import (
+    LOCALE_ANY, BytePrefilter, EntityRegistry, LineClassifier,
+    detect_encoding, parse_lines,
+)
+from combatlog.cache import DEFAULT_CACHE_SIZE
+from combatlog.constants import AA_SKILLS, PET_NAMES
+
+
+###############################################################################
+#######     Reference: sequential parsers as they were in parsingStats  #######
+###############################################################################
+
+def _legacy_parse_damage_line(line):
+    text = line.strip()
+    if not text: return None
+    low = text.lower()
+    if "ihr trefft" in low:
+        m = re.search(
+            r"Ihr trefft\s+(?P<target>.+?)\s+mit der Fertigkeit\s+'(?P<skill>[^']+)'\s+und\s+(?:ihre|seine)\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
+            text, re.IGNORECASE)
+        if m:
+            enemy = m.group("target").strip()
+            skill = m.group("skill").strip()
+            dmg = int(re.sub(r"[^\d]", "", m.group("amt")))
+            if skill in AA_SKILLS:
+                s_low = skill.lower()
+                if "bow" in s_low or "bogen" in s_low:
+                    skill = "Autoattack (ranged)"
+                else:
+                    skill = "Autoattack (melee)"
+            return ("hit", dmg, enemy, skill)
+        m = re.search(
+            r"Ihr trefft\s+(?P<target>.+?)\s+und\s+(?:ihre|seine)\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
+            text, re.IGNORECASE)
+        if m:
+            enemy = m.group("target").strip()
+            dmg = int(re.sub(r"[^\d]", "", m.group("amt")))
+            return ("hit", dmg, enemy, "DoT damage")
+    hit_kw = " hit " if " hit " in text else (" hits " if " hits " in text else None)
+    if not hit_kw: return None
+    try:
+        actor, rest = text.split(hit_kw, 1)
+    except ValueError:
+        return None
+    actor_lc = actor.strip().lower()
+    if actor_lc.startswith("the "): actor_lc = actor_lc[4:].lstrip()
+    is_you = actor_lc.startswith("you")
+    is_pet = actor_lc in PET_NAMES
+    if not (is_you or is_pet): return None
+    if rest.lower().startswith("the "): rest = rest[4:].lstrip()
+    if " for " not in rest or " points" not in rest: return None
+    try:
+        before_for, after_for = rest.rsplit(" for ", 1)
+        dmg_token = after_for.split(" points", 1)[0]
+        dmg = int(re.sub(r"[^\d]", "", dmg_token))
+    except Exception:
+        return None
+    if " with " in before_for:
+        enemy_part, skill_part = before_for.split(" with ", 1)
+        skill = skill_part.strip().rstrip(".")
+        if skill in AA_SKILLS:
+            if "bow" in skill.lower():
+                skill = "Autoattack (ranged)"
+            else:
+                skill = "Autoattack (melee)"
+    else:
+        enemy_part = before_for; skill = "DoT damage"
+    enemy = enemy_part.strip().rstrip(".")
+    return ("hit", dmg, enemy, skill, is_pet)
+
+
+def _legacy_parse_heal_line(line):
+    text = line.strip()
+    if not text:
+        return None
+    low = text.lower()
+    if low.startswith("ihr heilt"):
+        m = re.match(
+            r"Ihr heilt\s+(?P<amt>[\d\.]+)\s+Punkte des Schadens\s+\((?P<res>[^)]+)\),\s+den\s+(?P<target>.+?)\s+genommen ha(?:t|bt)\.",
+            text, re.IGNORECASE)
+        if m:
+            amt = int(re.sub(r"[^\d]", "", m.group("amt")))
+            res_raw = m.group("res").strip().lower()
+            if "moral" in res_raw:
+                rtype = "Morale"
+            elif "kraft" in res_raw:
+                rtype = "Power"
+            else:
+                rtype = None
+            target = m.group("target").strip()
+            if target.lower() in ("ihr", "euch", "euer", "euch selbst"):
+                target = "You"
+            return ("heal", amt, target, "Heal", rtype)
+
+    def strip_the(s):
+        s = s.strip()
+        return s[4:].lstrip() if s.lower().startswith("the ") else s
+
+    def to_int(num):
+        return int(re.sub(r"[^\d]", "", num))
+
+    t = text.rstrip()
+    res_part = r"(?:(?P<res1>Morale|Power)\s+points?|points?\s+of\s+(?P<res2>Morale|Power)|points?)"
+    m = re.search(
+        rf"^(?P<actor>.+?)\s+heal(?:s|ed)?\s+(?P<target>.+?)\s+for\s+(?P<amt>[\d,]+)\s+{res_part}(?:\.\s*)?$",
+        t, re.IGNORECASE)
+    if m:
+        actor_lc = strip_the(m.group("actor")).lower()
+        if not (actor_lc.startswith("you") or actor_lc in PET_NAMES):
+            return None
+        target = strip_the(m.group("target"))
+        if target.lower() in ("yourself", "you"):
+            target = "You"
+        return ("heal", to_int(m.group("amt")), target, "Heal", m.group("res1") or m.group("res2"))
+    m = re.search(
+        rf"^(?P<skill>.+?)\s+heal(?:s|ed)?\s+(?P<target>.+?)\s+for\s+(?P<amt>[\d,]+)\s+{res_part}(?:\.\s*)?$",
+        t, re.IGNORECASE)
+    if m:
+        skill = m.group("skill").strip()
+        if not skill.lower().startswith("your "):
+            return None
+        skill = skill[5:].lstrip()
+        target = strip_the(m.group("target"))
+        if target.lower() in ("yourself", "you"):
+            target = "You"
+        return ("heal", to_int(m.group("amt")), target, skill, m.group("res1") or m.group("res2"))
+    return None
+
+
+def _legacy_parse_taken_line(line):
+    text = line.strip()
+    if not text:
+        return None
+    low = text.lower()
+    if "trifft euch" in low and "moral nimmt" in low:
+        m = re.search(
+            r"(?P<attacker>.+?)\s+trifft\s+Euch\s+mit der Fertigkeit\s+'(?P<skill>[^']+)'\s+und\s+Eur\w*\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
+            text, re.IGNORECASE)
+        if not m:
+            return None
+        attacker = m.group("attacker").strip()
+        raw_skill = m.group("skill").strip()
+        amt = int(re.sub(r"[^\d]", "", m.group("amt")))
+        dtype_raw = m.group("dtype").strip().lower()
+        if "allgemein" in dtype_raw:
+            dtype = "common"
+        elif "schatten" in dtype_raw:
+            dtype = "shadow"
+        elif "feuer" in dtype_raw:
+            dtype = "fire"
+        else:
+            dtype = "other"
+        skill = "Hit" if "schaden" in raw_skill.lower() else raw_skill
+        return ("taken", amt, attacker, skill, dtype)
+
+    def strip_the(s):
+        s = s.strip()
+        return s[4:].lstrip() if s.lower().startswith("the ") else s
+
+    m = re.search(
+        r"^(?P<actor>.+?)\s+hits?\s+you(?:rself)?(?:\s+with\s+(?P<skill>.+?))?\s+for\s+(?P<amt>[\d,]+)\s+points?(?:\s+of\s+(?P<dtype>[A-Za-z]+))?\s+damage\s+to\s+Morale\.?$",
+        text, re.IGNORECASE)
+    if not m:
+        return None
+    actor = strip_the(m.group("actor"))
+    amt = int(re.sub(r"[^\d]", "", m.group("amt")))
+    skill = (m.group("skill") or "Hit").strip()
+    dtype = (m.group("dtype") or "").strip() or None
+    return ("taken", amt, actor, skill, dtype)
+
+
+def legacy_parse_line(line):
+    return (_legacy_parse_damage_line(line)
+            or _legacy_parse_heal_line(line)
+            or _legacy_parse_taken_line(line))
+
+
+###############################################################################
+#######                      Synthetic combat log                       #######
+###############################################################################
+
+_MOBS_EN = ["Goblin-town Guard", "Downs Wildcat", "Angmarim Sorcerer", "Barrow-wight"]
+_MOBS_DE = ["Goblinwächter", "Plündernder Bär", "Angmarim-Zauberer"]
+_SKILLS_EN = ["Sure Strike", "Blade Wall", "Dual-wield Attack", "Bow Attack", "Merciful Shot"]
+_SKILLS_DE = ["Sicherer Schlag", "Klingenwall", "Doppelangriff", "Bogenangriff"]
+_ALLIES = ["Deladora", "Namaleth", "Fellowmember"]
+
+_TEMPLATES = {
+    "en": [
+        (30, "You hit the {mob} with {skill_en} for {n:,} points of Common damage to Morale."),
+        (6,  "You hit the {mob} for {n} points of Fire damage to Morale."),
+        (5,  "Raven hits the {mob} with Peck for {n} points of Common damage to Morale."),
+        (10, "The {mob} hits you with Melee Common Low for {n} points of Common damage to Morale."),
+        (3,  "{mob} hits you for {n} points of Shadow damage to Morale."),
+        (6,  "The {mob} hits {ally} with Slash for {n} points of Common damage to Morale."),
+        (4,  "You heal {ally} for {n} points of Morale."),
+        (2,  "Your Rousing Words heals yourself for {n} Power points."),
+        (10, "[Fellowship] {ally}: pull in {n}"),
+        (6,  "You have acquired [Worn Leather Belt]."),
+        (4,  "The {mob} has been defeated."),
+        (4,  "You gained {n} Experience points."),
+    ],
+    "de": [
+        (30, "Ihr trefft den {mob_de} mit der Fertigkeit '{skill_de}' und seine Moral nimmt {n} Punkte Schaden (allgemein)."),
+        (6,  "Ihr trefft den {mob_de} und seine Moral nimmt {n} Punkte Schaden (Feuer)."),
+        (10, "{mob_de} trifft Euch mit der Fertigkeit 'Doppelter Schaden (Nahkampf)' und Eure Moral nimmt {n} Punkte Schaden (allgemein)."),
+        (6,  "Ihr heilt {n} Punkte des Schadens (Moral), den {ally} genommen hat."),
+        (10, "[Gemeinschaft] {ally}: gleich pullen"),
+        (6,  "Ihr habt [Abgenutzter Ledergürtel] erhalten."),
+        (4,  "Ihr erhaltet {n} Erfahrungspunkte."),
+    ],
+}
+
+
+def make_synthetic_log(n_lines: int, locale: str = "mixed", seed: int = 1983):
+    rnd = random.Random(seed)
+    locales = ["en", "de"] if locale == "mixed" else [locale]
+    pools = []
+    for loc in locales:
+        for weight, tpl in _TEMPLATES[loc]:
+            pools.extend([tpl] * weight)
+    lines = []
+    append = lines.append
+    for _ in range(n_lines):
+        tpl = rnd.choice(pools)
+        append(tpl.format(
+            mob=rnd.choice(_MOBS_EN), mob_de=rnd.choice(_MOBS_DE),
+            skill_en=rnd.choice(_SKILLS_EN), skill_de=rnd.choice(_SKILLS_DE),
+            ally=rnd.choice(_ALLIES), n=rnd.randint(1, 4000),
+        ) + "\n")
+    return lines
+
+
+def read_log(path: str):
+    with open(path, "r", encoding=detect_encoding(path), errors="ignore") as f:
+        return f.readlines()
+
+
+###############################################################################
+#######                             Runner                              #######
+###############################################################################
+
+def _time_parser(fn, lines):
+    t0 = time.perf_counter()
+    out = [fn(line) for line in lines]
+    return time.perf_counter() - t0, out
+
+
+def _time_batches(classifier, lines, block=4096):
+    entities = EntityRegistry()
+    t0 = time.perf_counter()
+    out = [parse_lines(lines[i:i + block], classifier, entities)
+           for i in range(0, len(lines), block)]
+    return time.perf_counter() - t0, out
+
+
+def _time_raw(data: bytes, encoding: str, locale, use_prefilter: bool, chunk=1 << 16):
+    """Tail-Pfad: Rohbytes -> Zeilen -> (Pre-Filter) -> parse_lines. Rückgabe: (s, events, prefilter)"""
+    classifier = LineClassifier(debug=False, locale=locale)
+    entities = EntityRegistry()
+    # anchors=() -> Filter aus, Zeilen werden nur dekodiert
+    prefilter = BytePrefilter(encoding, classifier=classifier, anchors=None if use_prefilter else ())
+    events = 0
+    pending = b""
+    t0 = time.perf_counter()
+    for i in range(0, len(data), chunk):
+        block, pending = prefilter.feed(pending + data[i:i + chunk])
+        events += len(parse_lines(block, classifier, entities))
+    return time.perf_counter() - t0, events, prefilter
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--lines", type=int, default=1_000_000, help="number of synthetic lines")
+    ap.add_argument("--locale", choices=("en", "de", "mixed"), default="mixed")
+    ap.add_argument("--log", help="benchmark a real combat log instead of synthetic lines")
+    ap.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="parse cache templates (0 = off)")
+    ap.add_argument("--encoding", default="utf-8", help="encoding for the raw-bytes/pre-filter run")
+    args = ap.parse_args()
+
+    lines = read_log(args.log) if args.log else make_synthetic_log(args.lines, args.locale)
+    print(f"lines: {len(lines):,}  ({'file ' + args.log if args.log else 'synthetic/' + args.locale})")
+
+    # mixed EN+DE corpus: no locale lock, otherwise auto-detect like the overlay
+    locale = LOCALE_ANY if (args.locale == "mixed" and not args.log) else None
+    # no console I/O while measuring
+    classifier = LineClassifier(debug=False, locale=locale, cache_size=args.cache_size)
+    t_old, out_old = _time_parser(legacy_parse_line, lines)
+    t_nocache, _ = _time_parser(LineClassifier(debug=False, locale=locale, cache_size=0).classify, lines)
+    t_new, out_new = _time_parser(classifier.classify, lines)
+
+    t_batch, batches = _time_batches(
+        LineClassifier(debug=False, locale=locale, cache_size=args.cache_size), lines)
+
+    mismatches = sum(1 for a, b in zip(out_old, out_new) if a != b)
+    events = [e for e in out_new if e]
+    batched = [e for b in batches for e in b.iter_events()]
+    if len(batched) != len(events):
+        mismatches += abs(len(batched) - len(events))
+    print(f"events: {len(events):,}   mismatches: {mismatches}   locale: {classifier.locale or locale}")
+    print(f"{'sequential (before)':<22}{t_old:8.2f} s {len(lines) / t_old:14,.0f} lines/s")
+    print(f"{'classifier (no cache)':<22}{t_nocache:8.2f} s {len(lines) / t_nocache:14,.0f} lines/s")
+    print(f"{'classifier (after)':<22}{t_new:8.2f} s {len(lines) / t_new:14,.0f} lines/s")
+    print(f"{'parse_lines (batch)':<22}{t_batch:8.2f} s {len(lines) / t_batch:14,.0f} lines/s")
+    print(f"speedup: {t_old / t_new:.2f}x (classifier), {t_old / t_batch:.2f}x (batch)")
+    cs = classifier.cache_stats()
+    if cs:
+        print(f"parse cache: {cs['hit_rate']:.1%} hits ({cs['hits']:,} / {cs['hits'] + cs['misses']:,}), "
+              f"{cs['size']:,} of {cs['maxsize']:,} templates")
+
+    data = "".join(line if line.endswith("\n") else line + "\n" for line in lines).encode(args.encoding)
+    t_raw, ev_raw, _ = _time_raw(data, args.encoding, locale, False)
+    t_pf, ev_pf, pf = _time_raw(data, args.encoding, locale, True)
+    if ev_pf != ev_raw or ev_raw != len(events):
+        mismatches += 1
+    st = pf.stats()
+    print(f"{'raw bytes ' + args.encoding:<22}{t_raw:8.2f} s {len(lines) / t_raw:14,.0f} lines/s")
+    print(f"{'+ pre-filter':<22}{t_pf:8.2f} s {len(lines) / t_pf:14,.0f} lines/s")
+    print(f"pre-filter: {st['reject_ratio']:.1%} rejected, {st['bypassed']:,} lines bypassed, "
+          f"filter {st['filter_s']:.3f} s, saved ~{st['saved_s']:.3f} s")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
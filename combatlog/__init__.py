@@ -0,0 +1,76 @@
+"""
+combatlog – Qt-free parsing and aggregation of EoA / LotRO combat logs.
+
+The overlay (parsingStats.py) builds on this package, but it works without Qt,
+so logs can also be parsed headless or benchmarked on their own:
+
+    from combatlog import LineClassifier, CombatAggregator
+"""
+
+from .aggregate import MODES, CombatAggregator
+from .backfill import Backfill, FightSegmenter
+from .batch import EventBatch, parse_lines
+from .bulk import BulkImport, FightStats, plan_ranges
+from .cache import ParseCache
+from .checkpoint import TailCheckpoint
+from .entities import EntityRegistry, NameTable
+from .eventqueue import EventQueue
+from .ingest import MODE_PROCESS, MODE_THREAD, IngestSupervisor, TailReader, TailStream
+from .logfiles import (
+    LogDirIndex, clean_dir, detect_encoding, get_active_combat_logs, get_latest_combat_log,
+)
+from .grammars import GRAMMARS, Grammar, get_grammar, register_grammar
+from .parser import LOCALE_ANY, LineClassifier, parse_line
+from .prefilter import BytePrefilter, split_raw_lines
+from .rates import RATE_WINDOWS, RollingRate
+from .reader import BlockReader
+from .shmring import ProcessTailReader, RingBuffer
+from .sketch import SKETCH_ALPHA, QuantileSketch
+from .store import EventStore
+from .watch import LogWatcher, make_watcher
+
+__all__ = [
+    "GRAMMARS",
+    "LOCALE_ANY",
+    "MODES",
+    "MODE_PROCESS",
+    "MODE_THREAD",
+    "RATE_WINDOWS",
+    "SKETCH_ALPHA",
+    "Backfill",
+    "BlockReader",
+    "BulkImport",
+    "BytePrefilter",
+    "CombatAggregator",
+    "EntityRegistry",
+    "EventBatch",
+    "EventQueue",
+    "EventStore",
+    "FightSegmenter",
+    "FightStats",
+    "Grammar",
+    "IngestSupervisor",
+    "LineClassifier",
+    "LogDirIndex",
+    "LogWatcher",
+    "NameTable",
+    "ParseCache",
+    "ProcessTailReader",
+    "QuantileSketch",
+    "RingBuffer",
+    "RollingRate",
+    "TailCheckpoint",
+    "TailReader",
+    "TailStream",
+    "clean_dir",
+    "detect_encoding",
+    "get_active_combat_logs",
+    "get_grammar",
+    "get_latest_combat_log",
+    "make_watcher",
+    "parse_line",
+    "parse_lines",
+    "plan_ranges",
+    "register_grammar",
+    "split_raw_lines",
+]
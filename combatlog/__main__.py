@@ -0,0 +1,103 @@
+"""
+Headless parse of a combat log:
+
+    python -m combatlog <Combat_*.txt | log folder>
+    python -m combatlog --bulk <log folder | files...> [--workers N]
+
+Without timestamps in the log, only totals, hits and min/avg/max are shown.
+--bulk parses all combat logs of a folder on all cores and prints the fights
+found, the totals and the throughput per worker process.
+"""
+
+import os
+import sys
+
+from .aggregate import MODES, CombatAggregator
+from .batch import parse_lines
+from .bulk import BulkImport
+from .entities import EntityRegistry
+from .logfiles import detect_encoding, get_latest_combat_log
+from .parser import LineClassifier
+
+_TITLES = {'dps': "Damage", 'hps': "Heal", 'dts': "Taken"}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "--bulk":
+        return _bulk(argv[1:])
+    if len(argv) != 1:
+        print(__doc__.strip())
+        return 2
+
+    path = argv[0]
+    if os.path.isdir(path):
+        path = get_latest_combat_log(path)
+        if not path:
+            print("no combat log found")
+            return 1
+
+    parser = LineClassifier()
+    entities = EntityRegistry()
+    combat = CombatAggregator(entities)
+    with open(path, 'r', encoding=detect_encoding(path), errors='ignore') as f:
+        while True:
+            block = f.readlines(1 << 20)
+            if not block:
+                break
+            combat.add_batch(parse_lines(block, parser, entities))
+
+    print(path)
+    for mode in MODES:
+        stats = combat.skill_stats(mode)
+        if not stats:
+            continue
+        print(f"\n{_TITLES[mode]}: {combat.modes[mode]['total']:,}")
+        for s in stats:
+            print(f"  {s['skill']:<34}{s['hits']:>7}{s['total']:>12,}"
+                  f"{s['min']:>8}{int(s['avg']):>8}{s['max']:>8}")
+
+    cs = parser.cache_stats()
+    if cs and cs['hits'] + cs['misses']:
+        print(f"\nparse cache: {cs['hit_rate']:.1%} hits, {cs['size']} of {cs['maxsize']} templates")
+    return 0
+
+
+def _bulk(argv):
+    workers = None
+    if "--workers" in argv:
+        i = argv.index("--workers")
+        try:
+            workers = int(argv[i + 1])
+        except (IndexError, ValueError):
+            print(__doc__.strip())
+            return 2
+        del argv[i:i + 2]
+    if not argv:
+        print(__doc__.strip())
+        return 2
+
+    source = argv[0] if len(argv) == 1 and os.path.isdir(argv[0]) else argv
+    imp = BulkImport(source, workers=workers)
+    fights = imp.run()
+    st = imp.stats()
+    if not st['files']:
+        print("no combat log found")
+        return 1
+
+    print(f"{st['files']} files, {st['ranges']} ranges, {len(fights)} fights")
+    for mode in MODES:
+        total = sum(f.total(mode) for f in fights)
+        if total:
+            print(f"  {_TITLES[mode]:<8}{total:>16,}")
+
+    print(f"\n{st['bytes'] / 1e6:.1f} MB in {st['seconds']:.2f}s = {st['mb_per_s']:.1f} MB/s"
+          f" (parallelism {st['parallelism']:.1f})")
+    for pid, w in sorted(imp.worker_stats().items()):
+        print(f"  worker {pid:<8}{w['tasks']:>4} ranges{w['bytes'] / 1e6:>10.1f} MB"
+              f"{w['events']:>12,} events{w['mb_per_s']:>8.1f} MB/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
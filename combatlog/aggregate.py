@@ -0,0 +1,615 @@
+"""
+Per-fight aggregation of parsed events (damage / heal / damage taken).
+
+`CombatAggregator` owns the per-mode state that used to live directly on the
+overlay (`self.modes`). It builds the skill table, the per-target summaries and
+the fight snapshots without touching Qt.
+
+Events are stored per mode in a columnar `EventStore` (time, amount, target,
+skill, type, flags) and only carry entity ids (see `combatlog.entities`).
+append() still takes the old event dict:
+
+    {"time": rel_t, "dmg": value, "target": target_id, "skill": skill_id,
+     "type": type_id | NO_ID, "is_pet": bool}
+
+Names are resolved only when rows or labels are produced.
+
+Every append() also updates a per-mode index (hits / total / min / max per
+table row, for all targets and per target, plus per-target and per-type
+sums). The skill table, the target dropdown and the type breakdown are read
+from it, so they cost O(rows) instead of a pass over all events of the fight.
+The index also keeps the store positions of each target, so a target's
+events are taken directly instead of filtering the whole store, and a
+`RollingRate` per target (and for all targets) for the live 5 / 15 / 60 s rates.
+
+`version` grows with every change (append, add_batch, reset, load_snapshot),
+so views built from the aggregator can be cached until it moves.
+"""
+
+from array import array
+
+from .batch import FLAG_PET, KIND_HEAL, KIND_HIT, NO_ID
+from .entities import EntityRegistry
+from .rates import RATE_BIN, RATE_HISTORY, RATE_WINDOWS, RollingRate
+from .sketch import QuantileSketch
+from .store import EventStore
+
+MODES = ('dps', 'hps', 'dts')
+HIST_BINS = 16              # Klassen des Treffer-Histogramms im Detailbereich
+
+_DTYPE_KEYS = (
+    ('common', ('common', 'allgemein')),
+    ('shadow', ('shadow', 'schatten')),
+    ('fire',   ('fire', 'feuer')),
+)
+_DTYPE_LABELS = {
+    'common': "Common",
+    'shadow': "Shadow",
+    'fire':   "Fire",
+    'other':  "Other",
+}
+
+
+def _empty_mode():
+    return {'events': EventStore(), 'total': 0, 'max': 0, 'max_skill': '--'}
+
+
+class _ModeIndex:
+    """
+    Running sums of one mode, updated per event.
+
+    rows[scope][key]  = [hits, total, min, max, by_dtype | None, QuantileSketch | None]
+                        scope: None (all targets) or target id; sketches only per target
+                        key:   skill id, ('hit', dtype key) for DTS "Hit", (ally id, rtype) for HPS
+    targets[tid]      = [total, first time, last time, events, max value, max position]
+    positions[tid]    = array of store positions of the target's events
+    types[scope][tid] = total per type id
+    rates[scope]      = RollingRate (1-s bins for live rates, peaks and the sparkline)
+    """
+
+    __slots__ = ('rows', 'targets', 'positions', 'types', 'rates')
+
+    def __init__(self):
+        self.rows = {None: {}}
+        self.targets = {}
+        self.positions = {}
+        self.types = {None: {}}
+        self.rates = {None: RollingRate()}
+
+    def add_many(self, pos, times, amounts, targets, types, keys, dkeys=None):
+        """Events als Spalten ab Store-Position pos (dkeys None = kein DTS)."""
+        all_rows = self.rows[None]
+        all_types = self.types[None]
+        tgt_index = self.targets
+        rows_by = self.rows
+        types_by = self.types
+        positions = self.positions
+        rates_by = self.rates
+        if dkeys is None:
+            dkeys = (None,) * len(amounts)
+        for rel_t, dmg, tid, type_id, key, dkey in zip(times, amounts, targets, types, keys, dkeys):
+            t = tgt_index.get(tid)
+            if t is None:
+                tgt_index[tid] = [dmg, rel_t, rel_t, 1, dmg, pos]
+                positions[tid] = array('l', (pos,))
+                trows = rows_by[tid] = {}
+                ttypes = types_by[tid] = {}
+                rates_by[tid] = RollingRate()
+            else:
+                t[0] += dmg
+                t[2] = rel_t
+                t[3] += 1
+                if dmg > t[4]:
+                    t[4] = dmg
+                    t[5] = pos
+                positions[tid].append(pos)
+                trows = rows_by[tid]
+                ttypes = types_by[tid]
+
+            # alle Ziele (ohne Sketch: der entsteht bei Bedarf aus den Ziel-Sketches)
+            r = all_rows.get(key)
+            if r is None:
+                r = all_rows[key] = [1, dmg, dmg, dmg, {} if dkey is not None else None, None]
+            else:
+                r[0] += 1
+                r[1] += dmg
+                if dmg < r[2]:
+                    r[2] = dmg
+                elif dmg > r[3]:
+                    r[3] = dmg
+            if dkey is not None:
+                r[4][dkey] = r[4].get(dkey, 0) + dmg
+
+            # dieses Ziel
+            r = trows.get(key)
+            if r is None:
+                r = trows[key] = [1, dmg, dmg, dmg, {} if dkey is not None else None,
+                                  QuantileSketch()]
+            else:
+                r[0] += 1
+                r[1] += dmg
+                if dmg < r[2]:
+                    r[2] = dmg
+                elif dmg > r[3]:
+                    r[3] = dmg
+            if dkey is not None:
+                r[4][dkey] = r[4].get(dkey, 0) + dmg
+            r[5].add(dmg)
+
+            all_types[type_id] = all_types.get(type_id, 0) + dmg
+            ttypes[type_id] = ttypes.get(type_id, 0) + dmg
+            pos += 1
+        self._add_rates(times, amounts, targets)
+
+    def _add_rates(self, times, amounts, targets):
+        rates_by = self.rates
+        if int(min(times) // RATE_BIN) == int(max(times) // RATE_BIN):
+            # Normalfall: ganzer Block in einem Bin -> eine Summe je Ziel
+            rel_t = times[0]
+            rates_by[None].add(rel_t, sum(amounts))
+            sums = {}
+            for tid, dmg in zip(targets, amounts):
+                sums[tid] = sums.get(tid, 0) + dmg
+            for tid, dmg in sums.items():
+                rates_by[tid].add(rel_t, dmg)
+            return
+        all_rate = rates_by[None].add
+        for rel_t, dmg, tid in zip(times, amounts, targets):
+            all_rate(rel_t, dmg)
+            rates_by[tid].add(rel_t, dmg)
+
+    def add(self, pos, rel_t, dmg, tid, type_id, key, dkey):
+        self.add_many(pos, (rel_t,), (dmg,), (tid,), (type_id,), (key,), (dkey,))
+
+    def sketch(self, scope, key):
+        """QuantileSketch einer Zeile; scope None = Ziel-Sketches zusammengeführt (oder None)."""
+        if scope is not None:
+            r = self.rows.get(scope, {}).get(key)
+            return r[5] if r is not None else None
+        out = None
+        for tid, rows in self.rows.items():
+            r = rows.get(key) if tid is not None else None
+            if r is not None:
+                if out is None:
+                    out = r[5].copy()
+                else:
+                    out.merge(r[5])
+        return out
+
+
+def dtype_key(dtype) -> str:
+    """Normalisiert EN/DE Schadenstypen auf common/shadow/fire/other."""
+    raw = (dtype or "").lower()
+    for key, needles in _DTYPE_KEYS:
+        for n in needles:
+            if n in raw:
+                return key
+    return 'other'
+
+
+class CombatAggregator:
+    """Events and running totals for one fight, split by mode (dps/hps/dts)."""
+
+    def __init__(self, entities: EntityRegistry = None):
+        self.entities = entities if entities is not None else EntityRegistry()
+        self.modes = {m: _empty_mode() for m in MODES}
+        self._index = {m: _ModeIndex() for m in MODES}
+        self._morale_id = self.entities.types.intern("Morale")   # HPS-Default
+        self._hit_id = self.entities.skills.intern("Hit")        # DTS-Standardangriff
+        self._dtype_keys = {}                                    # type_id -> common/shadow/...
+        self._rtypes = {}                                        # type_id -> morale/power
+        self.version = 0                                         # +1 je Änderung (Schlüssel für View-Caches)
+
+    def reset(self):
+        self.version += 1
+        for agg in self.modes.values():
+            agg['events'].clear()
+            agg['total'] = 0
+            agg['max'] = 0
+            agg['max_skill'] = '--'
+        self._index = {m: _ModeIndex() for m in MODES}
+
+    # ── feeding ──
+    def add_parsed(self, parsed, rel_t: float = 0.0):
+        """
+        Fügt ein Parser-Tupel hinzu ('hit' / 'heal' / 'taken').
+        Rückgabe: betroffener Mode oder None.
+        """
+        if not parsed:
+            return None
+        et = parsed[0]
+        if et == 'hit':
+            # DE-Treffer liefern kein is_pet
+            is_pet = parsed[4] if len(parsed) == 5 else False
+            self.add_hit(rel_t, parsed[1], parsed[2], parsed[3], is_pet)
+            return 'dps'
+        if et == 'heal':
+            rtype = parsed[4] if len(parsed) == 5 else None
+            self.add_heal(rel_t, parsed[1], parsed[2], parsed[3], rtype)
+            return 'hps'
+        if et == 'taken':
+            dtype = parsed[4] if len(parsed) == 5 else None
+            self.add_taken(rel_t, parsed[1], parsed[2], parsed[3], dtype)
+            return 'dts'
+        return None
+
+    def add_batch(self, batch, t0: float = 0.0):
+        """Fügt alle Events eines EventBatch hinzu (rel_t = Zeitstempel - t0)."""
+        if not len(batch):
+            return
+        ent = batch.entities
+        if ent is self.entities:
+            remap_t = remap_s = remap_d = None
+        else:
+            # fremde Registry: ids einmal pro Batch in unsere Tabellen übersetzen
+            remap_t = {i: self.entities.targets.intern(ent.targets[i]) for i in set(batch.target)}
+            remap_s = {i: self.entities.skills.intern(ent.skills[i]) for i in set(batch.skill)}
+            remap_d = {i: self.entities.types.intern(ent.types[i]) for i in set(batch.detail) if i != NO_ID}
+            remap_d[NO_ID] = NO_ID
+
+        targets, skills, details = batch.target, batch.skill, batch.detail
+        if remap_t is not None:
+            targets = [remap_t[i] for i in targets]
+            skills = [remap_s[i] for i in skills]
+            details = [remap_d[i] for i in details]
+
+        # spaltenweise je Modus: Store/Summen in einem Rutsch, dann der Index
+        kinds = batch.kind
+        for kind, mode in enumerate(('dps', 'hps', 'dts')):
+            if kinds.count(kind) == len(kinds):
+                pick = None                     # ganzer Batch ein Modus (der Normalfall)
+            else:
+                pick = [i for i, k in enumerate(kinds) if k == kind]
+                if not pick:
+                    continue
+            col = (lambda c: c) if pick is None else (lambda c: [c[i] for i in pick])
+            amounts = col(batch.amount)
+            times = [ts - t0 for ts in col(batch.time)] if t0 else col(batch.time)
+            tgts = col(targets)
+            sks = col(skills)
+            if kind == KIND_HIT:
+                types = [NO_ID] * len(amounts)
+                flags = [fl & FLAG_PET for fl in col(batch.flags)]
+            elif kind == KIND_HEAL:
+                morale = self._morale_id
+                types = [d if d != NO_ID else morale for d in col(details)]
+                flags = [0] * len(amounts)
+            else:
+                types = col(details)
+                flags = [0] * len(amounts)
+            self._extend_ids(mode, times, amounts, tgts, sks, types, flags)
+            if pick is None:
+                break
+
+    def _extend_ids(self, mode, times, amounts, targets, skills, types, flags):
+        """Spalten eines Modus anhängen (wie _append_ids je Event)."""
+        self.version += 1
+        agg = self.modes[mode]
+        store = agg['events']
+        pos = len(store)
+        store.time.extend(times)
+        store.amount.extend(amounts)
+        store.target.extend(targets)
+        store.skill.extend(skills)
+        store.type.extend(types)
+        store.flags.extend(flags)
+        agg['total'] += sum(amounts)
+        mx = max(amounts)
+        if mx > agg['max']:
+            i = amounts.index(mx)
+            agg['max'] = mx
+            agg['max_skill'] = self.max_skill_label(mode, skills[i], types[i])
+
+        self._index_many(mode, pos, times, amounts, targets, skills, types)
+
+    def _index_many(self, mode, pos, times, amounts, targets, skills, types):
+        """Spalten ab Store-Position pos in den Index (wie _index_evt je Event)."""
+        if mode == 'hps':
+            rtype = self._rtype_of
+            keys, dkeys = list(zip(targets, map(rtype, types))), None
+        elif mode == 'dts':
+            dkeys = list(map(self._dtype_key_of, types))
+            hit = self._hit_id
+            keys = [('hit', d) if s == hit else s for s, d in zip(skills, dkeys)]
+        else:
+            keys, dkeys = skills, None
+        self._index[mode].add_many(pos, times, amounts, targets, types, keys, dkeys)
+
+    def add_hit(self, rel_t, dmg, enemy, skill, is_pet=False):
+        ent = self.entities
+        self._append_ids('dps', rel_t, dmg, ent.targets.intern(enemy),
+                         ent.skills.intern(skill), NO_ID, bool(is_pet))
+
+    def add_heal(self, rel_t, amount, target, skill, rtype=None):
+        ent = self.entities
+        type_id = ent.types.intern(rtype) if rtype else self._morale_id
+        self._append_ids('hps', rel_t, amount, ent.targets.intern(target),
+                         ent.skills.intern(skill), type_id, False)
+
+    def add_taken(self, rel_t, amount, attacker, skill, dtype=None):
+        ent = self.entities
+        type_id = ent.types.intern(dtype) if dtype else NO_ID
+        self._append_ids('dts', rel_t, amount, ent.targets.intern(attacker),
+                         ent.skills.intern(skill), type_id, False)
+
+    def _append_ids(self, mode, rel_t, dmg, target_id, skill_id, type_id, is_pet):
+        self.version += 1
+        agg = self.modes[mode]
+        pos = agg['events'].append(rel_t, dmg, target_id, skill_id, type_id,
+                                   FLAG_PET if is_pet else 0)
+        agg['total'] += dmg
+        if dmg > agg['max']:
+            agg['max'] = dmg
+            agg['max_skill'] = self.max_skill_label(mode, skill_id, type_id)
+        self._index_evt(mode, pos, rel_t, dmg, target_id, skill_id, type_id)
+
+    def append(self, mode, evt):
+        """Fügt ein Event-Dict (siehe Modul-Doku) hinzu."""
+        self._append_ids(mode, evt['time'], evt['dmg'], evt['target'], evt['skill'],
+                         evt['type'], evt.get('is_pet', False))
+
+    def _index_evt(self, mode, pos, rel_t, dmg, target_id, skill_id, type_id):
+        # Zeilenschlüssel wie in skill_stats()
+        if mode == 'hps':
+            key, dkey = (target_id, self._rtype_of(type_id)), None
+        elif mode == 'dts':
+            dkey = self._dtype_key_of(type_id)
+            # Speziell: "Hit" nach Schadenstyp splitten
+            key = ('hit', dkey) if skill_id == self._hit_id else skill_id
+        else:
+            key, dkey = skill_id, None
+        self._index[mode].add(pos, rel_t, dmg, target_id, type_id, key, dkey)
+
+    # ── names ──
+    def max_skill_label(self, mode, skill_id, type_id) -> str:
+        """Skillname für "max hit"; DTS mit Schadenstyp, z.B. 'Hit (Fire)'."""
+        skill = self.entities.skills[skill_id]
+        if mode == 'dts' and type_id != NO_ID:
+            return f"{skill} ({self.entities.types[type_id]})"
+        return skill
+
+    def _target_id(self, target):
+        """Name aus dem Dropdown -> target id (None = unbekannt)."""
+        return self.entities.targets.id_of(target)
+
+    def _dtype_key_of(self, type_id) -> str:
+        key = self._dtype_keys.get(type_id)
+        if key is None:
+            key = dtype_key(self.entities.types[type_id] if type_id != NO_ID else None)
+            self._dtype_keys[type_id] = key
+        return key
+
+    def _rtype_of(self, type_id) -> str:
+        """HPS-Ressource: 'power' / 'morale'."""
+        rtype = self._rtypes.get(type_id)
+        if rtype is None:
+            name = self.entities.types[type_id] if type_id != NO_ID else ""
+            rtype = self._rtypes[type_id] = 'power' if 'power' in name.lower() else 'morale'
+        return rtype
+
+    def _scope(self, target):
+        """Dropdown-Name -> Index-Scope (None = alle); False = Ziel ohne Events."""
+        if not target:
+            return None
+        tid = self._target_id(target)
+        return tid if tid is not None else False
+
+    # ── queries ──
+    def events(self, mode, target=None) -> EventStore:
+        """EventStore des Modus; mit target eine gefilterte Kopie."""
+        evts = self.modes[mode]['events']
+        if target:
+            positions = self._index[mode].positions.get(self._target_id(target))
+            return evts.take(positions) if positions else EventStore()
+        return evts
+
+    def target_stats(self, mode, target):
+        """Laufende Werte eines Ziels (O(1)) oder None: total, hits, first, last, max, max_skill."""
+        t = self._index[mode].targets.get(self._target_id(target))
+        if t is None:
+            return None
+        total, first, last, hits, mx, pos = t
+        evts = self.modes[mode]['events']
+        return {'total': total, 'hits': hits, 'first': first, 'last': last, 'max': mx,
+                'max_skill': self.max_skill_label(mode, evts.skill[pos], evts.type[pos])}
+
+    def has_events(self) -> bool:
+        return any(agg['events'] for agg in self.modes.values())
+
+    def target_names(self, mode):
+        names = self.entities.targets.names
+        return sorted(names[tid] for tid in self._index[mode].targets)
+
+    def fight_duration(self) -> float:
+        """Dauer = letztes Event aus DPS/DTS, bei reinem Heal-Kampf aus HPS."""
+        last_times = [self.modes[k]['events'].last_time
+                      for k in ('dps', 'dts') if self.modes[k]['events']]
+        if not last_times:
+            last_times = [agg['events'].last_time for agg in self.modes.values() if agg['events']]
+        return max(last_times) if last_times else 0.0
+
+    def target_view(self, mode, target=None):
+        """
+        Summen für "All" bzw. ein einzelnes Ziel.
+        Rückgabe: (total, duration, max_val, max_skill)
+        """
+        agg = self.modes[mode]
+        if not target:
+            return agg['total'], agg['events'].last_time, agg['max'], agg['max_skill']
+
+        st = self.target_stats(mode, target)
+        if st is None:
+            return 0, 0.0, agg['max'], agg['max_skill']
+        dur = (st['last'] - st['first']) if st['hits'] > 1 else st['last']
+        return st['total'], dur, st['max'], st['max_skill']
+
+    def target_summaries(self, mode):
+        """Liste [(target, total, duration)] alphabetisch sortiert (für das Target-Dropdown)."""
+        names = self.entities.targets.names
+        out = []
+        for tid, (total, first, last, n, _, _) in self._index[mode].targets.items():
+            dur = (last - first) if n > 1 else last
+            out.append((names[tid], total, dur))
+        out.sort(key=lambda r: r[0])
+        return out
+
+    def type_totals(self, mode, target=None):
+        """HPS: Summe je Ressource (Morale/Power), DTS: Summe je Schadenstyp."""
+        scope = self._scope(target)
+        by_id = self._index[mode].types.get(scope, {}) if scope is not False else {}
+        names = self.entities.types.names
+        default = "Morale" if mode == 'hps' else "Unknown"
+        totals = {}
+        for type_id, amt in by_id.items():
+            name = names[type_id] if type_id != NO_ID else default
+            totals[name] = totals.get(name, 0) + amt
+        return totals
+
+    def live_rates(self, mode, target=None, now: float = None, spark: int = RATE_HISTORY):
+        """
+        Gleitende Raten pro Sekunde (siehe combatlog.rates), unabhängig von der Kampflänge.
+        now: Kampfzeit in s, auf die die Uhr vorgestellt wird (None = letztes Event)
+        Rückgabe: {'rates': {5: .., 15: .., 60: ..}, 'peaks': {...}, 'spark': [Summe je s]}
+                  oder None (keine Events)
+        """
+        scope = self._scope(target)
+        rr = self._index[mode].rates.get(scope) if scope is not False else None
+        if rr is None or rr.head < 0:
+            return None
+        if now is not None:
+            rr.advance(now)
+        return {'rates': {w: rr.rate(w) for w in RATE_WINDOWS},
+                'peaks': {w: rr.peak(w) for w in RATE_WINDOWS},
+                'spark': rr.sparkline(spark)}
+
+    def skill_stats(self, mode, target=None):
+        """
+        Tabellenzeilen eines Modus aus dem laufenden Index (O(Zeilen), kein Event-Scan).
+
+        DPS / DTPS:
+            - Gruppierung nach Skill
+            - Felder: skill, hits, total, avg, min, max
+            - DTPS zusätzlich: by_dtype = {'common': ..., 'shadow': ..., 'fire': ..., 'other': ...}
+
+        HPS:
+            - Gruppierung nach (ally, rtype)  (ally = Ziel, rtype = 'morale' / 'power')
+            - Felder: skill (Label), ally, rtype, hits, total, avg, min, max
+        """
+        scope = self._scope(target)
+        rows = self._index[mode].rows.get(scope) if scope is not False else None
+        if not rows:
+            return []
+
+        # --- HPS: Zeilen je (Ally, Ressourcentyp) ---
+        if mode == 'hps':
+            names = self.entities.targets.names
+            stats = []
+            for (ally_id, rtype), (hits, total, lo, hi, _, _) in rows.items():
+                ally = names[ally_id] or "Unknown"
+                stats.append({
+                    'skill': f"{ally} ({'Power' if rtype == 'power' else 'Heal'})",
+                    'ally': ally,
+                    'rtype': rtype,
+                    'hits': hits,
+                    'total': total,
+                    'avg': total / hits if hits else 0.0,
+                    'min': lo,
+                    'max': hi,
+                })
+
+            stats.sort(key=lambda s: s['total'], reverse=True)
+            return stats
+
+        # --- DPS / DTPS: Zeilen je Skill ---
+        is_dts = mode == 'dts'
+        skill_names = self.entities.skills.names
+        stats = []
+        for key, (hits, total, lo, hi, by_dtype, _) in rows.items():
+            # Anzeigename
+            if isinstance(key, tuple):
+                display_name = f"Standard attack ({_DTYPE_LABELS[key[1]]})"
+            else:
+                display_name = skill_names[key]
+
+            entry = {
+                'skill': display_name,
+                'hits': hits,
+                'total': total,
+                'avg': total / hits if hits else 0.0,
+                'min': lo,
+                'max': hi,
+            }
+            if is_dts:
+                entry['by_dtype'] = dict(by_dtype)
+            stats.append(entry)
+
+        stats.sort(key=lambda s: s['total'], reverse=True)
+        return stats
+
+    def _row_key(self, mode, skill_name, rows):
+        """Tabellen-Label (siehe skill_stats) -> Zeilenschlüssel im Index oder None."""
+        names = self.entities.targets.names if mode == 'hps' else self.entities.skills.names
+        for key in rows:
+            if mode == 'hps':
+                label = f"{names[key[0]] or 'Unknown'} ({'Power' if key[1] == 'power' else 'Heal'})"
+            elif isinstance(key, tuple):
+                label = f"Standard attack ({_DTYPE_LABELS[key[1]]})"
+            else:
+                label = names[key]
+            if label == skill_name:
+                return key
+        return None
+
+    def skill_sketch(self, mode, skill_name, target=None):
+        """QuantileSketch einer Tabellenzeile (über alle Ziele zusammengeführt) oder None."""
+        scope = self._scope(target)
+        rows = self._index[mode].rows.get(scope) if scope is not False else None
+        if not rows:
+            return None
+        key = self._row_key(mode, skill_name, rows)
+        return self._index[mode].sketch(scope, key) if key is not None else None
+
+    def skill_details(self, mode, skill_name, target=None, bins: int = HIST_BINS):
+        """
+        Detaildaten einer Tabellenzeile oder None:
+        skill, hits, min, max, avg, total, median, p90, p99, hist (bins Klassen min..max)
+        """
+        scope = self._scope(target)
+        rows = self._index[mode].rows.get(scope) if scope is not False else None
+        if not rows:
+            return None
+        key = self._row_key(mode, skill_name, rows)
+        if key is None:
+            return None
+        hits, total, lo, hi, _, _ = rows[key]
+        sk = self._index[mode].sketch(scope, key)
+        median, p90, p99 = sk.quantiles((0.5, 0.9, 0.99))
+        return {'skill': skill_name, 'hits': hits, 'min': lo, 'max': hi,
+                'avg': total / hits if hits else 0.0, 'total': total,
+                'median': median, 'p90': p90, 'p99': p99, 'hist': sk.histogram(bins)}
+
+    # ── snapshots for "Select combat" (ids bleiben gültig: Registry ist append-only) ──
+    def snapshot(self):
+        return {
+            k: {
+                'events': v['events'].copy(),
+                'total': v['total'],
+                'max': v['max'],
+                'max_skill': v['max_skill'],
+            }
+            for k, v in self.modes.items()
+        }
+
+    def load_snapshot(self, modes):
+        self.version += 1
+        self._index = {m: _ModeIndex() for m in MODES}
+        for k in MODES:
+            agg = self.modes[k]
+            agg['events'] = modes[k]['events'].copy()
+            agg['total'] = modes[k]['total']
+            agg['max'] = modes[k]['max']
+            agg['max_skill'] = modes[k]['max_skill']
+            # Index spaltenweise in einem Rutsch aus den Events aufbauen
+            evts = agg['events']
+            if evts:
+                self._index_many(k, 0, evts.time, evts.amount, evts.target, evts.skill, evts.type)
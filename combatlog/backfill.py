@@ -0,0 +1,211 @@
+"""
+Offline backfill: parse an existing combat log at full speed and split it
+into fights.
+
+The live tail starts at the end of the log, so anything written before the
+overlay was started is never seen. `Backfill` memory-maps the file, cuts it
+into large blocks at line boundaries, runs them through the byte pre-filter
+and the same grammars as the tail, and hands the events to a
+`FightSegmenter`:
+
+    bf = Backfill(path, entities, progress=lambda done, total: ...)
+    fights = bf.run()            # [CombatAggregator], oldest first
+    bf.cancel()                  # from another thread, run() returns early
+
+The log has no timestamps, so fights are split by their enemies: a fight ends
+when SEGMENT_CONFIRM hostile events (hits / damage taken) in a row only
+involve enemies that were not part of it. Event times are 0.0, so backfilled
+fights show totals, hits and min/avg/max but no per-second rates.
+"""
+
+import mmap
+import os
+import time
+from collections import deque
+
+from .aggregate import CombatAggregator
+from .batch import KIND_HEAL, EventBatch, parse_lines
+from .debuglog import TAIL
+from .entities import EntityRegistry
+from .logfiles import BOM_BYTES, detect_encoding
+from .parser import LineClassifier
+from .prefilter import BytePrefilter, newline_bytes, settle_prefilter
+
+BACKFILL_BLOCK = 1 << 23    # 8 MiB pro Block
+SEGMENT_CONFIRM = 20        # feindliche Events ohne alten Gegner -> neuer Kampf
+MAX_FIGHTS = 10             # so viele Kämpfe (die letzten) werden behalten
+
+
+class FightSegmenter:
+    """
+    Splits a stream of EventBatches into fights by enemy turnover.
+
+    The first hostile event against an enemy the current fight has not seen
+    marks a possible split. If one of the old enemies shows up again before
+    `confirm` hostile events have passed, the new enemy joins the fight
+    (multi-pull). Otherwise the fight is closed at the marked event.
+    """
+
+    def __init__(self, entities: EntityRegistry, confirm: int = SEGMENT_CONFIRM):
+        self.entities = entities
+        self.confirm = confirm
+        self._cur = EventBatch(entities)    # laufender Kampf (inkl. Kandidaten-Events)
+        self._start = 0                     # Kampfbeginn in _cur (vorne abgeschlossene Kämpfe)
+        self._enemies = set()
+        self._cand = None                   # Index in _cur: erstes Event des möglichen neuen Kampfs
+        self._new = set()
+        self._new_hits = 0
+
+    def feed(self, batch) -> list:
+        """Events anhängen. Rückgabe: abgeschlossene Kämpfe (EventBatches)."""
+        done = []
+        if not batch:
+            return done
+        base = len(self._cur)
+        self._cur.extend(batch)
+        for i, (kind, enemy) in enumerate(zip(batch.kind, batch.target), base):
+            if kind == KIND_HEAL:
+                continue
+            if not self._enemies:
+                self._enemies.add(enemy)
+            elif self._cand is None:
+                if enemy not in self._enemies:
+                    self._cand = i
+                    self._new = {enemy}
+                    self._new_hits = 1
+            elif enemy in self._enemies:
+                # alter Gegner wieder dabei -> gleicher Kampf
+                self._enemies |= self._new
+                self._cand = None
+            else:
+                self._new.add(enemy)
+                self._new_hits += 1
+                if self._new_hits >= self.confirm:
+                    done.append(self._split())
+        if self._start:
+            # abgeschlossene Kämpfe einmal pro Batch vorne abschneiden
+            self._cur = self._cur.slice(self._start)
+            if self._cand is not None:
+                self._cand -= self._start
+            self._start = 0
+        return done
+
+    def _split(self):
+        fight = self._cur.slice(self._start, self._cand)
+        self._start = self._cand
+        self._enemies = self._new
+        self._cand = None
+        self._new = set()
+        return fight
+
+    def finish(self) -> list:
+        """Rest als letzte(r) Kampf/Kämpfe."""
+        done = []
+        if self._cand is not None:
+            done.append(self._split())
+        if len(self._cur) > self._start:
+            done.append(self._cur.slice(self._start))
+        self._cur = EventBatch(self.entities)
+        self._start = 0
+        self._enemies = set()
+        return done
+
+
+class Backfill:
+    """
+    Parses a whole combat log via mmap and returns its fights.
+
+    entities:   EntityRegistry of the session (fights are loaded into its aggregates)
+    progress:   callback(bytes_done, bytes_total), called once per block
+    max_fights: only the last max_fights fights are kept (None = all)
+    start, end: byte range to parse (must start at a line); default whole file
+    """
+
+    def __init__(self, path: str, entities: EntityRegistry = None, classifier=None,
+                 progress=None, max_fights: int = MAX_FIGHTS, block_size: int = BACKFILL_BLOCK,
+                 confirm: int = SEGMENT_CONFIRM, start: int = 0, end: int = None):
+        self.path = path
+        self.start = start                  # Byte-Bereich [start, end), an Zeilengrenzen
+        self.end = end
+        self.entities = entities if entities is not None else EntityRegistry()
+        # eigener Classifier: der Tail-Thread darf parallel laufen
+        self.classifier = classifier if classifier is not None else LineClassifier()
+        self.progress = progress
+        self.max_fights = max_fights
+        self.block_size = block_size
+        self.confirm = confirm
+        self.cancelled = False
+        self.done = False
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.events = 0
+        self.fights_seen = 0
+        self.seconds = 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def fraction(self) -> float:
+        return self.bytes_done / self.bytes_total if self.bytes_total else 0.0
+
+    def fight_batches(self):
+        """Generator: ein EventBatch je Kampf, in Dateireihenfolge (Basis von run())."""
+        enc = detect_encoding(self.path)
+        prefilter = BytePrefilter(enc, classifier=self.classifier)
+        segmenter = FightSegmenter(self.entities, self.confirm)
+
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start = self.start or BOM_BYTES.get(enc, 0)
+            end = size if self.end is None else min(self.end, size)
+            self.bytes_total = max(0, end - start)
+            if end > start:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    pos = start
+                    pending = b""
+                    while pos < end and not self.cancelled:
+                        chunk = mm[pos:min(pos + self.block_size, end)]
+                        pos += len(chunk)
+                        lines, pending = prefilter.feed(pending + chunk)
+                        prefilter = settle_prefilter(prefilter)
+                        if not pos < end and pending:
+                            # letzte Zeile ohne Zeilenende
+                            tail, pending = prefilter.feed(pending + newline_bytes(enc))
+                            lines += tail
+                        batch = parse_lines(lines, self.classifier, self.entities)
+                        self.events += len(batch)
+                        fights = segmenter.feed(batch)
+                        self.fights_seen += len(fights)
+                        self.bytes_done = pos - start
+                        if self.progress is not None:
+                            self.progress(self.bytes_done, self.bytes_total)
+                        yield from fights
+        fights = segmenter.finish()
+        self.fights_seen += len(fights)
+        yield from fights
+
+    def run(self) -> list:
+        """Parst die Datei. Rückgabe: [CombatAggregator] (älteste zuerst); bei cancel() bis dahin."""
+        t0 = time.perf_counter()
+        kept = deque(self.fight_batches(), maxlen=self.max_fights)
+        fights = []
+        for batch in kept:
+            combat = CombatAggregator(self.entities)
+            combat.add_batch(batch)
+            fights.append(combat)
+        self.seconds = time.perf_counter() - t0
+        self.done = True
+        TAIL.info("backfill %s: %.1f MB, %d events, %d fights in %.2fs%s",
+                  self.path, self.bytes_done / 1e6, self.events, self.fights_seen,
+                  self.seconds, " (cancelled)" if self.cancelled else "")
+        return fights
+
+    def stats(self) -> dict:
+        return {
+            'bytes': self.bytes_done,
+            'events': self.events,
+            'fights': self.fights_seen,
+            'seconds': self.seconds,
+            'mb_per_s': self.bytes_done / 1e6 / self.seconds if self.seconds else 0.0,
+        }
@@ -0,0 +1,130 @@
+"""
+Batch / columnar parse API.
+
+`parse_lines` classifies a whole block of log lines and returns one
+`EventBatch`: parallel `array` columns instead of one tuple per event. The
+live tail puts one batch per read into the queue and the offline paths feed
+batches straight into the aggregator.
+
+Columns (one entry per event):
+    kind    KIND_HIT / KIND_HEAL / KIND_TAKEN
+    amount  damage / heal value
+    target  entities.targets id: target (dps), ally (hps) or attacker (dts)
+    skill   entities.skills id
+    detail  entities.types id of rtype (hps) / dtype (dts), NO_ID if not logged
+    flags   FLAG_PET, ...
+    time    timestamp of the read (same value for the whole block)
+"""
+
+from array import array
+
+from .entities import EntityRegistry
+from .parser import LineClassifier
+
+KIND_HIT, KIND_HEAL, KIND_TAKEN = 0, 1, 2
+KIND_NAMES = ('hit', 'heal', 'taken')
+
+FLAG_PET = 0x01
+
+NO_ID = -1
+
+
+class EventBatch:
+    """Parallel columns of parsed events, names resolved via `entities`."""
+
+    __slots__ = ('entities', 'kind', 'amount', 'target', 'skill', 'detail', 'flags', 'time')
+
+    def __init__(self, entities: EntityRegistry):
+        self.entities = entities
+        self.kind = array('b')
+        self.amount = array('q')
+        self.target = array('l')
+        self.skill = array('l')
+        self.detail = array('l')
+        self.flags = array('B')
+        self.time = array('d')
+
+    def __len__(self):
+        return len(self.kind)
+
+    def extend(self, other: "EventBatch"):
+        """Hängt einen Batch mit derselben EntityRegistry an."""
+        if other.entities is not self.entities:
+            raise ValueError("batches use different entity registries")
+        for col in ('kind', 'amount', 'target', 'skill', 'detail', 'flags', 'time'):
+            getattr(self, col).extend(getattr(other, col))
+
+    def slice(self, start: int, stop: int = None) -> "EventBatch":
+        """Teil-Batch [start:stop] mit derselben EntityRegistry."""
+        out = EventBatch(self.entities)
+        for col in ('kind', 'amount', 'target', 'skill', 'detail', 'flags', 'time'):
+            setattr(out, col, getattr(self, col)[start:stop])
+        return out
+
+    def iter_events(self):
+        """Events als Parser-Tupel (kompatibel zu LineClassifier.classify)."""
+        targets = self.entities.targets.names
+        skills = self.entities.skills.names
+        types = self.entities.types.names
+        for k, amt, tgt, sk, det, fl in zip(self.kind, self.amount, self.target,
+                                            self.skill, self.detail, self.flags):
+            extra = bool(fl & FLAG_PET) if k == KIND_HIT else (types[det] if det != NO_ID else None)
+            yield (KIND_NAMES[k], amt, targets[tgt], skills[sk], extra)
+
+
+_DEFAULT_CLASSIFIER = None
+
+
+def parse_lines(lines, classifier: LineClassifier = None, entities: EntityRegistry = None,
+                ts: float = 0.0) -> EventBatch:
+    """
+    Parst einen Block Zeilen in einen EventBatch.
+
+    classifier: LineClassifier (Default: gemeinsame Instanz)
+    entities:   EntityRegistry für Targets/Skills/Typen; über alle Batches
+                dieselbe Registry verwenden, damit ids stabil bleiben
+    ts:         Zeitstempel des Blocks (z.B. time.time() beim Lesen)
+    """
+    global _DEFAULT_CLASSIFIER
+    if classifier is None:
+        if _DEFAULT_CLASSIFIER is None:
+            _DEFAULT_CLASSIFIER = LineClassifier()
+        classifier = _DEFAULT_CLASSIFIER
+    if entities is None:
+        entities = EntityRegistry()
+
+    batch = EventBatch(entities)
+    classify = classifier.classify
+    intern_target = entities.targets.intern
+    intern_skill = entities.skills.intern
+    intern_type = entities.types.intern
+    kind_append = batch.kind.append
+    amount_append = batch.amount.append
+    target_append = batch.target.append
+    skill_append = batch.skill.append
+    detail_append = batch.detail.append
+    flags_append = batch.flags.append
+
+    for line in lines:
+        evt = classify(line)
+        if evt is None:
+            continue
+        et = evt[0]
+        if et == 'hit':
+            kind_append(KIND_HIT)
+            # DE-Treffer liefern kein is_pet
+            flags_append(FLAG_PET if len(evt) == 5 and evt[4] else 0)
+            detail_append(NO_ID)
+        else:
+            kind_append(KIND_HEAL if et == 'heal' else KIND_TAKEN)
+            flags_append(0)
+            extra = evt[4]
+            detail_append(intern_type(extra) if extra else NO_ID)
+        amount_append(evt[1])
+        target_append(intern_target(evt[2]))
+        skill_append(intern_skill(evt[3]))
+
+    n = len(batch.kind)
+    if n:
+        batch.time = array('d', [ts]) * n
+    return batch
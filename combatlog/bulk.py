@@ -0,0 +1,280 @@
+"""
+Bulk import of many combat logs on all cores.
+
+    imp = BulkImport(folder)        # or a list of files
+    fights = imp.run()              # [FightStats], oldest log first
+    imp.worker_stats()              # {pid: {'tasks', 'bytes', 'events', 'seconds', 'mb_per_s'}}
+
+The work is cut into byte ranges. Small files are one range each, and files
+larger than RANGE_BYTES are split at line starts. Every range is parsed in a
+ProcessPoolExecutor worker with the same Backfill / FightSegmenter as the
+overlay. Each fight is reduced to a `FightStats` (hits / total / min / max per
+target, skill and type) before it goes back to the parent, so only small
+dicts cross the process boundary.
+
+The parent puts the ranges back together in file order. A fight cut by a
+range boundary is merged again when the last fight of one range and the
+first fight of the next share an enemy.
+
+A log that is rotated or deleted while the import runs is skipped, at
+planning time as well as in the workers; it never aborts the whole import.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .backfill import SEGMENT_CONFIRM, Backfill
+from .batch import KIND_HEAL, NO_ID
+from .debuglog import TAIL
+from .entities import EntityRegistry
+from .logfiles import LogDirIndex, detect_encoding
+from .prefilter import newline_bytes
+
+RANGE_BYTES = 1 << 26       # 64 MiB: größere Dateien werden aufgeteilt
+SCAN_BYTES = 1 << 16        # Fenster für die Suche nach dem nächsten Zeilenanfang
+
+_KIND_MODES = ('dps', 'hps', 'dts')     # KIND_HIT / KIND_HEAL / KIND_TAKEN
+
+
+class FightStats:
+    """
+    Mergeable aggregate of one fight.
+
+    rows[mode][(target, skill, type)] = [hits, total, min, max]
+    Keyed by names, because every worker has its own EntityRegistry.
+    type: damage type (dts) / resource (hps) or None.
+    """
+
+    __slots__ = ('path', 'enemies', 'rows', 'events')
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.enemies = set()
+        self.rows = {m: {} for m in _KIND_MODES}
+        self.events = 0
+
+    @classmethod
+    def from_batch(cls, batch, path: str = None) -> "FightStats":
+        """Aggregiert einen EventBatch (ein Kampf)."""
+        fs = cls(path)
+        by_ids = [{} for _ in _KIND_MODES]
+        for kind, amt, tgt, sk, det in zip(batch.kind, batch.amount, batch.target,
+                                           batch.skill, batch.detail):
+            rows = by_ids[kind]
+            r = rows.get((tgt, sk, det))
+            if r is None:
+                rows[(tgt, sk, det)] = [1, amt, amt, amt]
+                continue
+            r[0] += 1
+            r[1] += amt
+            if amt < r[2]:
+                r[2] = amt
+            elif amt > r[3]:
+                r[3] = amt
+
+        ent = batch.entities
+        targets, skills, types = ent.targets.names, ent.skills.names, ent.types.names
+        for kind, rows in enumerate(by_ids):
+            out = fs.rows[_KIND_MODES[kind]]
+            for (tgt, sk, det), r in rows.items():
+                out[(targets[tgt], skills[sk], types[det] if det != NO_ID else None)] = r
+                if kind != KIND_HEAL:
+                    fs.enemies.add(targets[tgt])
+        fs.events = len(batch)
+        return fs
+
+    def merge(self, other: "FightStats"):
+        """Addiert einen anderen Teil desselben Kampfs."""
+        self.enemies |= other.enemies
+        self.events += other.events
+        for mode, rows in other.rows.items():
+            mine = self.rows[mode]
+            for key, (hits, total, lo, hi) in rows.items():
+                r = mine.get(key)
+                if r is None:
+                    mine[key] = [hits, total, lo, hi]
+                    continue
+                r[0] += hits
+                r[1] += total
+                r[2] = min(r[2], lo)
+                r[3] = max(r[3], hi)
+
+    def total(self, mode: str) -> int:
+        return sum(r[1] for r in self.rows[mode].values())
+
+    def skill_totals(self, mode: str) -> dict:
+        """{skill: [hits, total, min, max]} über alle Ziele und Typen."""
+        out = {}
+        for (_, skill, _), (hits, total, lo, hi) in self.rows[mode].items():
+            r = out.get(skill)
+            if r is None:
+                out[skill] = [hits, total, lo, hi]
+                continue
+            r[0] += hits
+            r[1] += total
+            r[2] = min(r[2], lo)
+            r[3] = max(r[3], hi)
+        return out
+
+
+def _next_line_start(f, pos: int, nl: bytes):
+    """Erster Zeilenanfang ab pos (UTF-16: gerade Offsets) oder None."""
+    w = len(nl)
+    pos += pos % w
+    f.seek(pos)
+    while True:
+        data = f.read(SCAN_BYTES)
+        if not data:
+            return None
+        i = data.find(nl)
+        while i != -1 and i % w:
+            i = data.find(nl, i + 1)
+        if i != -1:
+            return pos + i + w
+        pos += len(data)
+
+
+def plan_ranges(paths, range_bytes: int = RANGE_BYTES) -> list:
+    """Arbeitspakete [(path, start, end)]; end None = Dateiende."""
+    tasks = []
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            continue
+        if size <= range_bytes:
+            tasks.append((path, 0, None))
+            continue
+        cuts = [0]
+        try:
+            nl = newline_bytes(detect_encoding(path))
+            with open(path, 'rb') as f:
+                for pos in range(range_bytes, size, range_bytes):
+                    cut = _next_line_start(f, max(pos, cuts[-1]), nl)
+                    if cut is None or cut >= size:
+                        break
+                    cuts.append(cut)
+        except OSError:
+            continue
+        tasks.extend((path, a, b) for a, b in zip(cuts, cuts[1:] + [None]))
+    return tasks
+
+
+def _import_range(path, start, end, confirm):
+    """Worker: parst einen Byte-Bereich, Rückgabe (pid, bytes, events, sekunden, [FightStats])."""
+    t0 = time.perf_counter()
+    bf = Backfill(path, EntityRegistry(), max_fights=None, confirm=confirm, start=start, end=end)
+    try:
+        fights = [FightStats.from_batch(b, path) for b in bf.fight_batches()]
+    except OSError as e:
+        # seit der Planung rotiert/gelöscht: Bereich überspringen
+        TAIL.warning("bulk import: skipping %s: %r", path, e)
+        fights = []
+    return os.getpid(), bf.bytes_done, bf.events, time.perf_counter() - t0, fights
+
+
+def _file_size(path) -> int:
+    """Größe in Bytes, 0 wenn die Datei inzwischen verschwunden ist."""
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class BulkImport:
+    """
+    Parses a folder (or list) of combat logs with a process pool.
+
+    workers:  processes (default: all cores); 1 = in this process
+    progress: callback(bytes_done, bytes_total), called per finished range
+    """
+
+    def __init__(self, source, workers: int = None, range_bytes: int = RANGE_BYTES,
+                 confirm: int = SEGMENT_CONFIRM, progress=None):
+        if isinstance(source, str):
+            index = LogDirIndex(source)
+            index.refresh(force=True)
+            source = index.paths()
+        self.paths = list(source)
+        self.workers = workers or os.cpu_count() or 1
+        self.range_bytes = range_bytes
+        self.confirm = confirm
+        self.progress = progress
+        self.cancelled = False
+        self.tasks = []
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.seconds = 0.0
+        self._workers = {}
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self) -> list:
+        """Rückgabe: [FightStats] in Log-Reihenfolge (nur fertige Bereiche bei cancel())."""
+        t0 = time.perf_counter()
+        self.tasks = tasks = plan_ranges(self.paths, self.range_bytes)
+        self.bytes_total = sum(_file_size(p) for p in {t[0] for t in tasks})
+        results = [None] * len(tasks)
+
+        if self.workers == 1 or len(tasks) <= 1:
+            for i, task in enumerate(tasks):
+                if self.cancelled:
+                    break
+                results[i] = self._record(_import_range(*task, self.confirm))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as pool:
+                futures = {pool.submit(_import_range, *task, self.confirm): i
+                           for i, task in enumerate(tasks)}
+                for fut in as_completed(futures):
+                    if self.cancelled:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        break
+                    results[futures[fut]] = self._record(fut.result())
+
+        # Bereiche in Dateireihenfolge zusammensetzen
+        fights = []
+        prev = None
+        for (path, start, _), res in zip(tasks, results):
+            if res is None:
+                prev = None
+                continue
+            if (res and fights and start and prev == path
+                    and fights[-1].enemies & res[0].enemies):
+                # Kampf über eine Bereichsgrenze
+                fights[-1].merge(res.pop(0))
+            fights.extend(res)
+            prev = path
+        self.seconds = time.perf_counter() - t0
+        return fights
+
+    def _record(self, result):
+        pid, nbytes, events, seconds, fights = result
+        w = self._workers.setdefault(pid, {'tasks': 0, 'bytes': 0, 'events': 0, 'seconds': 0.0})
+        w['tasks'] += 1
+        w['bytes'] += nbytes
+        w['events'] += events
+        w['seconds'] += seconds
+        self.bytes_done += nbytes
+        if self.progress is not None:
+            self.progress(self.bytes_done, self.bytes_total)
+        return fights
+
+    def worker_stats(self) -> dict:
+        """Je Worker-Prozess: tasks / bytes / events / seconds / mb_per_s."""
+        return {
+            pid: dict(w, mb_per_s=w['bytes'] / 1e6 / w['seconds'] if w['seconds'] else 0.0)
+            for pid, w in self._workers.items()
+        }
+
+    def stats(self) -> dict:
+        busy = sum(w['seconds'] for w in self._workers.values())
+        return {
+            'files': len({t[0] for t in self.tasks}),
+            'ranges': len(self.tasks),
+            'bytes': self.bytes_done,
+            'seconds': self.seconds,
+            'mb_per_s': self.bytes_done / 1e6 / self.seconds if self.seconds else 0.0,
+            'parallelism': busy / self.seconds if self.seconds else 0.0,
+        }
@@ -0,0 +1,102 @@
+"""
+Template-keyed memoization of parsed lines.
+
+Combat logs repeat the same sentence thousands of times with only the numbers
+changing ("Ihr trefft den Ork ... nimmt 1.234 Punkte Schaden ..."). The cache
+key is the line with one numeric token masked out: the first one, or the last
+one for grammars whose amount ends the sentence ("You hit ... for 1,234
+points"), so digits in the names before it stay in the key. The token's
+separators stay in the key too, so '1.234' and '999' are different templates.
+The value is the resolved event (kind, target, skill, is_pet / type), so a hit
+only needs one `int()` instead of the grammar's regex work.
+
+Only events whose amount is the masked token and whose names do not contain
+it are cached, so a key always stands for the same names. (Every grammar
+delimits names by spaces, quotes or brackets, so a name that overlaps the
+token contains all of it.)
+"""
+
+import re
+from collections import OrderedDict
+
+# first numeric token; "\D*" + match() is much faster than search() for a leading \d
+_FIRST_NUM = re.compile(r"\D*(\d+(?:[.,]\d+)*)")
+_DROP_DIGITS = str.maketrans("", "", "0123456789")
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+def split_template(text: str, last: bool = False):
+    """
+    '... nimmt 1.234 Punkte' -> ('... nimmt \\0.\\0 Punkte', '1.234'); (None, None) ohne Zahl
+    last: statt der ersten die letzte Zahl maskieren
+    """
+    if last:
+        # das Token-Muster ist symmetrisch: erste Zahl der umgedrehten Zeile
+        m = _FIRST_NUM.match(text[::-1])
+        if m is None:
+            return None, None
+        n = len(text)
+        start, end = n - m.end(1), n - m.start(1)
+    else:
+        m = _FIRST_NUM.match(text)
+        if m is None:
+            return None, None
+        start, end = m.start(1), m.end(1)
+    tok = text[start:end]
+    return f"{text[:start]}\0{tok.translate(_DROP_DIGITS)}\0{text[end:]}", tok
+
+
+def _amount(tok: str) -> int:
+    return int(tok.replace(",", "").replace(".", ""))
+
+
+class ParseCache:
+    """
+    Bounded LRU: template key -> event template.
+
+    Used by the tail thread only. `clear()` may be called from the UI thread
+    (pet names changed) and just swaps the dict.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key, tok):
+        """Event für einen Template-Key oder None (zählt Hit/Miss)."""
+        data = self._data
+        tmpl = data.get(key)
+        if tmpl is None:
+            self.misses += 1
+            return None
+        data.move_to_end(key)
+        self.hits += 1
+        return (tmpl[0], _amount(tok)) + tmpl[2:]
+
+    def store(self, key, tok, evt):
+        """Merkt sich evt, wenn der Betrag das maskierte Token ist und kein Name es enthält."""
+        if key is None or _amount(tok) != evt[1]:
+            return
+        for s in evt[2:]:
+            if isinstance(s, str) and tok in s:
+                return
+        data = self._data
+        data[key] = evt
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def clear(self):
+        self._data = OrderedDict()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
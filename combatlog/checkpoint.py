@@ -0,0 +1,132 @@
+"""
+Persistent tail position, so a restart continues where the last run stopped.
+
+    cp = TailCheckpoint(file)
+    offset = cp.resume_offset(log_path)     # None = start at the end as before
+    ...
+    cp.update(log_path, reader.offset)      # hot path: only remembers the tuple
+    cp.flush()                              # while idle: writes at most every CHECKPOINT_INTERVAL s
+    cp.flush(force=True)                    # on close
+
+A checkpoint is only used for the same file. The path, the inode (file index
+on Windows) and a CRC of the first bytes must match, and the file must not be
+shorter than the offset. Checkpoints older than RESUME_MAX_AGE are ignored, so
+starting the overlay hours later does not pull old fights into the new one.
+"""
+
+import json
+import os
+import threading
+import time
+import zlib
+
+from .debuglog import TAIL
+
+CHECKPOINT_INTERVAL = 2.0   # s, höchstens so oft schreiben
+RESUME_MAX_AGE = 600.0      # s, ältere Checkpoints -> ab Dateiende lesen
+HEAD_BYTES = 256            # Dateianfang für die CRC (erkennt neu angelegte Logs)
+
+
+def _file_id(path: str, head_len: int = HEAD_BYTES):
+    """(inode, head_len, crc) einer Datei; OSError wenn sie fehlt."""
+    st = os.stat(path)
+    with open(path, 'rb') as f:
+        head = f.read(head_len)
+    return st.st_ino, len(head), zlib.crc32(head)
+
+
+class TailCheckpoint:
+    """(path, inode, head CRC, byte offset) of the tailed log, stored as JSON."""
+
+    def __init__(self, file: str, interval: float = CHECKPOINT_INTERVAL,
+                 max_age: float = RESUME_MAX_AGE):
+        self.file = file
+        self.interval = interval
+        self.max_age = max_age
+        self.writes = 0
+        self.active = True          # False nach clear(), bis der nächste Tail startet
+        self._state = None          # (path, offset) – ein Tupel, atomar gesetzt
+        self._ids = {}              # path -> _file_id(), einmal je Log
+        self._written = None
+        self._last_write = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, path: str, offset: int):
+        """Merkt sich die Position (kein I/O)."""
+        if self.active:
+            self._state = (path, offset)
+
+    def clear(self):
+        """Checkpoint verwerfen (z.B. Stop: beim nächsten Start nicht nachlesen)."""
+        self.active = False
+        self._state = None
+        with self._lock:
+            self._written = None
+            try:
+                os.remove(self.file)
+            except OSError:
+                pass
+
+    def flush(self, force: bool = False) -> bool:
+        """Schreibt den letzten Stand, wenn er sich geändert hat. Rückgabe: True = geschrieben."""
+        state = self._state
+        if state is None or state == self._written:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_write < self.interval:
+            return False
+        path, offset = state
+        with self._lock:
+            try:
+                ids = self._ids.get(path)
+                if ids is None:
+                    ids = self._ids[path] = _file_id(path)
+                ino, head_len, crc = ids
+                data = {'path': os.path.abspath(path), 'ino': ino, 'head_len': head_len,
+                        'crc': crc, 'offset': offset, 'saved': time.time()}
+                tmp = self.file + ".tmp"
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.file)
+            except OSError as e:
+                TAIL.warning("checkpoint write failed: %r", e)
+                return False
+            self._written = state
+            self._last_write = now
+            self.writes += 1
+        return True
+
+    def load(self):
+        """Gespeicherter Checkpoint (dict) oder None."""
+        try:
+            with open(self.file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            TAIL.warning("checkpoint unreadable: %r", e)
+            return None
+        return data if isinstance(data, dict) else None
+
+    def resume_offset(self, path: str):
+        """Offset zum Weiterlesen von path, oder None (anderes/neues Log, zu alt, gekürzt)."""
+        data = self.load()
+        if not data:
+            return None
+        try:
+            if os.path.normcase(data['path']) != os.path.normcase(os.path.abspath(path)):
+                return None
+            if time.time() - data['saved'] > self.max_age:
+                TAIL.info("checkpoint older than %ss, not resuming", self.max_age)
+                return None
+            ino, head_len, crc = _file_id(path, data['head_len'])
+            offset = int(data['offset'])
+            if ino != data['ino'] or head_len != data['head_len'] or crc != data['crc']:
+                TAIL.info("checkpoint is for an older file at %s", path)
+                return None
+            if os.path.getsize(path) < offset:
+                return None
+        except (KeyError, TypeError, ValueError, OSError) as e:
+            TAIL.info("checkpoint ignored: %r", e)
+            return None
+        return offset
@@ -0,0 +1,52 @@
+"""
+Parse-related constants shared by the combatlog package and the overlay.
+
+`config.py` re-exports these names, so `config.PET_NAMES` and
+`combatlog.constants.PET_NAMES` are the same list object. The settings code
+updates that list in place.
+"""
+
+AA_SKILLS = {
+    "Dual-wield Attack",
+    "Bow Attack",
+    "Weapon Attack",
+    "1H Weapon/Shield Attack",
+    "2H Weapon Attack",
+    "Bogenangriff",
+    "1H-Waffen-/Schild-Angriff",
+    "Doppelangriff",
+    "2H-Waffen-Angriff",
+    "Waffen-Angriff",
+}
+
+# Dateinamen der Combat-Logs (EN + DE Client)
+LOG_FILE_PATTERNS = (
+    "Combat_*.txt",
+    "CombatLog_*.txt",
+    "combat_*.txt",
+    "Kampf_*.txt",
+)
+
+# Default-Pet-Namen (englisch + deutsch etc.)
+DEFAULT_PET_NAMES = [
+    "Raven",
+    "Lesser Giant Eagle",
+    "Bear",
+    "Lynx",
+    "Commoner Herald",
+    "Maid-at-arms Herald",
+    "Man-at-arms Herald",
+    "Shield-maiden Herald",
+    "Swordswoman Herald",
+    "Pilgrim Herald",
+    "Squire Herald",
+    "Noble Spirit",
+    "Greater Noble Spirit",
+    "Rabe",
+    "Adler",
+    "Luchs",
+    "Bär",
+]
+DEFAULT_PET_NAMES_LOWER = [n.lower() for n in DEFAULT_PET_NAMES]
+# Aktive Pet-Liste (wird zur Laufzeit überschrieben)
+PET_NAMES = [n.lower() for n in DEFAULT_PET_NAMES]
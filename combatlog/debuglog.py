@@ -0,0 +1,144 @@
+"""
+Category-based debug logging (parse, tail, ui, cfg).
+
+Replaces the old DEBUG_PARSE prints. Every category is a `Channel` with plain
+bool flags per level, so hot paths pay one attribute check while logging is
+off and nothing gets formatted:
+
+    if PARSE.debug_on:
+        PARSE.debug("hit actor=%r is_pet=%s", actor, is_pet)
+
+Enabled channels are rate-limited (token bucket, `rate` messages/s). Dropped
+messages are counted and reported with the next message that gets through.
+Output goes to stdout or to a rotating log file (stdlib logging handlers).
+All of it can be changed at runtime via `configure()`.
+"""
+
+import logging
+import logging.handlers
+import sys
+import time
+
+CATEGORIES = ('parse', 'tail', 'ui', 'cfg')
+
+LEVELS = {
+    'off':     logging.CRITICAL + 10,
+    'error':   logging.ERROR,
+    'warning': logging.WARNING,
+    'info':    logging.INFO,
+    'debug':   logging.DEBUG,
+}
+DEFAULT_LEVEL = 'warning'
+DEFAULT_RATE = 50               # messages/s per channel, 0 = unlimited
+
+LOG_FILE_MAX_BYTES = 1 << 20    # 1 MiB per file
+LOG_FILE_BACKUPS = 3
+
+_FORMAT = "%(asctime)s %(levelname)-7s [%(name)s] %(message)s"
+
+_ROOT = logging.getLogger("eoa")
+_ROOT.setLevel(logging.DEBUG)   # gefiltert wird in den Channels
+_ROOT.propagate = False
+
+
+class Channel:
+    """One log category with precomputed level flags and a rate limit."""
+
+    __slots__ = ('name', 'logger', 'level', 'debug_on', 'info_on', 'warning_on',
+                 'rate', 'suppressed', '_tokens', '_last')
+
+    def __init__(self, name: str, level: str = DEFAULT_LEVEL, rate: float = DEFAULT_RATE):
+        self.name = name
+        self.logger = _ROOT.getChild(name)
+        self.rate = rate
+        self.suppressed = 0
+        self._tokens = float(rate)
+        self._last = time.monotonic()
+        self.set_level(level)
+
+    def set_level(self, level: str):
+        if level not in LEVELS:
+            raise ValueError(f"unknown log level {level!r}")
+        self.level = LEVELS[level]
+        self.debug_on = self.level <= logging.DEBUG
+        self.info_on = self.level <= logging.INFO
+        self.warning_on = self.level <= logging.WARNING
+
+    def debug(self, msg, *args):
+        if self.debug_on:
+            self._emit(logging.DEBUG, msg, args)
+
+    def info(self, msg, *args):
+        if self.info_on:
+            self._emit(logging.INFO, msg, args)
+
+    def warning(self, msg, *args):
+        if self.warning_on:
+            self._emit(logging.WARNING, msg, args)
+
+    def error(self, msg, *args):
+        if self.level <= logging.ERROR:
+            self._emit(logging.ERROR, msg, args)
+
+    def _emit(self, lvl, msg, args):
+        if self.rate:
+            now = time.monotonic()
+            tokens = min(float(self.rate), self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if tokens < 1.0:
+                self._tokens = tokens
+                self.suppressed += 1
+                return
+            self._tokens = tokens - 1.0
+        if self.suppressed:
+            n, self.suppressed = self.suppressed, 0
+            self.logger.log(lvl, "(%d messages suppressed)", n)
+        self.logger.log(lvl, msg, *args)
+
+
+PARSE = Channel('parse')
+TAIL = Channel('tail')
+UI = Channel('ui')
+CFG = Channel('cfg')
+
+CHANNELS = {c.name: c for c in (PARSE, TAIL, UI, CFG)}
+
+_handler = None
+
+
+def _make_handler(path):
+    if path:
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding="utf-8")
+    # PyInstaller --windowed: kein stdout/stderr
+    stream = sys.stdout or sys.stderr
+    return logging.StreamHandler(stream) if stream else logging.NullHandler()
+
+
+def configure(level: str = DEFAULT_LEVEL, categories=CATEGORIES, path: str = None,
+              rate: float = None):
+    """
+    Setzt Level und Ausgabe zur Laufzeit.
+
+    level:      'off' / 'error' / 'warning' / 'info' / 'debug' für `categories`
+    categories: aktive Kategorien, alle anderen werden auf 'off' gesetzt
+    path:       Log-Datei (rotierend), None = stdout
+    rate:       Nachrichten/s je Kategorie (None = unverändert, 0 = unbegrenzt)
+    """
+    global _handler
+    for name, ch in CHANNELS.items():
+        ch.set_level(level if name in categories else 'off')
+        if rate is not None:
+            ch.rate = rate
+            ch._tokens = float(rate)
+
+    handler = _make_handler(path)
+    handler.setFormatter(logging.Formatter(_FORMAT, "%H:%M:%S"))
+    if _handler is not None:
+        _ROOT.removeHandler(_handler)
+        _handler.close()
+    _ROOT.addHandler(handler)
+    _handler = handler
+
+
+configure()
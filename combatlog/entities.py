@@ -0,0 +1,66 @@
+"""
+Interning of names (targets, skills, damage/resource types) to small int ids.
+
+Names are interned once at parse time. Events, aggregates and snapshots
+then hold the ids, so a multi-hour session keeps one copy of each name and
+groups by int compares instead of string compares.
+"""
+
+import threading
+
+
+class NameTable:
+    """
+    Append-only str <-> int mapping.
+
+    The tail thread interns while the UI thread looks names up. An id is only
+    handed out after its name has been appended, so readers never see an id
+    without a name. New names are added under a lock, so several parsing
+    threads (tail + backfill) can share one table; known names stay lock-free.
+    """
+
+    __slots__ = ('_ids', 'names', '_lock')
+
+    def __init__(self):
+        self._ids = {}
+        self.names = []
+        self._lock = threading.Lock()
+
+    def intern(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(name)
+                if i is None:
+                    i = len(self.names)
+                    self.names.append(name)
+                    self._ids[name] = i
+        return i
+
+    def id_of(self, name: str):
+        """Id eines bekannten Namens oder None."""
+        return self._ids.get(name)
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def __len__(self):
+        return len(self.names)
+
+
+class EntityRegistry:
+    """
+    Session-wide name tables, shared by the parser (tail thread) and the
+    aggregator so that event columns and aggregates only carry small ints.
+
+    targets: Ziele (dps), Verbündete (hps) und Angreifer (dts)
+    skills:  Skill-Namen (inkl. "DoT damage", "Heal", "Hit", ...)
+    types:   Schadenstypen (dts) und Ressourcen (hps)
+    """
+
+    __slots__ = ('targets', 'skills', 'types')
+
+    def __init__(self):
+        self.targets = NameTable()
+        self.skills = NameTable()
+        self.types = NameTable()
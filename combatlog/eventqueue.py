@@ -0,0 +1,158 @@
+"""
+Bounded queue between the tail thread and the UI timer.
+
+    q = EventQueue()
+    q.put(item, events, timeout)    # tail thread; False = still full after timeout
+    item = q.get_nowait()           # UI thread; None = empty
+    q.unget(item, events)           # rest of the last item, back to the front
+    q.stats()                       # depth, lag, blocked / dropped counters
+
+on_ready is called (from the producer thread) when a put() makes the queue
+non-empty. The overlay connects it to a queued Qt signal and drains at once,
+instead of waiting for the next timer tick.
+
+Items are whole EventBatches (one per read block), so a put or get costs the
+same for 1 or 10000 events. The bound is counted in events, not items. A
+single item larger than the bound still fits into an empty queue.
+
+Overflow policies:
+    'block'        the producer waits (default). The tail thread stops reading,
+                   so the log file on disk is the buffer and nothing is lost;
+                   it catches up in large blocks afterwards.
+    'drop_oldest'  the oldest items are discarded to make room
+    'drop_newest'  the new item is discarded
+"""
+
+import threading
+import time
+from collections import deque
+
+QUEUE_MAX_EVENTS = 200_000  # Events in der Queue, bevor die Overflow-Policy greift
+
+OVERFLOW_BLOCK = 'block'
+OVERFLOW_DROP_OLDEST = 'drop_oldest'
+OVERFLOW_DROP_NEWEST = 'drop_newest'
+POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST)
+
+
+class EventQueue:
+    """Thread-safe FIFO of (put time, events, item), bounded by the sum of events."""
+
+    def __init__(self, max_events: int = QUEUE_MAX_EVENTS, policy: str = OVERFLOW_BLOCK,
+                 on_ready=None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown overflow policy {policy!r}")
+        self.max_events = max_events
+        self.policy = policy
+        self.on_ready = on_ready    # callable() bei leer -> nicht leer
+        self._items = deque()
+        self._events = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._got_at = None         # Put-Zeit des zuletzt geholten Items (für unget)
+        # Metriken
+        self.puts = 0
+        self.gets = 0
+        self.blocked = 0
+        self.blocked_s = 0.0
+        self.dropped_items = 0
+        self.dropped_events = 0
+        self.max_depth = 0          # Events
+        self.lag_last = 0.0         # s von put() bis get_nowait()
+        self.lag_max = 0.0
+        self._lag_sum = 0.0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def events(self) -> int:
+        """Events in der Queue."""
+        return self._events
+
+    def _full(self, events: int) -> bool:
+        return bool(self._items) and self._events + events > self.max_events
+
+    # ── producer ──
+    def put(self, item, events: int = 1, timeout: float = None) -> bool:
+        """
+        Hängt item an (events: Anzahl Events darin).
+        Rückgabe: False = 'block' und nach timeout s noch voll (nochmal versuchen).
+        """
+        with self._cond:
+            if self._full(events):
+                if self.policy == OVERFLOW_DROP_NEWEST:
+                    self.dropped_items += 1
+                    self.dropped_events += events
+                    return True
+                if self.policy == OVERFLOW_DROP_OLDEST:
+                    while self._full(events):
+                        _, n, _ = self._items.popleft()
+                        self._events -= n
+                        self.dropped_items += 1
+                        self.dropped_events += n
+                else:
+                    t0 = time.monotonic()
+                    self.blocked += 1
+                    ok = self._cond.wait_for(lambda: not self._full(events), timeout)
+                    self.blocked_s += time.monotonic() - t0
+                    if not ok:
+                        return False
+            woke = not self._items
+            self._items.append((time.monotonic(), events, item))
+            self._events += events
+            self.puts += 1
+            if self._events > self.max_depth:
+                self.max_depth = self._events
+        if woke and self.on_ready is not None:
+            self.on_ready()
+        return True
+
+    # ── consumer ──
+    def get_nowait(self):
+        """Ältestes Item oder None."""
+        with self._cond:
+            if not self._items:
+                return None
+            t, n, item = self._items.popleft()
+            self._events -= n
+            self._cond.notify()
+        self._got_at = t
+        lag = time.monotonic() - t
+        self.gets += 1
+        self.lag_last = lag
+        self._lag_sum += lag
+        if lag > self.lag_max:
+            self.lag_max = lag
+        return item
+
+    def unget(self, item, events: int):
+        """Rest des zuletzt geholten Items wieder vorne einreihen (behält dessen Put-Zeit)."""
+        with self._cond:
+            self._items.appendleft((self._got_at or time.monotonic(), events, item))
+            self._events += events
+
+    def oldest_age(self) -> float:
+        """Alter des ältesten Items in s (0.0 = leer)."""
+        items = self._items
+        try:
+            return time.monotonic() - items[0][0]
+        except IndexError:
+            return 0.0
+
+    def stats(self) -> dict:
+        return {
+            'policy': self.policy,
+            'depth_items': len(self._items),
+            'depth_events': self._events,
+            'max_depth_events': self.max_depth,
+            'puts': self.puts,
+            'gets': self.gets,
+            'blocked': self.blocked,
+            'blocked_s': self.blocked_s,
+            'dropped_items': self.dropped_items,
+            'dropped_events': self.dropped_events,
+            'lag_last_ms': self.lag_last * 1000,
+            'lag_avg_ms': self._lag_sum / self.gets * 1000 if self.gets else 0.0,
+            'lag_max_ms': self.lag_max * 1000,
+            'oldest_ms': self.oldest_age() * 1000,
+        }
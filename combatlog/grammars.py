@@ -0,0 +1,313 @@
+"""
+Per-locale line grammars and the grammar registry.
+
+A grammar turns one stripped log line into an event tuple (or None):
+
+    ('hit',   dmg:int,    target:str,   skill:str, is_pet:bool)
+    ('heal',  amount:int, target:str,   skill:str, rtype:str|None)
+    ('taken', amount:int, attacker:str, skill:str, dtype:str|None)
+
+(German hits keep their historic 4-tuple without is_pet.)
+
+All regexes are compiled once at import. Adding a locale (e.g. French) means
+subclassing `Grammar` and calling `register_grammar(...)`. The other grammars
+do not get slower, because `LineClassifier` only runs the detected locale.
+"""
+
+import re
+
+from .constants import AA_SKILLS
+from .debuglog import PARSE
+
+_NON_DIGITS = re.compile(r"[^\d]")
+
+
+def to_int(num: str) -> int:
+    """'1.234' / '1,234' -> 1234 (ValueError, wenn keine Ziffern)."""
+    return int(_NON_DIGITS.sub("", num))
+
+
+def strip_the(s: str) -> str:
+    s = s.strip()
+    return s[4:].lstrip() if s[:4].lower() == "the " else s
+
+
+def autoattack_name(skill: str) -> str:
+    s_low = skill.lower()
+    if "bow" in s_low or "bogen" in s_low:
+        return "Autoattack (ranged)"
+    return "Autoattack (melee)"
+
+
+class Grammar:
+    """
+    Base class for one client language.
+
+    locale:  short key ('en', 'de', ...)
+    anchors: lowercase tokens, at least one of which occurs in every line the
+             grammar can match. They are used for cheap "does this line belong
+             to another locale?" checks and for byte pre-filtering.
+    memoize: route anchored lines through the template parse cache
+             (`combatlog.cache`)
+    amount_last: the amount is the last number of a line, so the cache key
+             masks that one (digits in names before it stay in the key)
+    """
+
+    locale = None
+    anchors = ()
+    memoize = True
+    amount_last = False
+
+    def classify(self, text: str, low: str, ctx):
+        """
+        text: stripped line, low: text.lower()
+        ctx:  LineClassifier (pet_names, debug)
+        """
+        raise NotImplementedError
+
+    def may_match(self, low: str) -> bool:
+        for a in self.anchors:
+            if a in low:
+                return True
+        return False
+
+
+###############################################################################
+#######                        English client                           #######
+###############################################################################
+
+# "<actor> heal(s|ed) <target> for N (Morale points|points of Power|points)"
+_EN_RES_PART = r"(?:(?P<res1>Morale|Power)\s+points?|points?\s+of\s+(?P<res2>Morale|Power)|points?)"
+_EN_HEAL = re.compile(
+    rf"(?P<actor>.+?)\s+heal(?:s|ed)?\s+(?P<target>.+?)\s+for\s+(?P<amt>[\d,]+)\s+{_EN_RES_PART}(?:\.\s*)?$",
+    re.IGNORECASE,
+)
+
+# "<actor> hits you [with <skill>] for N points [of <dtype>] damage to Morale"
+_EN_TAKEN = re.compile(
+    r"(?P<actor>.+?)\s+hits?\s+you(?:rself)?(?:\s+with\s+(?P<skill>.+?))?\s+for\s+(?P<amt>[\d,]+)\s+points?(?:\s+of\s+(?P<dtype>[A-Za-z]+))?\s+damage\s+to\s+Morale\.?$",
+    re.IGNORECASE,
+)
+
+_SELF_TARGETS_EN = ("yourself", "you")
+
+
+class EnglishGrammar(Grammar):
+    locale = 'en'
+    anchors = (" hit", "heal")
+    # "... for 1,234 points ...": Namen stehen vor dem Betrag
+    amount_last = True
+
+    def classify(self, text, low, ctx):
+        # 1) eigener Schaden
+        if " hit " in text or " hits " in text:
+            evt = self._hit(text, ctx)
+            if evt:
+                return evt
+        # 2) eigene Heals
+        if "heal" in low:
+            evt = self._heal(text, ctx)
+            if evt:
+                return evt
+        # 3) eingehender Schaden
+        if "you" in low and "morale" in low:
+            return self._taken(text)
+        return None
+
+    def _hit(self, text, ctx):
+        hit_kw = " hit " if " hit " in text else " hits "
+        actor, rest = text.split(hit_kw, 1)
+        actor_lc = actor.strip().lower()
+        if actor_lc.startswith("the "):
+            actor_lc = actor_lc[4:].lstrip()
+        is_you = actor_lc.startswith("you")
+        is_pet = actor_lc in ctx.pet_names
+        if PARSE.debug_on and ctx.debug:
+            PARSE.debug("hit actor=%r is_pet=%s", actor_lc, is_pet)
+        if not (is_you or is_pet):
+            return None
+        if rest[:4].lower() == "the ":
+            rest = rest[4:].lstrip()
+        if " for " not in rest or " points" not in rest:
+            return None
+        before_for, after_for = rest.rsplit(" for ", 1)
+        try:
+            dmg = to_int(after_for.split(" points", 1)[0])
+        except ValueError:
+            return None
+        if " with " in before_for:
+            enemy_part, skill_part = before_for.split(" with ", 1)
+            skill = skill_part.strip().rstrip(".")
+            if skill in AA_SKILLS:
+                skill = autoattack_name(skill)
+        else:
+            enemy_part = before_for
+            skill = "DoT damage"
+        enemy = enemy_part.strip().rstrip(".")
+        return ("hit", dmg, enemy, skill, is_pet)
+
+    def _heal(self, text, ctx):
+        m = _EN_HEAL.match(text)
+        if not m:
+            return None
+        actor_lc = strip_the(m.group("actor")).lower()
+        # nur eigene Heals zählen ("You ..." / "Your <skill> ..." / Pets)
+        if not (actor_lc.startswith("you") or actor_lc in ctx.pet_names):
+            return None
+        target = strip_the(m.group("target"))
+        if target.lower() in _SELF_TARGETS_EN:
+            target = "You"
+        try:
+            amt = to_int(m.group("amt"))
+        except ValueError:
+            return None
+        rtype = m.group("res1") or m.group("res2")  # None wenn nur "points"
+        return ("heal", amt, target, "Heal", rtype)
+
+    def _taken(self, text):
+        m = _EN_TAKEN.match(text)
+        if not m:
+            return None
+        try:
+            amt = to_int(m.group("amt"))
+        except ValueError:
+            return None
+        actor = strip_the(m.group("actor"))
+        skill = (m.group("skill") or "Hit").strip()
+        dtype = (m.group("dtype") or "").strip() or None
+        return ("taken", amt, actor, skill, dtype)
+
+
+###############################################################################
+#######                        Deutscher Client                         #######
+###############################################################################
+
+# "Ihr trefft <Ziel> [mit der Fertigkeit '<Skill>'] und (ihre|seine) Moral nimmt N Punkte Schaden (<dtype>)."
+_DE_HIT = re.compile(
+    r"Ihr trefft\s+(?P<target>.+?)"
+    r"(?:\s+mit der Fertigkeit\s+'(?P<skill>[^']+)')?"
+    r"\s+und\s+(?:ihre|seine)\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
+    re.IGNORECASE,
+)
+
+# "Ihr heilt N Punkte des Schadens (Moral), den <Ziel> genommen hat."
+_DE_HEAL = re.compile(
+    r"Ihr heilt\s+(?P<amt>[\d\.]+)\s+Punkte des Schadens\s+\((?P<res>[^)]+)\),\s+den\s+(?P<target>.+?)\s+genommen ha(?:t|bt)\.",
+    re.IGNORECASE,
+)
+
+# "<Mob> trifft Euch mit der Fertigkeit '...' und Eure Moral nimmt N Punkte Schaden (<dtype>)."
+_DE_TAKEN = re.compile(
+    r"(?P<attacker>.+?)\s+trifft\s+Euch\s+mit der Fertigkeit\s+'(?P<skill>[^']+)'\s+und\s+Eur\w*\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
+    re.IGNORECASE,
+)
+
+_DE_DTYPES = (("allgemein", "common"), ("schatten", "shadow"), ("feuer", "fire"))
+_SELF_TARGETS_DE = ("ihr", "euch", "euer", "euch selbst")
+
+
+class GermanGrammar(Grammar):
+    locale = 'de'
+    anchors = ("trefft", "heilt", "trifft")
+
+    def classify(self, text, low, ctx):
+        if "ihr trefft" in low:
+            evt = self._hit(text)
+            if evt:
+                return evt
+        if low.startswith("ihr heilt"):
+            evt = self._heal(text)
+            if evt:
+                return evt
+        if "trifft euch" in low and "moral nimmt" in low:
+            return self._taken(text, ctx)
+        return None
+
+    def _hit(self, text):
+        m = _DE_HIT.search(text)
+        if not m:
+            return None
+        try:
+            dmg = to_int(m.group("amt"))
+        except ValueError:
+            return None
+        enemy = m.group("target").strip()
+        skill = m.group("skill")
+        if skill is None:
+            return ("hit", dmg, enemy, "DoT damage")
+        skill = skill.strip()
+        if skill in AA_SKILLS:
+            skill = autoattack_name(skill)
+        return ("hit", dmg, enemy, skill)
+
+    def _heal(self, text):
+        m = _DE_HEAL.match(text)
+        if not m:
+            return None
+        try:
+            amt = to_int(m.group("amt"))
+        except ValueError:
+            return None
+        res_raw = m.group("res").strip().lower()
+        if "moral" in res_raw:
+            rtype = "Morale"
+        elif "kraft" in res_raw:
+            rtype = "Power"
+        else:
+            rtype = None
+        target = m.group("target").strip()
+        # Selbstheilung auf "You" mappen
+        if target.lower() in _SELF_TARGETS_DE:
+            target = "You"
+        return ("heal", amt, target, "Heal", rtype)
+
+    def _taken(self, text, ctx):
+        m = _DE_TAKEN.search(text)
+        if not m:
+            return None
+        try:
+            amt = to_int(m.group("amt"))
+        except ValueError:
+            return None
+        attacker = m.group("attacker").strip()
+        skill = m.group("skill").strip()
+        dtype_raw = m.group("dtype").strip().lower()
+        dtype = "other"
+        for needle, key in _DE_DTYPES:
+            if needle in dtype_raw:
+                dtype = key
+                break
+        if "schaden" in skill.lower():
+            skill = "Hit"
+        if PARSE.debug_on and ctx.debug:
+            PARSE.debug("taken-de attacker=%s skill=%s amt=%d dtype=%s", attacker, skill, amt, dtype)
+        return ("taken", amt, attacker, skill, dtype)
+
+
+###############################################################################
+#######                           Registry                              #######
+###############################################################################
+
+# locale -> Grammar; Registrierungsreihenfolge = Reihenfolge bei der Erkennung
+GRAMMARS = {}
+
+
+def register_grammar(grammar: Grammar, replace: bool = False) -> Grammar:
+    """Registriert eine Grammatik. Gilt für LineClassifier, die danach erzeugt werden."""
+    if not grammar.locale:
+        raise ValueError("grammar needs a locale key")
+    if grammar.locale in GRAMMARS and not replace:
+        raise ValueError(f"grammar for locale {grammar.locale!r} already registered")
+    GRAMMARS[grammar.locale] = grammar
+    return grammar
+
+
+def get_grammar(locale: str) -> Grammar:
+    try:
+        return GRAMMARS[locale]
+    except KeyError:
+        raise ValueError(f"no grammar registered for locale {locale!r}") from None
+
+
+register_grammar(EnglishGrammar())
+register_grammar(GermanGrammar())
@@ -0,0 +1,442 @@
+"""
+Ingestion supervisor: owns the tail reader thread.
+
+    sup = IngestSupervisor(event_queue.put, entities, checkpoint)
+    sup.start([path, ...])              # stops the old reader, starts a new generation
+    sup.poll()                          # UI timer: reap old readers, restart crashed ones
+    gen, seq, path, batch, offset = event_queue.get_nowait()
+    if sup.accept(gen, seq): ...        # late output of stopped readers is dropped
+    sup.consumed(path, offset)          # after the batch was aggregated: checkpoint
+
+One reader thread follows all logs (one per game client). It reads one block
+per log and round, so a log that is catching up cannot starve the others, and
+it sleeps on a single watcher for all files. Every log has its own
+LineClassifier, because each client can run in a different language.
+
+Every reader has a generation id and numbers its batches. stop() wakes the
+watcher, so an idle reader ends at once. A reader that still does not end
+within JOIN_TIMEOUT (stuck in a read or on a full queue) gets a cutoff. The cutoff is
+the seq of its last delivered batch, and the successor continues at the
+offsets that belong to that same seq (both come from one delivered()
+call). A batch the reader still manages to put into the queue afterwards
+(it was inside a read) is dropped by the consumer. The successor reads
+those bytes again. The cutoff is dropped once the reader has ended and
+its last batch went through accept(). Readers never write supervisor or
+overlay state, so a reader that ends late cannot clear its successor.
+
+Restarting with a different set of logs carries the offsets over: logs that
+stay continue where the old reader stopped, and new logs start at their end.
+A reader that dies with an exception is restarted the same way, so nothing is
+read twice or skipped. The delay starts at RESTART_MIN s and doubles up to
+RESTART_MAX. It resets once a reader has run for RESTART_RESET s.
+
+The TailCheckpoint follows the first (newest) log only, and only what the
+consumer has actually aggregated: consumed() moves it to the end offset of
+a finished item. Batches still waiting in the queue when the app exits or
+crashes are therefore read again on resume, not skipped.
+
+mode 'process' runs the reader in a worker process instead of a thread
+(combatlog.shmring.ProcessTailReader); poll() then also moves its records
+from the shared-memory ring into the sink.
+"""
+
+import os
+import threading
+import time
+
+from .batch import parse_lines
+from .debuglog import TAIL
+from .logfiles import detect_encoding
+from .parser import LineClassifier
+from .prefilter import BytePrefilter
+from .reader import CATCHUP_BYTES, READ_BYTES, BlockReader
+from .watch import make_watcher
+
+WAIT_TIMEOUT = 0.25     # s, max. Schlaf ohne neue Daten (stop() weckt den Watcher sofort)
+JOIN_TIMEOUT = 0.5      # s, so lange wartet stop() auf den Reader
+RESTART_MIN = 0.5       # s, erster Neustart nach einem Fehler
+RESTART_MAX = 30.0      # s, max. Back-off
+RESTART_RESET = 60.0    # s fehlerfrei -> Back-off zurück auf RESTART_MIN
+
+MODE_THREAD = 'thread'      # Reader als Thread im GUI-Prozess
+MODE_PROCESS = 'process'    # Reader im Worker-Prozess (shmring)
+
+
+class TailStream:
+    """One followed log: its classifier, start offset and progress."""
+
+    __slots__ = ('path', 'classifier', 'start_offset', 'offset', 'batches', 'events',
+                 'prefilter', 'reader')
+
+    def __init__(self, path: str, classifier, offset: int = None):
+        self.path = path
+        self.classifier = classifier
+        self.start_offset = offset      # None = ab Dateiende
+        self.offset = offset            # Ende der letzten ausgelieferten Zeile
+        self.batches = 0
+        self.events = 0
+        self.prefilter = None
+        self.reader = None
+
+
+class TailReader:
+    """
+    One tail thread for one or more logs and one generation.
+
+    streams: [TailStream]
+    sink:    callable(item, events, timeout) -> bool, e.g. EventQueue.put;
+             item = (generation, seq, path, EventBatch, block end offset),
+             False = full, try again
+    """
+
+    def __init__(self, streams, generation: int, sink, entities,
+                 block_size: int = READ_BYTES, max_block: int = CATCHUP_BYTES):
+        self.streams = list(streams)
+        self.generation = generation
+        self.sink = sink
+        self.entities = entities
+        self.block_size = block_size
+        self.max_block = max_block
+        self.batches = 0                # = seq des letzten ausgelieferten Batches
+        self.events = 0
+        self.error = None
+        self.started = None
+        self.watcher = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()   # batches + Stream-Offsets nur zusammen ändern
+        self.thread = threading.Thread(target=self._run, name=f"tail-{generation}", daemon=True)
+
+    @property
+    def alive(self) -> bool:
+        return self.thread.is_alive()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def offsets(self) -> dict:
+        """{path: offset} der gelesenen Logs."""
+        return {s.path: s.offset for s in self.streams}
+
+    def delivered(self):
+        """(seq des letzten ausgelieferten Batches, {path: offset} bis genau dahin)."""
+        with self._lock:
+            return self.batches, self.offsets()
+
+    def start(self):
+        self.started = time.monotonic()
+        self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+        # schläft der Reader im Watcher: sofort wecken, damit join() nicht WAIT_TIMEOUT absitzt
+        watcher = self.watcher
+        if watcher is not None:
+            watcher.wake()
+
+    def join(self, timeout: float = None) -> bool:
+        """Rückgabe: True = Thread beendet."""
+        if self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+    def _run(self):
+        try:
+            self._loop()
+        except Exception as e:
+            self.error = e
+            TAIL.error("tail reader %d failed: %r", self.generation, e)
+        finally:
+            for s in self.streams:
+                if s.reader is not None:
+                    s.reader.close()
+            if TAIL.info_on:
+                self._log_stats()
+
+    def _open(self, s: TailStream):
+        # Rohbytes lesen: Zeilen ohne Grammatik-Anker werden nie dekodiert
+        s.prefilter = BytePrefilter(detect_encoding(s.path), classifier=s.classifier)
+        # große Binärblöcke; angefangene letzte Zeile hält der Reader zurück
+        reader = BlockReader(s.path, prefilter=s.prefilter, block_size=self.block_size,
+                             max_block=self.max_block)
+        if s.start_offset is None:
+            reader.seek_end()
+        else:
+            reader.seek(s.start_offset)
+        s.offset = reader.offset
+        # erst nach dem Offset sichtbar machen (der Ring-Worker liest s.reader als "gestartet")
+        s.reader = reader
+
+    def _loop(self):
+        stop = self._stop
+        entities, sink = self.entities, self.sink
+        streams = self.streams
+
+        for s in streams:
+            self._open(s)
+        # schläft bis eine der Dateien wächst (inotify / Polling mit Back-off)
+        watcher = self.watcher = make_watcher([s.path for s in streams])
+        try:
+            while not stop.is_set():
+                busy = False
+                # ein Block je Log und Runde: Aufholen bremst die anderen nicht aus
+                for s in streams:
+                    reader = s.reader
+                    block = reader.read()
+                    if block is None:
+                        if reader.truncated():
+                            # Log wurde gekürzt/neu angelegt -> von vorn
+                            reader.seek(0)
+                            busy = True
+                        continue
+                    busy = True
+                    batch = parse_lines(block, s.classifier, entities, time.time()) if block else None
+                    if batch:
+                        if stop.is_set():
+                            return
+                        item = (self.generation, self.batches + 1, s.path, batch, reader.offset)
+                        # volle Queue: warten (Log auf der Platte puffert), aber Stop beachten
+                        while not sink(item, len(batch), WAIT_TIMEOUT):
+                            if stop.is_set():
+                                return
+                        self.events += len(batch)
+                        s.batches += 1
+                        s.events += len(batch)
+                    # seq und Offset gemeinsam: _halt() liest beide in einem Zug
+                    with self._lock:
+                        if batch:
+                            self.batches += 1
+                        s.offset = reader.offset
+                if busy:
+                    continue
+                watcher.wait(WAIT_TIMEOUT, {s.path: s.reader.tell() for s in streams})
+        finally:
+            watcher.close()
+
+    def _log_stats(self):
+        TAIL.info("tail reader %d ended: %d logs, %d batches, %d events",
+                  self.generation, len(self.streams), self.batches, self.events)
+        for s in self.streams:
+            if s.prefilter is None:
+                continue
+            st = s.prefilter.stats()
+            TAIL.info("%s: offset %s, prefilter %d of %d lines rejected (%.1f%%), filter %.3fs, saved ~%.3fs",
+                      os.path.basename(s.path), s.offset, st['rejected'], st['seen'],
+                      st['reject_ratio'] * 100, st['filter_s'], st['saved_s'])
+        if self.watcher is not None:
+            ws = self.watcher.stats()
+            TAIL.info("watcher %s: %d wakeups, latency avg %.1f ms, max %.1f ms",
+                      ws['backend'], ws['wakeups'], ws['latency_avg_ms'], ws['latency_max_ms'])
+
+
+class IngestSupervisor:
+    """
+    Starts, stops and restarts the TailReader; at most one live reader feeds the sink.
+
+    mode: MODE_THREAD (parse in a thread of this process) or MODE_PROCESS
+          (parse in a worker process, events via shared memory)
+
+    Not thread-safe: start / stop / poll / accept are called from one thread
+    (the UI timer).
+    """
+
+    def __init__(self, sink, entities, checkpoint=None, mode: str = MODE_THREAD):
+        self.sink = sink
+        self.mode = mode
+        self.entities = entities
+        self.checkpoint = checkpoint
+        self.reader = None
+        self.paths = []             # zuletzt gestartete Logs (bleiben nach stop() stehen)
+        self.classifiers = {}       # path -> LineClassifier (Sprache je Client)
+        self.generation = 0
+        self.restarts = 0
+        self.errors = 0
+        self.stale_dropped = 0
+        self.accepted = 0
+        self._offsets = {}          # path -> Offset des letzten gestoppten Readers
+        self._cutoff = {}           # generation -> [letzte gültige seq, letzte seq | None, zuletzt gesehene seq]
+        self._retired = []          # gestoppte, aber noch laufende Reader
+        self._backoff = RESTART_MIN
+        self._restart_at = None     # Neustart nach Absturz fällig um
+
+    # ── lifecycle ──
+    @property
+    def path(self):
+        """Das erste (neueste) Log oder None."""
+        return self.paths[0] if self.paths else None
+
+    @property
+    def running(self) -> bool:
+        return self.reader is not None and self.reader.alive
+
+    @property
+    def active(self) -> bool:
+        """Reader läuft oder Neustart ist geplant."""
+        return self.running or self._restart_at is not None
+
+    def follows(self, paths) -> bool:
+        """True, wenn genau diese Logs verfolgt werden (Reihenfolge egal)."""
+        norm = os.path.normcase
+        return {norm(p) for p in paths} == {norm(p) for p in self.paths}
+
+    def classifier(self, path: str):
+        """LineClassifier des Logs (neu für ein neues Log)."""
+        cls = self.classifiers.get(path)
+        if cls is None:
+            cls = self.classifiers[path] = LineClassifier()
+        return cls
+
+    def clear_caches(self):
+        """Parse-Caches aller Logs leeren (z.B. geänderte Pet-Namen)."""
+        for cls in self.classifiers.values():
+            cls.clear_cache()
+        if self.mode == MODE_PROCESS and self.active:
+            # Worker hat eigene Classifier + Pet-Liste: neu starten, Offsets bleiben
+            self.start(self.paths)
+
+    def set_mode(self, mode: str):
+        """Thread / Prozess umschalten; ein laufender Reader wird am selben Offset ersetzt."""
+        if mode == self.mode:
+            return
+        self.mode = mode
+        if self.active:
+            self.start(self.paths)
+
+    def start(self, paths, resume: bool = False):
+        """
+        Stoppt den alten Reader und folgt paths (str oder Liste, neuestes Log zuerst).
+        Logs des alten Readers lesen weiter, wo er aufgehört hat; neue ab Dateiende,
+        resume: das erste ab Checkpoint.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        carried = self._halt(JOIN_TIMEOUT)
+        offsets = {p: carried.get(p) for p in paths}
+        if resume and self.checkpoint is not None and offsets[paths[0]] is None:
+            offset = self.checkpoint.resume_offset(paths[0])
+            if offset is not None:
+                TAIL.info("resuming %s at %d", paths[0], offset)
+                offsets[paths[0]] = offset
+        self.paths = list(paths)
+        self.classifiers = {p: self.classifier(p) for p in paths}
+        self._backoff = RESTART_MIN
+        self._spawn(offsets)
+
+    def _spawn(self, offsets: dict):
+        self.generation += 1
+        streams = [TailStream(p, self.classifiers[p], offsets.get(p)) for p in self.paths]
+        if self.mode == MODE_PROCESS:
+            from .shmring import ProcessTailReader
+            cls = ProcessTailReader
+        else:
+            cls = TailReader
+        if self.checkpoint is not None:
+            self.checkpoint.active = True
+        reader = cls(streams, self.generation, self.sink, self.entities)
+        reader.start()
+        self.reader = reader
+
+    def stop(self, timeout: float = JOIN_TIMEOUT):
+        """Stoppt den Reader und wartet (max. timeout) auf sein Ende; nächster start() ab Dateiende."""
+        self._halt(timeout)
+
+    def _halt(self, timeout: float) -> dict:
+        """Reader stoppen. Rückgabe: {path: offset} zum Weiterlesen."""
+        offsets, self._offsets = self._offsets, {}
+        self._restart_at = None
+        reader, self.reader = self.reader, None
+        if reader is None:
+            return offsets
+        reader.stop()
+        if reader.join(timeout):
+            # beendet: alles Ausgelieferte ist gültig, kein Cutoff nötig
+            return reader.offsets()
+        TAIL.warning("tail reader %d did not stop within %.1fs", reader.generation, timeout)
+        self._retired.append(reader)
+        # seq und Offsets aus einem Zug: was jetzt noch ankommt, liest der Nachfolger erneut
+        seq, offsets = reader.delivered()
+        self._cutoff[reader.generation] = [seq, None, 0]
+        return offsets
+
+    def poll(self):
+        """Aus dem UI-Timer: alte Reader aufräumen, abgestürzte mit Back-off neu starten."""
+        if self._retired:
+            for r in self._retired:
+                if not r.alive:
+                    r.join(0)           # Prozess-Reader: Ring-Rest übernehmen und freigeben
+                    self._retire_cutoff(r.generation, r.batches)
+            self._retired = [r for r in self._retired if r.alive]
+
+        reader = self.reader
+        now = time.monotonic()
+        if reader is not None:
+            if self.mode == MODE_PROCESS:
+                reader.pump()
+            if reader.alive:
+                if self._backoff > RESTART_MIN and now - reader.started >= RESTART_RESET:
+                    self._backoff = RESTART_MIN
+                return
+            # Reader ist von selbst gestorben: an den letzten Offsets neu aufsetzen
+            reader.join(0)
+            self.errors += 1
+            self.reader = None
+            self._offsets = reader.offsets()
+            self._restart_at = now + self._backoff
+            TAIL.warning("tail reader %d died (%r), restart in %.1fs",
+                         reader.generation, reader.error, self._backoff)
+            self._backoff = min(self._backoff * 2, RESTART_MAX)
+            return
+
+        if self._restart_at is not None and now >= self._restart_at:
+            self._restart_at = None
+            self.restarts += 1
+            offsets, self._offsets = self._offsets, {}
+            self._spawn(offsets)
+
+    def _retire_cutoff(self, generation: int, final: int):
+        """Reader ist beendet, final = seq seines letzten Batches."""
+        cut = self._cutoff.get(generation)
+        if cut is None:
+            return
+        if final <= cut[0] or cut[2] >= final:
+            # kein Batch nach dem Cutoff, oder der letzte ist schon durch accept()
+            del self._cutoff[generation]
+        else:
+            cut[1] = final
+
+    # ── consumer side ──
+    def consumed(self, path: str, offset: int):
+        """Item bis offset ist eingebaut: Checkpoint des ersten Logs nachziehen (ohne I/O)."""
+        if self.checkpoint is not None and path == self.path:
+            self.checkpoint.update(path, offset)
+
+    def accept(self, generation: int, seq: int) -> bool:
+        """False = Batch eines gestoppten Readers nach seinem Stop (verwerfen)."""
+        cut = self._cutoff.get(generation)
+        if cut is not None:
+            cut[2] = max(cut[2], seq)
+            if cut[1] is not None and seq >= cut[1]:
+                # letzter Batch des beendeten Readers: Cutoff wird nicht mehr gebraucht
+                del self._cutoff[generation]
+            if seq > cut[0]:
+                self.stale_dropped += 1
+                return False
+        self.accepted += 1
+        return True
+
+    def health(self) -> dict:
+        reader = self.reader
+        return {
+            'generation': self.generation,
+            'running': self.running,
+            'paths': list(self.paths),
+            'offsets': reader.offsets() if reader is not None else dict(self._offsets),
+            'batches': reader.batches if reader is not None else 0,
+            'events': reader.events if reader is not None else 0,
+            'accepted': self.accepted,
+            'stale_dropped': self.stale_dropped,
+            'errors': self.errors,
+            'restarts': self.restarts,
+            'backoff_s': self._backoff,
+            'retired': len(self._retired),
+        }
@@ -0,0 +1,186 @@
+"""
+Locating combat log files and detecting their encoding.
+"""
+
+import fnmatch
+import os
+import re
+import time
+
+from .constants import LOG_FILE_PATTERNS
+from .debuglog import TAIL
+
+
+def clean_dir(p: str) -> str:
+    # remove quotes + white space, expand variables, normalize
+    p = (p or "").strip().strip('"').strip("'")
+    p = os.path.expandvars(os.path.expanduser(p))
+    return os.path.normpath(p)
+
+
+INDEX_RESCAN = 30.0     # s, Ordner spätestens dann neu listen, auch ohne mtime-Änderung
+ACTIVE_LOG_AGE = 300.0  # s, so lange gilt ein Log nach dem letzten Schreiben als aktiv
+MAX_ACTIVE_LOGS = 4     # max. gleichzeitig verfolgte Logs (ein Client je Log)
+
+
+class LogDirIndex:
+    """
+    Cached list of the combat logs in one folder, with their mtimes.
+
+    refresh() costs one stat() of the folder as long as no file was created,
+    renamed or deleted there (the folder mtime stays the same). Only then the
+    folder is listed again with os.scandir(), and only new names are stat()ed.
+    latest() is O(1).
+    """
+
+    def __init__(self, folder: str, patterns=LOG_FILE_PATTERNS, rescan: float = INDEX_RESCAN):
+        self.folder = clean_dir(folder)
+        # Windows: Groß-/Kleinschreibung egal, wie bei glob
+        self._match = re.compile("|".join(
+            fnmatch.translate(os.path.normcase(p)) for p in patterns)).match
+        self.rescan = rescan
+        self.scans = 0
+        self._files = {}            # name -> mtime_ns
+        self._latest = None         # Name der neuesten Datei
+        self._dir_mtime = None
+        self._last_scan = 0.0
+
+    def refresh(self, force: bool = False) -> bool:
+        """Index aktualisieren. Rückgabe: True = neueste Datei hat sich geändert."""
+        try:
+            dir_mtime = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            dir_mtime = None
+        now = time.monotonic()
+        if (not force and dir_mtime == self._dir_mtime
+                and now - self._last_scan < self.rescan):
+            return False
+        self._dir_mtime = dir_mtime
+        self._last_scan = now
+        before = self._latest
+        if dir_mtime is None:
+            self._files = {}
+        else:
+            self._scan()
+        self._latest = max(self._files, key=self._files.get) if self._files else None
+        return self._latest != before
+
+    def _scan(self):
+        self.scans += 1
+        old = self._files
+        files = {}
+        match = self._match
+        normcase = os.path.normcase
+        try:
+            with os.scandir(self.folder) as it:
+                for entry in it:
+                    name = entry.name
+                    if not match(normcase(name)):
+                        continue
+                    mtime = old.get(name)
+                    # neue Namen + die bisher neueste Datei (wird noch beschrieben)
+                    if mtime is None or name == self._latest:
+                        try:
+                            if not entry.is_file():
+                                continue
+                            mtime = entry.stat().st_mtime_ns
+                        except OSError:
+                            continue
+                    files[name] = mtime
+        except OSError as e:
+            TAIL.info("scandir failed for %r: %r", self.folder, e)
+        self._files = files
+        TAIL.debug("log index %r: %d files, scan #%d", self.folder, len(files), self.scans)
+
+    def latest(self):
+        """Pfad der neuesten Combat-Log-Datei oder None (ohne refresh)."""
+        return os.path.join(self.folder, self._latest) if self._latest else None
+
+    def active(self, max_age: float = ACTIVE_LOG_AGE, limit: int = MAX_ACTIVE_LOGS) -> list:
+        """
+        Logs, die in den letzten max_age s geschrieben wurden, neueste zuerst (ohne refresh).
+        Jeder Client legt beim Login ein neues Log an: nur die 2*limit neuesten
+        Dateien kommen in Frage, und nur diese werden neu stat()ed.
+        """
+        files = self._files
+        newest = sorted(files, key=lambda n: (files[n], n), reverse=True)[:2 * limit]
+        now = time.time_ns()
+        out = []
+        for name in newest:
+            path = os.path.join(self.folder, name)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            files[name] = mtime
+            if now - mtime <= max_age * 1e9:
+                out.append((mtime, path))
+        out.sort(reverse=True)
+        return [p for _, p in out[:limit]]
+
+    def paths(self) -> list:
+        """Alle Combat-Logs des Ordners, älteste zuerst (ohne refresh)."""
+        files = self._files
+        return [os.path.join(self.folder, n) for n in sorted(files, key=lambda n: (files[n], n))]
+
+    def __len__(self):
+        return len(self._files)
+
+
+_indexes = {}   # bereinigter Ordner -> LogDirIndex
+
+
+def get_latest_combat_log(folder: str = None):
+    """
+    Suche die aktuellste Combat-Log-Datei in `folder`.
+    Wenn `folder` None ist, wird config.CMBT_LOG_DIR verwendet.
+    Rückgabe: Pfad oder None (Ordner ungültig / noch kein Log).
+
+    Nutzt einen LogDirIndex pro Ordner: solange dort keine Datei entsteht
+    oder verschwindet, kostet ein Aufruf nur ein stat().
+    """
+    if folder is None:
+        # erst beim Aufruf: config importiert combatlog, und die Settings ändern den Wert zur Laufzeit
+        import config
+        folder = config.CMBT_LOG_DIR
+    base = clean_dir(folder)
+
+    TAIL.debug("get_latest_combat_log: raw=%r, cleaned=%r", folder, base)
+
+    if not base or not os.path.isdir(base):
+        TAIL.info("invalid log dir: %r -> %r", folder, base)
+        return None
+
+    index = _indexes.get(base)
+    if index is None:
+        index = _indexes[base] = LogDirIndex(base)
+    index.refresh()
+    return index.latest()
+
+
+def get_active_combat_logs(folder: str, max_age: float = ACTIVE_LOG_AGE,
+                           limit: int = MAX_ACTIVE_LOGS) -> list:
+    """
+    Alle gerade beschriebenen Combat-Logs in `folder` (mehrere Clients), neueste zuerst.
+    Rückgabe: Liste, mindestens das neueste Log (wenn es eins gibt).
+    """
+    latest = get_latest_combat_log(folder)
+    if not latest:
+        return []
+    paths = _indexes[clean_dir(folder)].active(max_age, limit)
+    if latest not in paths:
+        paths = [latest] + paths[:limit - 1]
+    return paths
+
+
+# ── Helper to avoid decoding issues ──
+BOM_BYTES = {'utf-8-sig': 3, 'utf-16-le': 2, 'utf-16-be': 2}   # Länge des BOM je Encoding
+
+
+def detect_encoding(path: str) -> str:
+    with open(path, 'rb') as fb:
+        head = fb.read(4)
+    if head.startswith(b'\xff\xfe'): return 'utf-16-le'
+    if head.startswith(b'\xfe\xff'): return 'utf-16-be'
+    if head.startswith(b'\xef\xbb\xbf'): return 'utf-8-sig'
+    return 'utf-8'
@@ -0,0 +1,174 @@
+"""
+Line classifier with client-language auto-detection.
+
+Until the language is known, every registered grammar is tried. The first
+`DETECT_MIN_MATCHES` events of one locale lock it in; from then on only that
+grammar runs. A line the locked grammar does not match is checked against the
+other locales' anchor tokens only. If another grammar keeps matching for
+`MISMATCH_STREAK` events in a row (client language switched, new log), the
+classifier switches to it.
+
+Once a grammar is in use, matched lines of grammars with `memoize` set are
+cached by their number-masked template (`combatlog.cache`), so repeated
+sentence shapes skip the regexes.
+
+Event tuples: see `combatlog.grammars`.
+"""
+
+from .cache import DEFAULT_CACHE_SIZE, ParseCache, split_template
+from .constants import PET_NAMES
+from .debuglog import PARSE
+from .grammars import GRAMMARS, get_grammar
+
+LOCALE_ANY = 'any'        # never lock, try all grammars (mixed logs)
+DETECT_MIN_MATCHES = 3    # events needed to lock a locale
+MISMATCH_STREAK = 20      # consecutive other-locale events needed to switch
+
+
+class LineClassifier:
+    """
+    Classifies raw log lines with the grammar of the detected client language.
+
+    locale: None = auto-detect (default), 'en' / 'de' / ... = fixed,
+            LOCALE_ANY = try every registered grammar on every line
+    cache_size: max. templates in the parse cache, 0 = no cache
+    debug:  False = never log from this classifier (benchmarks); otherwise
+            the 'parse' log category decides (`combatlog.debuglog`)
+    """
+
+    def __init__(self, pet_names=None, debug=None, locale=None, cache_size=DEFAULT_CACHE_SIZE):
+        # live list: settings / pet dialog update PET_NAMES in place
+        self.pet_names = PET_NAMES if pet_names is None else pet_names
+        self.debug = True if debug is None else debug
+
+        self._grammars = tuple(GRAMMARS.values())   # snapshot of the registry
+        self._fixed = locale is not None
+        self._any = locale == LOCALE_ANY
+        self._grammar = get_grammar(locale) if self._fixed and not self._any else None
+        self._detect_counts = {}
+        self._streak_grammar = None
+        self._streak = 0
+        self._cache = ParseCache(cache_size) if cache_size else None
+
+    @property
+    def locale(self):
+        """Aktive Locale ('en', 'de', ...) oder None, solange noch erkannt wird."""
+        return self._grammar.locale if self._grammar else None
+
+    def reset_locale(self):
+        """Locale-Erkennung neu starten (z.B. bei einem neuen Log)."""
+        if not self._fixed:
+            self._grammar = None
+        self._detect_counts.clear()
+        self._streak_grammar = None
+        self._streak = 0
+        self.clear_cache()
+
+    def clear_cache(self):
+        """Parse-Cache leeren (z.B. nach Änderung der Pet-Namen)."""
+        if self._cache is not None:
+            self._cache.clear()
+
+    def cache_stats(self):
+        """Hit/Miss-Zähler des Parse-Caches (None ohne Cache)."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def classify(self, line: str):
+        text = line.strip()
+        if not text:
+            return None
+        low = text.lower()
+
+        g = self._grammar
+        if g is not None:
+            cache = self._cache if g.memoize and g.may_match(low) else None
+            if cache is not None:
+                key, tok = split_template(text, g.amount_last)
+                evt = cache.lookup(key, tok)
+                if evt is not None:
+                    self._streak = 0
+                    return evt
+            evt = g.classify(text, low, self)
+            if evt is not None:
+                self._streak = 0
+                if cache is not None:
+                    cache.store(key, tok, evt)
+                return evt
+            if self._fixed:
+                return None
+            return self._classify_other(text, low, g)
+        if self._any:
+            return self._classify_any(text, low)
+        return self._detect(text, low)
+
+    # --- unlocked: try every grammar, lock after DETECT_MIN_MATCHES ---
+    def _detect(self, text, low):
+        for g in self._grammars:
+            evt = g.classify(text, low, self)
+            if evt is not None:
+                n = self._detect_counts.get(g, 0) + 1
+                self._detect_counts[g] = n
+                if n >= DETECT_MIN_MATCHES:
+                    self._lock(g)
+                return evt
+        return None
+
+    def _classify_any(self, text, low):
+        cache = self._cache
+        if cache is not None:
+            for g in self._grammars:
+                if g.memoize and g.may_match(low):
+                    break
+            else:
+                cache = None
+        if cache is not None:
+            # Maske des ersten passenden Grammars; store() prüft den Betrag ohnehin
+            key, tok = split_template(text, g.amount_last)
+            evt = cache.lookup(key, tok)
+            if evt is not None:
+                return evt
+        for g in self._grammars:
+            evt = g.classify(text, low, self)
+            if evt is not None:
+                if cache is not None:
+                    cache.store(key, tok, evt)
+                return evt
+        return None
+
+    # --- locked: only anchor checks for the other locales ---
+    def _classify_other(self, text, low, current):
+        for g in self._grammars:
+            if g is current or not g.may_match(low):
+                continue
+            evt = g.classify(text, low, self)
+            if evt is None:
+                continue
+            if g is self._streak_grammar:
+                self._streak += 1
+            else:
+                self._streak_grammar = g
+                self._streak = 1
+            if self._streak >= MISMATCH_STREAK:
+                self._lock(g)
+            return evt
+        return None
+
+    def _lock(self, g):
+        if self.debug and g is not self._grammar:
+            PARSE.info("locale locked: %s", g.locale)
+        if g is not self._grammar:
+            # Cache-Treffer würden die Streak-Zählung der alten Locale umgehen
+            self.clear_cache()
+        self._grammar = g
+        self._detect_counts.clear()
+        self._streak_grammar = None
+        self._streak = 0
+
+
+# shared default instance
+_DEFAULT = LineClassifier()
+
+
+def parse_line(line: str):
+    """Classify one raw log line with the shared default classifier."""
+    return _DEFAULT.classify(line)
@@ -0,0 +1,236 @@
+"""
+Byte-level pre-filter: drop lines that cannot be combat events before they are
+split, decoded and parsed.
+
+Every grammar lists anchor tokens, and each line it can match contains at
+least one of them (" hit", "heal", "trefft", "heilt", "trifft"). The anchors
+are encoded once in the log's encoding (UTF-8 or UTF-16 LE/BE). A read block
+is ASCII-lowercased in one `bytes.lower()` call and scanned with `bytes.find`
+per anchor. Only the lines around a hit are cut out and decoded. Chat, loot
+and system lines never become Python objects.
+
+In UTF-16 `bytes.lower()` may also change the other byte of a non-ASCII
+character. That and unaligned matches can only produce false positives, which
+the parser rejects, never false negatives.
+
+The filter measures itself. Every SAMPLE_BLOCKS-th block is also split the
+normal way, and a sample of its rejected lines is decoded and classified, to
+estimate the time saved. If the filter costs more than it saves (mostly
+combat lines, which it has to cut out one by one), it steps aside for
+BYPASS_LINES lines and then measures again.
+"""
+
+import time
+
+from .grammars import GRAMMARS
+
+SAMPLE_BLOCKS = 16      # jeder n-te Block liefert Stichproben verworfener Zeilen
+SAMPLE_LINES = 64       # max. Stichproben pro Block
+EVAL_LINES = 20000      # Bilanz (gespart - Filterkosten) nach so vielen Zeilen
+BYPASS_LINES = 200000   # so lange ungefiltert, wenn die Bilanz negativ war
+PROBE_LINES = 20000     # Katalog-Import: danach entscheiden, ob der Filter bleibt
+PREFILTER_MIN_REJECT = 0.5  # Filter lohnt erst, wenn er so viele Zeilen verwirft
+
+_CODECS = {
+    'utf-8': 'utf-8',
+    'utf-8-sig': 'utf-8',
+    'utf-16-le': 'utf-16-le',
+    'utf-16-be': 'utf-16-be',
+}
+
+
+def line_codec(encoding: str) -> str:
+    """Codec für einzelne Zeilen (ohne BOM-Behandlung)."""
+    return _CODECS.get(encoding.lower(), encoding)
+
+
+def newline_bytes(encoding: str) -> bytes:
+    return "\n".encode(line_codec(encoding))
+
+
+def _complete_end(buf: bytes, nl: bytes) -> int:
+    """Ende der letzten vollständigen Zeile in buf (0 = keine)."""
+    end = buf.rfind(nl)
+    if len(nl) == 2:
+        # UTF-16: nur Zeilenenden an geraden Offsets
+        while end != -1 and end % 2:
+            end = buf.rfind(nl, 0, end + 1)
+    return end + len(nl) if end != -1 else 0
+
+
+def split_raw_lines(buf: bytes, encoding: str):
+    """
+    Zerlegt Rohdaten in vollständige Zeilen (inkl. Zeilenende).
+    Rückgabe: (lines, rest) – rest = angefangene Zeile, wird zurückgehalten.
+    """
+    nl = newline_bytes(encoding)
+    end = _complete_end(buf, nl)
+    if not end:
+        return [], buf
+    if len(nl) == 1:
+        return buf[:end].splitlines(keepends=True), buf[end:]
+
+    parts = buf[:end].split(nl)
+    parts.pop()                         # leer: buf[:end] endet auf nl
+    if not any(len(p) % 2 for p in parts):
+        return [p + nl for p in parts], buf[end:]
+
+    # 0x0A/0x00 mitten in einem Zeichen (selten): nur gerade Offsets zählen
+    lines = []
+    start = 0
+    pos = buf.find(nl, 0, end)
+    while pos != -1:
+        if pos % 2 == 0:
+            lines.append(buf[start:pos + 2])
+            start = pos + 2
+        pos = buf.find(nl, pos + 1, end)
+    return lines, buf[end:]
+
+
+class BytePrefilter:
+    """
+    Turns raw blocks into decoded lines that contain a grammar anchor.
+
+    classifier: optional LineClassifier, used to time sampled rejected lines
+                (estimate of the time saved)
+    """
+
+    def __init__(self, encoding: str, anchors=None, classifier=None):
+        self.encoding = encoding
+        self.codec = line_codec(encoding)
+        self.newline = newline_bytes(encoding)
+        if anchors is None:
+            anchors = {a for g in GRAMMARS.values() for a in g.anchors}
+        # bytes.lower() kennt nur ASCII
+        if anchors and all(a.isascii() for a in anchors):
+            self._needles = tuple(sorted(a.lower().encode(self.codec) for a in anchors))
+        else:
+            self._needles = None
+        self.classifier = classifier
+
+        self.seen = 0
+        self.rejected = 0
+        self.bypassed = 0            # Zeilen ohne Filter (Bilanz negativ)
+        self.filter_time = 0.0       # Zeit im Filter selbst (ohne decode der Treffer)
+        self._sample_time = 0.0      # decode+parse der Stichproben
+        self._sampled = 0
+        self._split_time = 0.0       # split_raw_lines() der Stichproben-Blöcke
+        self._split_lines = 0
+        self._blocks = 0
+        self._bypass_left = 0
+        self._window = (0, 0, 0.0)   # (seen, rejected, filter_time) bei Fensterbeginn
+
+    @property
+    def active(self) -> bool:
+        return self._needles is not None and not self._bypass_left
+
+    def feed(self, buf: bytes):
+        """
+        Rohdaten -> (dekodierte Zeilen mit Anker, rest).
+        rest = angefangene letzte Zeile, beim nächsten Aufruf vorne anhängen.
+        """
+        codec = self.codec
+        nl = self.newline
+        end = _complete_end(buf, nl)
+        if not end:
+            return [], buf
+        if not self.active:
+            # ganzer Block in einem decode(), dann split
+            lines = buf[:end].decode(codec, errors='ignore').split('\n')
+            lines.pop()
+            n = len(lines)
+            self.seen += n
+            if self._bypass_left:
+                self.bypassed += n
+                self._bypass_left = max(0, self._bypass_left - n)
+            return lines, buf[end:]
+
+        t0 = time.perf_counter()
+        region = buf[:end]
+        keep = self._scan(region, nl)
+        n = region.count(nl)
+        self.filter_time += time.perf_counter() - t0
+        self.seen += n
+        self.rejected += n - len(keep)
+
+        self._blocks += 1
+        if self._blocks % SAMPLE_BLOCKS == 0 and len(keep) < n:
+            self._measure(region, set(keep))
+        if self.seen - self._window[0] >= EVAL_LINES:
+            self._evaluate()
+        return [raw.decode(codec, errors='ignore') for raw in keep], buf[end:]
+
+    def _scan(self, region: bytes, nl: bytes):
+        """Zeilen von region, die einen Anker enthalten (in Dateireihenfolge)."""
+        low = region.lower()
+        find = low.find
+        rfind = low.rfind
+        wide = len(nl) == 2
+        bounds = {}
+        for needle in self._needles:
+            p = find(needle)
+            while p != -1:
+                s = rfind(nl, 0, p)
+                while wide and s != -1 and s % 2:
+                    s = rfind(nl, 0, s + 1)
+                s = s + len(nl) if s != -1 else 0
+                e = find(nl, p)
+                while wide and e % 2:
+                    e = find(nl, e + 1)
+                e += len(nl)
+                bounds[s] = e
+                p = find(needle, e)
+        return [region[s:bounds[s]] for s in sorted(bounds)]
+
+    def _measure(self, region, keep):
+        t0 = time.perf_counter()
+        lines, _ = split_raw_lines(region, self.encoding)
+        self._split_time += time.perf_counter() - t0
+        self._split_lines += len(lines)
+        samples = [raw for raw in lines if raw not in keep][:SAMPLE_LINES]
+        classify = self.classifier.classify if self.classifier is not None else None
+        codec = self.codec
+        t0 = time.perf_counter()
+        for raw in samples:
+            line = raw.decode(codec, errors='ignore')
+            if classify is not None:
+                classify(line)
+        self._sample_time += time.perf_counter() - t0
+        self._sampled += len(samples)
+
+    def _saved(self, lines, rejected, filter_time) -> float:
+        """Geschätzte Ersparnis: kein Split aller Zeilen, kein decode+parse der verworfenen."""
+        split = self._split_time / self._split_lines if self._split_lines else 0.0
+        parse = self._sample_time / self._sampled if self._sampled else 0.0
+        return lines * split + rejected * parse - filter_time
+
+    def _evaluate(self):
+        seen0, rejected0, ftime0 = self._window
+        net = self._saved(self.seen - seen0, self.rejected - rejected0, self.filter_time - ftime0)
+        if self._sampled and net < 0:
+            self._bypass_left = BYPASS_LINES
+        self._window = (self.seen + self._bypass_left, self.rejected, self.filter_time)
+
+    def stats(self) -> dict:
+        """seen / rejected / reject_ratio / bypassed / filter_s / saved_s (geschätzt, netto)."""
+        filtered = self.seen - self.bypassed
+        return {
+            'seen': self.seen,
+            'rejected': self.rejected,
+            'reject_ratio': self.rejected / filtered if filtered else 0.0,
+            'bypassed': self.bypassed,
+            'filter_s': self.filter_time,
+            'saved_s': self._saved(self.seen - self.bypassed, self.rejected, self.filter_time),
+        }
+
+
+def settle_prefilter(prefilter: BytePrefilter) -> BytePrefilter:
+    """
+    Einmalige Probe für das Lesen ganzer Dateien (Backfill): nach
+    PROBE_LINES Zeilen mit zu wenig verworfenen (fast nur Kampfzeilen) ist
+    ganze Blöcke dekodieren billiger. Rückgabe: prefilter oder ein Filter ohne Anker.
+    """
+    if (prefilter.active and prefilter.seen >= PROBE_LINES
+            and prefilter.rejected < prefilter.seen * PREFILTER_MIN_REJECT):
+        return BytePrefilter(prefilter.encoding, anchors=())
+    return prefilter
@@ -0,0 +1,100 @@
+"""
+Rolling-window live rates (DPS / HPS / DTPS) in a fixed-size ring of bins.
+
+Every event adds its value to the 1-second bin of its fight time. The ring
+keeps the last RATE_HISTORY bins, and a running sum is kept for each window
+in RATE_WINDOWS. When time moves on, the bin that falls out of a window is
+subtracted. A rate is therefore O(1), and moving the clock forward costs at
+most RATE_HISTORY steps, however long the fight already is. The highest sum
+each window has reached is the burst peak. The ring itself is the source of
+the sparkline.
+
+    rr = RollingRate()
+    rr.add(rel_t, 1234)
+    rr.advance(now)                     # Uhr vorstellen (Bins ohne Events = 0)
+    rr.rate(5), rr.rate(60)             # pro Sekunde über die letzten 5 / 60 s
+    rr.peak(5)                          # bester 5-s-Schnitt des Kampfes
+    rr.sparkline(60)                    # Summe je Bin, älteste zuerst
+"""
+
+from array import array
+
+RATE_BIN = 1.0                  # Sekunden pro Bin
+RATE_WINDOWS = (5, 15, 60)      # Fenster in Bins
+RATE_HISTORY = 120              # Bins im Ring (>= größtes Fenster, Länge der Sparkline)
+
+
+class RollingRate:
+    """Ring of RATE_HISTORY bins plus one running sum and peak per window."""
+
+    __slots__ = ('bins', 'size', 'head', 'windows', 'sums', 'peaks')
+
+    def __init__(self, windows=RATE_WINDOWS, size: int = RATE_HISTORY):
+        if max(windows) > size:
+            raise ValueError("window larger than the ring")
+        self.bins = array('d', bytes(8 * size))
+        self.size = size
+        self.head = -1                  # Bin-Nummer des neuesten Bins (-1 = leer)
+        self.windows = tuple(windows)
+        self.sums = [0.0] * len(self.windows)
+        self.peaks = [0.0] * len(self.windows)
+
+    def add(self, rel_t: float, value):
+        """Wert zur Zeit rel_t (s seit Kampfbeginn); zu alte Werte (außerhalb des Rings) entfallen."""
+        k = int(rel_t // RATE_BIN)
+        head = self.head
+        if k > head:
+            self._advance_to(k)
+            head = k
+        elif k <= head - self.size:
+            return
+        self.bins[k % self.size] += value
+        sums, peaks = self.sums, self.peaks
+        for i, w in enumerate(self.windows):
+            if k > head - w:
+                s = sums[i] = sums[i] + value
+                if s > peaks[i]:
+                    peaks[i] = s
+
+    def advance(self, now: float):
+        """Uhr auf now vorstellen, auch ohne Events (die Rate fällt ab)."""
+        k = int(now // RATE_BIN)
+        if k > self.head:
+            self._advance_to(k)
+
+    def _advance_to(self, k: int):
+        bins, size = self.bins, self.size
+        if k - self.head >= size:
+            # Lücke länger als der Ring: alles ist herausgefallen
+            for i in range(size):
+                bins[i] = 0.0
+            self.sums = [0.0] * len(self.windows)
+            self.head = k
+            return
+        sums = self.sums
+        for j in range(self.head + 1, k + 1):
+            for i, w in enumerate(self.windows):
+                sums[i] -= bins[(j - w) % size] if j - w >= 0 else 0.0
+            bins[j % size] = 0.0
+        self.head = k
+
+    def _index(self, window: int) -> int:
+        try:
+            return self.windows.index(window)
+        except ValueError:
+            raise ValueError(f"no running sum for a {window}s window") from None
+
+    def rate(self, window: int) -> float:
+        """Pro Sekunde über die letzten window Bins (am Kampfbeginn: über die bisherigen)."""
+        span = min(window, self.head + 1)
+        return self.sums[self._index(window)] / (span * RATE_BIN) if span > 0 else 0.0
+
+    def peak(self, window: int) -> float:
+        """Höchster Schnitt pro Sekunde, den das Fenster erreicht hat."""
+        return self.peaks[self._index(window)] / (window * RATE_BIN)
+
+    def sparkline(self, n: int = RATE_HISTORY) -> list:
+        """Die letzten n Bins (älteste zuerst), vor Kampfbeginn mit 0 aufgefüllt."""
+        n = min(n, self.size)
+        bins, size, head = self.bins, self.size, self.head
+        return [bins[j % size] if j >= 0 else 0.0 for j in range(head - n + 1, head + 1)]
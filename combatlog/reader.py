@@ -0,0 +1,140 @@
+"""
+Block reader for a growing combat log.
+
+Reads large binary blocks instead of one readline() per event, so catching up
+after a lag spike or a late start runs at decoder speed:
+
+    reader = BlockReader(path, prefilter=BytePrefilter(enc))
+    reader.seek_end()
+    lines = reader.read()       # None = no new bytes
+
+Only complete lines are returned. The unfinished last line is held back until
+the game writes its newline. Without a prefilter each block goes through an
+incremental decoder, so a UTF-16 character split across two reads is put back
+together. With a prefilter, lines are cut on the raw bytes (even offsets for
+UTF-16) and only lines with an anchor are decoded.
+
+A read that fills the whole block doubles the next block (up to max_block),
+and a short read drops back to block_size. Live tailing stays at small reads,
+while a backlog is drained in multi-MiB blocks.
+"""
+
+import codecs
+import os
+
+from .logfiles import BOM_BYTES, detect_encoding
+from .prefilter import line_codec
+
+READ_BYTES = 1 << 16        # Blockgröße im Live-Betrieb
+CATCHUP_BYTES = 1 << 22     # max. Blockgröße beim Aufholen
+
+
+class BlockReader:
+    """
+    Complete decoded lines from a (growing) log file.
+
+    encoding:  None = detect_encoding(path)
+    prefilter: optional BytePrefilter; then only lines with an anchor are returned
+    """
+
+    def __init__(self, path: str, encoding: str = None, prefilter=None,
+                 block_size: int = READ_BYTES, max_block: int = CATCHUP_BYTES):
+        if encoding is None:
+            encoding = prefilter.encoding if prefilter is not None else detect_encoding(path)
+        self.path = path
+        self.encoding = encoding
+        self.codec = line_codec(encoding)
+        self.prefilter = prefilter
+        self.block_size = block_size
+        self.max_block = max(block_size, max_block)
+        self._size = block_size
+        self._f = open(path, 'rb')
+        self.bytes_read = 0
+        self.blocks = 0
+        self.lines = 0
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        self._pending = b""         # angefangene Zeile (Prefilter-Pfad)
+        self._text = ""             # angefangene Zeile (Decoder-Pfad)
+        self._decoder = codecs.getincrementaldecoder(self.codec)(errors='ignore')
+        self._size = self.block_size
+
+    # ── position ──
+    def seek(self, offset: int = 0):
+        """Ab offset lesen (Zeilenanfang!). offset 0 überspringt das BOM."""
+        if offset == 0:
+            offset = BOM_BYTES.get(self.encoding.lower(), 0)
+        self._f.seek(offset)
+        self._reset_buffers()
+
+    def seek_end(self):
+        """Nur neu geschriebene Zeilen lesen."""
+        self._f.seek(0, os.SEEK_END)
+        self._reset_buffers()
+
+    def tell(self) -> int:
+        """Leseposition in der Datei (inkl. zurückgehaltener Bytes)."""
+        return self._f.tell()
+
+    @property
+    def offset(self) -> int:
+        """Ende der letzten vollständig gelieferten Zeile (Byte-Offset)."""
+        held = len(self._pending) + len(self._decoder.getstate()[0])
+        if self._text:
+            held += len(self._text.encode(self.codec))
+        return self._f.tell() - held
+
+    def behind(self) -> int:
+        """Noch ungelesene Bytes."""
+        return max(0, os.fstat(self._f.fileno()).st_size - self._f.tell())
+
+    def truncated(self) -> bool:
+        """True, wenn die Datei kürzer ist als die Leseposition (neu angelegt/gekürzt)."""
+        try:
+            return os.path.getsize(self.path) < self._f.tell()
+        except OSError:
+            return False
+
+    # ── reading ──
+    def read(self):
+        """
+        Liest einen Block.
+        Rückgabe: Liste vollständiger Zeilen (evtl. leer), None = keine neuen Bytes.
+        """
+        size = self._size
+        chunk = self._f.read(size)
+        if not chunk:
+            self._size = self.block_size
+            return None
+        self._size = min(size * 2, self.max_block) if len(chunk) == size else self.block_size
+        self.bytes_read += len(chunk)
+        self.blocks += 1
+
+        if self.prefilter is not None:
+            lines, self._pending = self.prefilter.feed(self._pending + chunk)
+        else:
+            text = self._decoder.decode(chunk)
+            if self._text:
+                text = self._text + text
+            lines = text.split('\n')
+            self._text = lines.pop()    # angefangene Zeile (oder '')
+        self.lines += len(lines)
+        return lines
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> dict:
+        return {
+            'bytes_read': self.bytes_read,
+            'blocks': self.blocks,
+            'lines': self.lines,
+            'offset': self.offset,
+        }
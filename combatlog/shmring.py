@@ -0,0 +1,404 @@
+"""
+Parsing in a worker process, handing events over through shared memory.
+
+In the default mode the tail thread parses inside the GUI process, so regex
+work and painting share one GIL. With `ProcessTailReader` a worker process
+runs the normal TailReader (block reader, pre-filter, grammars)
+and writes the events into a `multiprocessing.shared_memory` ring buffer.
+The GUI process only copies finished columns out of it:
+
+    reader = ProcessTailReader(streams, generation, sink, entities)
+    reader.start()
+    reader.pump()       # UI timer: ring -> EventBatches -> sink
+    reader.stop(); reader.join(0.5)
+
+Ring layout: a header of int64 slots, then one region per column (the
+EventBatch columns plus stream index and block end offset). A record is a
+fixed-size row across the columns, so a block is copied with one
+array.frombytes() per column instead of one unpack per event.
+
+    write_seq   records written (the writer advances it after a whole block)
+    read_seq    records consumed (the reader advances it after a block was accepted)
+
+Positions grow forever and the record index is seq % capacity, so a block can
+wrap around the end of the regions. The writer waits while the ring is full,
+and the log file on disk buffers in the meantime. If write_seq - read_seq ever
+exceeds the capacity, records were overwritten; the reader counts them as
+overrun, skips to the oldest intact record and carries on.
+
+The worker keeps no tail checkpoint. The consumer moves it forward once it
+has aggregated a block (IngestSupervisor.consumed()), so records still in
+the ring or the queue when the GUI exits are read again on the next start.
+
+Names are interned in the worker's own EntityRegistry. New names go through a
+multiprocessing queue before the first record that uses them, and the reader
+maps worker ids to ids of the GUI registry.
+"""
+
+import multiprocessing
+import queue
+import time
+from array import array
+from multiprocessing import shared_memory
+
+from .batch import NO_ID, EventBatch
+from .debuglog import TAIL
+from .entities import EntityRegistry
+
+RING_RECORDS = 1 << 16      # Records im Ring (~2.6 MB)
+RING_MAX_STREAMS = 8        # Logs pro Worker (Header-Slots für Start-Offsets)
+RING_WAIT = 0.005           # s, Schlaf des Writers bei vollem Ring
+WORKER_POLL = 0.1           # s, Worker prüft so oft das Stop-Flag
+# Eine Kampfzeile hat > 32 Bytes: Blöcke bis capacity*16 Bytes füllen höchstens den halben Ring
+RING_BYTES_PER_RECORD = 16
+
+# Spalten: EventBatch + Log-Index + Blockende-Offset
+_COLUMNS = (('kind', 'b'), ('flags', 'B'), ('stream', 'B'), ('amount', 'q'), ('target', 'l'),
+            ('skill', 'l'), ('detail', 'l'), ('time', 'd'), ('offset', 'q'))
+
+_MAGIC = 0x45_6F_41_52_49_4E_47_31      # "EoARING1"
+# Header-Slots (int64)
+_H_MAGIC, _H_CAP, _H_WRITE, _H_READ, _H_STATE, _H_STOP = range(6)
+_H_OFFSETS = 8
+_HEADER_BYTES = (_H_OFFSETS + RING_MAX_STREAMS) * 8
+
+STATE_STARTING, STATE_RUNNING, STATE_STOPPED, STATE_FAILED = range(4)
+
+
+class RingBuffer:
+    """Columnar single-producer / single-consumer ring in shared memory."""
+
+    def __init__(self, name: str = None, capacity: int = RING_RECORDS):
+        create = name is None
+        if create:
+            size = _HEADER_BYTES + sum(self._region(tc, capacity) for _, tc in _COLUMNS)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        buf = self.shm.buf
+        self.hdr = buf[:_HEADER_BYTES].cast('q')
+        if create:
+            self.hdr[_H_MAGIC] = _MAGIC
+            self.hdr[_H_CAP] = capacity
+        elif self.hdr[_H_MAGIC] != _MAGIC:
+            raise ValueError(f"shared memory {name!r} is not an event ring")
+        self.capacity = cap = self.hdr[_H_CAP]
+        self.cols = {}
+        pos = _HEADER_BYTES
+        for col, tc in _COLUMNS:
+            size = self._region(tc, cap)
+            self.cols[col] = (tc, array(tc).itemsize, buf[pos:pos + size])
+            pos += size
+        self.overruns = 0
+        self.lost = 0
+
+    @staticmethod
+    def _region(typecode: str, capacity: int) -> int:
+        size = array(typecode).itemsize * capacity
+        return (size + 7) & ~7
+
+    # ── writer ──
+    def free(self) -> int:
+        return self.capacity - (self.hdr[_H_WRITE] - self.hdr[_H_READ])
+
+    def write(self, columns: dict, n: int):
+        """Schreibt n Records (columns: name -> array) und gibt sie dann frei."""
+        cap = self.capacity
+        w = self.hdr[_H_WRITE]
+        start = w % cap
+        first = min(n, cap - start)
+        for col, (_, size, region) in self.cols.items():
+            data = memoryview(columns[col]).cast('B')
+            region[start * size:(start + first) * size] = data[:first * size]
+            if first < n:
+                # Umlauf: Rest an den Anfang
+                region[:(n - first) * size] = data[first * size:n * size]
+        self.hdr[_H_WRITE] = w + n
+
+    # ── reader ──
+    def column(self, col: str, a: int, b: int) -> array:
+        """Spalte der Records [a, b) (Positionen, nicht Indizes)."""
+        tc, size, region = self.cols[col]
+        cap = self.capacity
+        out = array(tc)
+        start = a % cap
+        first = min(b - a, cap - start)
+        out.frombytes(region[start * size:(start + first) * size])
+        if first < b - a:
+            out.frombytes(region[:(b - a - first) * size])
+        return out
+
+    def pending(self):
+        """(read_seq, write_seq) mit Overrun-Erkennung."""
+        w = self.hdr[_H_WRITE]
+        r = self.hdr[_H_READ]
+        if w - r > self.capacity:
+            lost = w - r - self.capacity
+            self.overruns += 1
+            self.lost += lost
+            TAIL.warning("event ring overrun: %d records lost", lost)
+            r = self.hdr[_H_READ] = w - self.capacity
+        return r, w
+
+    def close(self, unlink: bool = False):
+        # erst alle Views freigeben, sonst kann mmap nicht schließen
+        self.hdr.release()
+        for _, _, region in self.cols.values():
+            region.release()
+        self.cols = {}
+        self.shm.close()
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class _RingSink:
+    """Sink of the TailReader inside the worker: EventBatch -> ring records."""
+
+    def __init__(self, ring: RingBuffer, paths, names_q):
+        self.ring = ring
+        self.index = {p: i for i, p in enumerate(paths)}
+        self.names_q = names_q
+        self._sent = [0, 0, 0]
+
+    def _publish_names(self, entities):
+        tables = (entities.targets.names, entities.skills.names, entities.types.names)
+        delta = []
+        for i, names in enumerate(tables):
+            n = len(names)
+            delta.append(names[self._sent[i]:n])
+            self._sent[i] = n
+        if any(delta):
+            self.names_q.put(delta)
+
+    def __call__(self, item, events: int, timeout: float = None) -> bool:
+        _, _, path, batch, offset = item
+        ring = self.ring
+        # Blöcke > Ring (sollte nicht vorkommen, siehe RING_BYTES_PER_RECORD) in Teilen
+        step = ring.capacity
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while ring.free() < min(events, step):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(RING_WAIT)
+        self._publish_names(batch.entities)
+        for a in range(0, events, step):
+            part = batch if events <= step else batch.slice(a, a + step)
+            n = len(part)
+            while ring.free() < n:
+                time.sleep(RING_WAIT)
+            ring.write({
+                'kind': part.kind, 'flags': part.flags, 'amount': part.amount,
+                'target': part.target, 'skill': part.skill, 'detail': part.detail,
+                'time': part.time,
+                'stream': array('B', [self.index[path]]) * n,
+                'offset': array('q', [offset]) * n,
+            }, n)
+        return True
+
+
+def _ring_worker(ring_name, paths, offsets, names_q, pet_names):
+    """Worker-Prozess: TailReader mit Ring als Sink, bis das Stop-Flag gesetzt ist (ohne Checkpoint)."""
+    from .ingest import TailReader, TailStream
+    from .parser import LineClassifier
+
+    ring = RingBuffer(ring_name)
+    hdr = ring.hdr
+    streams = [TailStream(p, LineClassifier(pet_names=pet_names), o) for p, o in zip(paths, offsets)]
+    reader = TailReader(streams, 0, _RingSink(ring, paths, names_q), EntityRegistry(),
+                        max_block=ring.capacity * RING_BYTES_PER_RECORD)
+    reader.start()
+    published = False
+    try:
+        while reader.alive and not hdr[_H_STOP]:
+            if not published and all(s.reader is not None and s.offset is not None for s in streams):
+                # tatsächliche Startpositionen (seek_end) für die GUI
+                for i, s in enumerate(streams):
+                    hdr[_H_OFFSETS + i] = s.offset
+                hdr[_H_STATE] = STATE_RUNNING
+                published = True
+            time.sleep(WORKER_POLL)
+        reader.stop()
+        reader.join()
+        hdr[_H_STATE] = STATE_FAILED if reader.error is not None else STATE_STOPPED
+    finally:
+        ring.close()
+    if reader.error is not None:
+        raise SystemExit(1)
+
+
+class ProcessTailReader:
+    """
+    Drop-in for TailReader: parses in a worker process, pump() moves the
+    records from the ring into the sink (called from the UI timer).
+    """
+
+    def __init__(self, streams, generation: int, sink, entities, capacity: int = RING_RECORDS):
+        if len(streams) > RING_MAX_STREAMS:
+            raise ValueError(f"at most {RING_MAX_STREAMS} logs per worker")
+        self.streams = list(streams)
+        self.paths = [s.path for s in self.streams]
+        self.generation = generation
+        self.sink = sink
+        self.entities = entities
+        self.capacity = capacity
+        self.batches = 0
+        self.events = 0
+        self.error = None
+        self.started = None
+        self.ring = None
+        self.process = None
+        self.overruns = 0
+        self.lost = 0
+        self._offsets = {s.path: s.start_offset for s in self.streams}
+        self._maps = ([], [], [])           # Worker-id -> GUI-id (targets, skills, types)
+        self._names_q = None
+        self._stopped = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    @property
+    def stopping(self) -> bool:
+        return self._stopped
+
+    def offsets(self) -> dict:
+        """{path: offset} bis zum letzten an die Sink übergebenen Block."""
+        if self.ring is not None:
+            for i, s in enumerate(self.streams):
+                if self._offsets[s.path] is None and self.ring.hdr[_H_STATE] != STATE_STARTING:
+                    self._offsets[s.path] = self.ring.hdr[_H_OFFSETS + i]
+        return dict(self._offsets)
+
+    def delivered(self):
+        """(seq des letzten ausgelieferten Batches, {path: offset}); pump() läuft im selben Thread."""
+        return self.batches, self.offsets()
+
+    def start(self):
+        from .constants import PET_NAMES
+        ctx = multiprocessing.get_context('spawn')
+        self.ring = RingBuffer(capacity=self.capacity)
+        self._names_q = ctx.Queue()
+        self.process = ctx.Process(
+            target=_ring_worker, name=f"tail-worker-{self.generation}", daemon=True,
+            args=(self.ring.name, self.paths, [s.start_offset for s in self.streams],
+                  self._names_q, list(PET_NAMES)))
+        self.started = time.monotonic()
+        self.process.start()
+
+    def stop(self):
+        self._stopped = True
+        if self.ring is not None:
+            self.ring.hdr[_H_STOP] = 1
+
+    def join(self, timeout: float = None) -> bool:
+        """Rückgabe: True = Worker beendet (Rest im Ring wird noch übernommen)."""
+        if self.process is None:
+            return True
+        self.process.join(timeout)
+        if self.process.is_alive():
+            return False
+        self._finish()
+        return True
+
+    def _finish(self):
+        if self.ring is None:
+            return
+        self.pump()
+        if self.process.exitcode and not self._stopped:
+            self.error = RuntimeError(f"tail worker exit code {self.process.exitcode}")
+        self.offsets()
+        self.overruns, self.lost = self.ring.overruns, self.ring.lost
+        self.ring.close(unlink=True)
+        self.ring = None
+        self._names_q.close()
+        if TAIL.info_on:
+            TAIL.info("tail worker %d ended: %d batches, %d events, exit code %s",
+                      self.generation, self.batches, self.events, self.process.exitcode)
+
+    # ── consumer ──
+    def _sync_names(self, need):
+        """Namen aus dem Worker übernehmen, bis alle ids in need bekannt sind."""
+        registry = self.entities
+        tables = (registry.targets, registry.skills, registry.types)
+        deadline = time.monotonic() + 1.0
+        while any(len(m) <= n for m, n in zip(self._maps, need)):
+            try:
+                delta = self._names_q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                raise RuntimeError("tail worker: names for ring records missing") from None
+            for m, table, names in zip(self._maps, tables, delta):
+                m.extend(table.intern(name) for name in names)
+
+    def pump(self) -> int:
+        """
+        Ring -> EventBatches (ein Item je Block) -> sink. Rückgabe: übernommene Events.
+        Fehlen Namen zu Records, gilt der Reader als abgestürzt (error, Worker wird gestoppt).
+        """
+        ring = self.ring
+        if ring is None or self.error is not None:
+            return 0
+        r, w = ring.pending()
+        if r == w:
+            return 0
+        stream = ring.column('stream', r, w)
+        offset = ring.column('offset', r, w)
+        moved = 0
+        a = 0
+        n = w - r
+        while a < n:
+            # ein Block = gleiche Log-Nr. und gleicher Blockende-Offset
+            s, off = stream[a], offset[a]
+            b = a + 1
+            while b < n and offset[b] == off and stream[b] == s:
+                b += 1
+            try:
+                batch = self._batch(r + a, r + b)
+            except RuntimeError as e:
+                # wie ein Absturz des Readers: poll() setzt ab den übernommenen Offsets neu auf
+                self.error = e
+                TAIL.error("tail worker %d failed: %r", self.generation, e)
+                self.stop()
+                break
+            path = self.paths[s]
+            item = (self.generation, self.batches + 1, path, batch, off)
+            if not self.sink(item, b - a, 0):
+                break
+            self.batches += 1
+            self.events += b - a
+            moved += b - a
+            self._offsets[path] = off
+            a = b
+            ring.hdr[_H_READ] = r + a
+        return moved
+
+    def _batch(self, a: int, b: int) -> EventBatch:
+        ring = self.ring
+        target = ring.column('target', a, b)
+        skill = ring.column('skill', a, b)
+        detail = ring.column('detail', a, b)
+        self._sync_names((max(target), max(skill), max(detail)))
+        tmap, smap, ymap = self._maps
+        batch = EventBatch(self.entities)
+        batch.kind = ring.column('kind', a, b)
+        batch.flags = ring.column('flags', a, b)
+        batch.amount = ring.column('amount', a, b)
+        batch.time = ring.column('time', a, b)
+        batch.target = array(target.typecode, map(tmap.__getitem__, target))
+        batch.skill = array(skill.typecode, map(smap.__getitem__, skill))
+        batch.detail = array(detail.typecode, [ymap[d] if d != NO_ID else NO_ID for d in detail])
+        return batch
+
+    def stats(self) -> dict:
+        return {
+            'pid': self.process.pid if self.process is not None else None,
+            'batches': self.batches,
+            'events': self.events,
+            'overruns': self.ring.overruns if self.ring is not None else self.overruns,
+            'lost': self.ring.lost if self.ring is not None else self.lost,
+        }
+
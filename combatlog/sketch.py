@@ -0,0 +1,116 @@
+"""
+Mergeable streaming quantile sketch for hit values.
+
+Hit values are counted in logarithmic buckets (the DDSketch layout):
+bucket k holds the values in (gamma^(k-1), gamma^k], with
+gamma = (1 + alpha) / (1 - alpha). Each quantile is then within a relative
+error of alpha of the true value, and the memory is bounded by the value
+range rather than the number of hits. With alpha = 1 %, values up to
+1,000,000 use at most ~700 buckets. Two sketches merge by adding their
+bucket counts, so per-target sketches of a skill give the "all targets"
+sketch, and sketches of several fights give a session view.
+
+    sk = QuantileSketch()
+    sk.add(1234)
+    sk.quantile(0.5), sk.quantile(0.9), sk.quantile(0.99)
+    sk.histogram(12)        # [count] in 12 equal-width bins from min to max
+    sk.merge(other)
+"""
+
+import math
+
+SKETCH_ALPHA = 0.01         # relative Genauigkeit der Quantile
+
+
+class QuantileSketch:
+    """Log-bucket counts plus exact count / min / max."""
+
+    __slots__ = ('alpha', '_inv_log_gamma', '_gamma', 'buckets', 'zeros', 'count', 'min', 'max')
+
+    def __init__(self, alpha: float = SKETCH_ALPHA):
+        self.alpha = alpha
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._inv_log_gamma = 1.0 / math.log(self._gamma)
+        self.buckets = {}           # k -> Anzahl
+        self.zeros = 0              # Werte <= 0
+        self.count = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        if value > 0:
+            k = math.ceil(math.log(value) * self._inv_log_gamma)
+            b = self.buckets
+            b[k] = b.get(k, 0) + 1
+        else:
+            self.zeros += 1
+        self._seen(value)
+
+    def _seen(self, value):
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: "QuantileSketch"):
+        """Addiert einen Sketch mit gleichem alpha."""
+        if other.alpha != self.alpha:
+            raise ValueError("sketches with different accuracy cannot be merged")
+        b = self.buckets
+        for k, n in other.buckets.items():
+            b[k] = b.get(k, 0) + n
+        self.zeros += other.zeros
+        self.count += other.count
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def copy(self) -> "QuantileSketch":
+        out = QuantileSketch(self.alpha)
+        out.merge(self)
+        return out
+
+    def _value(self, k: int) -> float:
+        # Mittelwert des Buckets (relativer Fehler <= alpha)
+        return 2 * self._gamma ** k / (self._gamma + 1)
+
+    def quantile(self, q: float):
+        """Wert am Quantil q (0..1), None = leer."""
+        return self.quantiles((q,))[0]
+
+    def quantiles(self, qs) -> list:
+        """Mehrere Quantile in einem Durchlauf (qs aufsteigend)."""
+        if not self.count:
+            return [None] * len(qs)
+        out = []
+        keys = sorted(self.buckets)
+        i = 0
+        seen = self.zeros
+        for q in qs:
+            rank = q * (self.count - 1)
+            if rank < self.zeros:
+                out.append(self.min if self.min < 0 else 0)
+                continue
+            while i < len(keys) and seen + self.buckets[keys[i]] <= rank:
+                seen += self.buckets[keys[i]]
+                i += 1
+            if i == len(keys):
+                out.append(self.max)
+            else:
+                out.append(min(max(self._value(keys[i]), self.min), self.max))
+        return out
+
+    def histogram(self, bins: int) -> list:
+        """Anzahl je Klasse, bins gleich breite Klassen von min bis max."""
+        counts = [0] * bins
+        if not self.count:
+            return counts
+        lo, hi = self.min, self.max
+        width = (hi - lo) / bins or 1
+        counts[0] += self.zeros
+        for k, n in self.buckets.items():
+            v = min(max(self._value(k), lo), hi)
+            counts[min(bins - 1, int((v - lo) / width))] += n
+        return counts
@@ -0,0 +1,94 @@
+"""
+Columnar, append-only event store of one mode (dps / hps / dts).
+
+Replaces the list of per-event dicts: one `array` per field, so an event
+costs about 40 bytes instead of a dict with six entries (~400 bytes), and
+scans run over flat C arrays.
+
+    store = EventStore()
+    pos = store.append(rel_t, amount, target_id, skill_id, type_id, flags)
+    store.amount[pos], store.last_time      # columns are plain arrays
+    store.row(pos)                          # {'time', 'dmg', 'target', 'skill', 'type', 'is_pet'}
+    part = store.slice(a, b)                # copy of [a, b)
+    sub = store.take(positions)             # filtered copy (e.g. one target)
+    snap = store.copy()                     # for fight snapshots
+
+Columns:
+    time    seconds since the fight started
+    amount  damage / heal value
+    target  entities.targets id
+    skill   entities.skills id
+    type    entities.types id (rtype / dtype), NO_ID if not logged
+    flags   FLAG_PET, ...
+"""
+
+from array import array
+
+from .batch import FLAG_PET
+
+COLUMNS = (('time', 'd'), ('amount', 'q'), ('target', 'l'), ('skill', 'l'),
+           ('type', 'l'), ('flags', 'B'))
+
+
+class EventStore:
+    """Parallel array columns; arrays grow amortised, so append() is O(1)."""
+
+    __slots__ = tuple(col for col, _ in COLUMNS)
+
+    def __init__(self):
+        for col, tc in COLUMNS:
+            setattr(self, col, array(tc))
+
+    def __len__(self):
+        return len(self.time)
+
+    def append(self, rel_t: float, amount: int, target: int, skill: int,
+               type_id: int, flags: int = 0) -> int:
+        """Hängt ein Event an. Rückgabe: Position."""
+        self.time.append(rel_t)
+        self.amount.append(amount)
+        self.target.append(target)
+        self.skill.append(skill)
+        self.type.append(type_id)
+        self.flags.append(flags)
+        return len(self.time) - 1
+
+    def extend(self, other: "EventStore"):
+        for col, _ in COLUMNS:
+            getattr(self, col).extend(getattr(other, col))
+
+    def clear(self):
+        for col, _ in COLUMNS:
+            del getattr(self, col)[:]
+
+    @property
+    def last_time(self) -> float:
+        """Zeit des letzten Events (0.0 = leer)."""
+        return self.time[-1] if self.time else 0.0
+
+    def row(self, pos: int) -> dict:
+        """Ein Event als Dict (nur für Einzelzugriffe, nicht für Scans)."""
+        return {'time': self.time[pos], 'dmg': self.amount[pos], 'target': self.target[pos],
+                'skill': self.skill[pos], 'type': self.type[pos],
+                'is_pet': bool(self.flags[pos] & FLAG_PET)}
+
+    def slice(self, start: int, stop: int = None) -> "EventStore":
+        """Kopie von [start:stop]."""
+        out = EventStore.__new__(EventStore)
+        for col, _ in COLUMNS:
+            setattr(out, col, getattr(self, col)[start:stop])
+        return out
+
+    def take(self, positions) -> "EventStore":
+        """Kopie der Events an positions (aufsteigend), z.B. ein Ziel."""
+        out = EventStore.__new__(EventStore)
+        for col, tc in COLUMNS:
+            setattr(out, col, array(tc, map(getattr(self, col).__getitem__, positions)))
+        return out
+
+    def copy(self) -> "EventStore":
+        return self.slice(0)
+
+    def nbytes(self) -> int:
+        """Speicher der Spalten (ohne Überallokation)."""
+        return sum(len(a) * a.itemsize for a in (getattr(self, col) for col, _ in COLUMNS))
@@ -0,0 +1,271 @@
+"""
+Waiting for a growing log file without a fixed sleep loop.
+
+    watcher = make_watcher(path)
+    while running:
+        data = f.read(...)
+        if not data:
+            watcher.wait(WAIT_TIMEOUT, f.tell())
+            continue
+
+Backends:
+    InotifyWatcher  Linux; sleeps in select() until the kernel reports a
+                    write (libc via ctypes, no extra dependency)
+    PollingWatcher  everywhere else; stat() with adaptive back-off: 20 ms
+                    right after activity, growing to 250 ms while the game
+                    is idle, so the first line of a new fight shows up
+                    within a quarter second
+
+Both measure the wake-to-event latency: time from the last write (file mtime)
+until the reader is woken.
+
+wake() ends a running wait() at once and makes every later one return
+immediately. The reader calls it on stop, so a join does not have to sit out
+the rest of WAIT_TIMEOUT.
+
+One watcher can follow several logs (one tail thread for several clients):
+
+    watcher = make_watcher(paths[0])
+    watcher.add(paths[1])
+    watcher.wait(WAIT_TIMEOUT, {path: f.tell(), ...})
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import time
+
+POLL_MIN = 0.02       # s, Intervall direkt nach Aktivität
+POLL_MAX = 0.25       # s, Intervall im Leerlauf (= Latenz der ersten Zeile nach Pause)
+POLL_BACKOFF = 1.5    # Faktor pro ereignislosem Poll
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_MASK = _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_DELETE_SELF | _IN_MOVE_SELF
+
+
+class LogWatcher:
+    """Base class: wait() blocks until the file may have changed or timeout."""
+
+    backend = None
+
+    def __init__(self, path: str):
+        self.path = path
+        self.paths = [path]
+        self.wakeups = 0
+        self.latency_last = 0.0
+        self.latency_max = 0.0
+        self._latency_sum = 0.0
+        self._woken = threading.Event()
+
+    def add(self, path: str):
+        """Weitere Datei beobachten (wait() wacht bei jeder auf)."""
+        if path not in self.paths:
+            self.paths.append(path)
+
+    def wait(self, timeout: float, offset=None) -> bool:
+        """
+        Wartet höchstens `timeout` s auf neue Daten.
+        offset: aktuelle Leseposition (Polling erkennt Wachstum daran);
+                bei mehreren Dateien {path: offset}.
+        Rückgabe: True = eine Datei hat sich (vermutlich) geändert.
+        """
+        raise NotImplementedError
+
+    def wake(self):
+        """Laufendes und jedes spätere wait() sofort beenden (Stop, aus einem anderen Thread)."""
+        self._woken.set()
+
+    def close(self):
+        pass
+
+    def _offsets(self, offset) -> dict:
+        """offset (int / dict / None) -> {path: offset}"""
+        if isinstance(offset, dict):
+            return offset
+        return {self.path: offset} if offset is not None else {}
+
+    def _record_wake(self):
+        # Latenz zum jüngsten Schreibzugriff über alle beobachteten Dateien
+        lat = None
+        now = time.time()
+        for path in self.paths:
+            try:
+                d = max(0.0, now - os.stat(path).st_mtime)
+            except OSError:
+                continue
+            if lat is None or d < lat:
+                lat = d
+        if lat is None:
+            return
+        self.wakeups += 1
+        self.latency_last = lat
+        self._latency_sum += lat
+        if lat > self.latency_max:
+            self.latency_max = lat
+
+    def stats(self) -> dict:
+        return {
+            'backend': self.backend,
+            'wakeups': self.wakeups,
+            'latency_avg_ms': self._latency_sum / self.wakeups * 1000 if self.wakeups else 0.0,
+            'latency_max_ms': self.latency_max * 1000,
+            'latency_last_ms': self.latency_last * 1000,
+        }
+
+
+class PollingWatcher(LogWatcher):
+    backend = 'poll'
+
+    def __init__(self, path: str, poll_min: float = POLL_MIN, poll_max: float = POLL_MAX):
+        super().__init__(path)
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.interval = poll_min
+        self._last = {}              # path -> (size, mtime_ns) beim letzten Poll
+
+    def _changed(self, offsets: dict) -> bool:
+        changed = False
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                return True          # weg/rotiert -> Leser soll es merken
+            sig = (st.st_size, st.st_mtime_ns)
+            offset = offsets.get(path)
+            if offset is not None:
+                changed |= st.st_size != offset
+            else:
+                last = self._last.get(path)
+                changed |= last is not None and sig != last
+            self._last[path] = sig
+        return changed
+
+    def wait(self, timeout: float, offset=None) -> bool:
+        offsets = self._offsets(offset)
+        deadline = time.monotonic() + timeout
+        while not self._woken.is_set():
+            if self._changed(offsets):
+                self.interval = self.poll_min
+                self._record_wake()
+                return True
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return False
+            if self._woken.wait(min(self.interval, left)):
+                break
+            self.interval = min(self.poll_max, self.interval * POLL_BACKOFF)
+        return False
+
+
+class InotifyWatcher(LogWatcher):
+    backend = 'inotify'
+
+    _libc = None
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        libc = InotifyWatcher._load_libc()
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._fd = fd
+        # Selbst-Pipe für wake(): select() wacht auch ohne Dateiänderung auf
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_w, False)
+        self._fd_lock = threading.Lock()    # wake() nicht in ein geschlossenes fd schreiben
+        try:
+            self._add_watch(path)
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, path: str):
+        wd = InotifyWatcher._libc.inotify_add_watch(self._fd, os.fsencode(path), _IN_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path!r}")
+
+    def add(self, path: str):
+        if path in self.paths or self._fd is None:
+            return
+        self._add_watch(path)
+        self.paths.append(path)
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            cls._libc = libc
+        return cls._libc
+
+    def wait(self, timeout: float, offset=None) -> bool:
+        if self._fd is None:
+            self._woken.wait(timeout)
+            return False
+        if self._woken.is_set():
+            return False
+        for path, off in self._offsets(offset).items():
+            # vor dem Watch geschrieben / zwischen read() und wait()
+            try:
+                if os.stat(path).st_size != off:
+                    self._record_wake()
+                    return True
+            except OSError:
+                return True
+        ready, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if not ready or self._wake_r in ready:
+            return False
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._record_wake()
+        return True
+
+    def wake(self):
+        super().wake()
+        with self._fd_lock:
+            if self._fd is not None:
+                try:
+                    os.write(self._wake_w, b'\0')
+                except BlockingIOError:
+                    pass                # Pipe voll: select() ist ohnehin bereit
+
+    def close(self):
+        with self._fd_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                os.close(self._wake_r)
+                os.close(self._wake_w)
+                self._fd = None
+
+
+def make_watcher(path) -> LogWatcher:
+    """
+    inotify unter Linux, sonst (oder wenn inotify nicht geht) Polling.
+    path: eine Datei oder eine Liste (ein Watcher für alle).
+    """
+    paths = [path] if isinstance(path, str) else list(path)
+    if sys.platform.startswith("linux"):
+        watcher = None
+        try:
+            watcher = InotifyWatcher(paths[0])
+            for p in paths[1:]:
+                watcher.add(p)
+            return watcher
+        except (OSError, AttributeError):
+            if watcher is not None:
+                watcher.close()
+    watcher = PollingWatcher(paths[0])
+    for p in paths[1:]:
+        watcher.add(p)
+    return watcher
@@ -29,18 +29,25 @@
 ###############################################################################
 
 
-import sys, glob, re, os
-import time, queue
+import sys, os
+import multiprocessing
+import time
 
 from PyQt5.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QComboBox, QCheckBox
 from PyQt5.QtWidgets import (
     QPushButton, QMenu, QFileDialog, QInputDialog, QMessageBox,
     QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
-    QLineEdit
+    QLineEdit, QProgressDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QColor, QGuiApplication
-from settings_store import load_settings, save_settings
+from settings_store import CHECKPOINT_FILE, apply_log_settings, load_settings, save_settings
+from combatlog import (
+    Backfill, CombatAggregator, TailCheckpoint, EntityRegistry, EventQueue, IngestSupervisor,
+    MODE_PROCESS, MODE_THREAD, get_active_combat_logs, get_latest_combat_log,
+)
+from combatlog import debuglog
+from combatlog.debuglog import CFG, TAIL, UI
 import config
 from config import (
     WINDOW_WIDTH, MIN_HEIGHT, MAX_HEIGHT,
@@ -48,70 +55,15 @@ from config import (
     FRAME_PADDING, DROPDOWN_HEIGHT,
     MODE_BTN_HEIGHT, MODE_BTN_WIDTH,
     STARTSTOP_BTN_WIDTH, STARTSTOP_BTN_HEIGHT, AUTO_STOP_SECONDS,
+    LOG_CHECK_INTERVAL, DRAIN_BUDGET, DRAIN_CHUNK, LIVE_SPARK_SECONDS, PET_NAMES
+)
+from ui_theme import (
     FONT_TITLE, FONT_SUBTITLE, FONT_BTN_TEXT,
-    FONT_TEXT, FONT_TEXT_CLS_BTN, COLORS, AA_SKILLS,
-    DEBUG_PARSE, LOG_CHECK_INTERVAL, PET_NAMES
+    FONT_TEXT, FONT_TEXT_CLS_BTN, COLORS,
 )
 TARGET_TEXT_HEX = "#f2e3a0"
 
 
-###############################################################################
-####################### Parse config.ini for infos ############################
-###############################################################################
-
-# ── Helper to read current combat log (will be updated every 10s later) ── 
-
-def _clean_dir(p: str) -> str:
-    # remove quotes + white space, expand variables, normalize
-    p = (p or "").strip().strip('"').strip("'")
-    p = os.path.expandvars(os.path.expanduser(p))
-    return os.path.normpath(p)
-
-def get_latest_combat_log(folder: str = None):
-    """
-    Suche die aktuellste Combat-Log-Datei.
-    Wenn `folder` None ist, wird config.CMBT_LOG_DIR verwendet.
-    """
-    base_raw = folder if folder is not None else config.CMBT_LOG_DIR
-    base = _clean_dir(base_raw)
-
-    if DEBUG_PARSE:
-        print(f"[LOG] get_latest_combat_log: raw={base_raw!r}, cleaned={base!r}")
-
-    if not base or not os.path.isdir(base):
-        if DEBUG_PARSE:
-            print(f"[LOG] Invalid log dir: {repr(base_raw)} -> {repr(base)} (exists={os.path.isdir(base)})")
-        return None
-
-    patterns = [
-        os.path.join(base, "Combat_*.txt"),
-        os.path.join(base, "CombatLog_*.txt"),
-        os.path.join(base, "combat_*.txt"),
-        os.path.join(base, "Kampf_*.txt"),
-    ]
-
-    files = []
-    for pat in patterns:
-        hit = glob.glob(pat)
-    #    if DEBUG_PARSE:
-    #        print(f"[LOG] glob {pat} -> {len(hit)}")
-        files.extend(hit)
-
-    latest = max(files, key=os.path.getmtime) if files else None
-    # if DEBUG_PARSE:
-    #    print(f"[LOG] latest={latest!r}")
-    return latest
-
-# ── Helper to avoid decoding issues ── 
-def _detect_encoding(path: str) -> str:
-    with open(path, 'rb') as fb:
-        head = fb.read(4)
-    if head.startswith(b'\xff\xfe'): return 'utf-16-le'
-    if head.startswith(b'\xfe\xff'): return 'utf-16-be'
-    if head.startswith(b'\xef\xbb\xbf'): return 'utf-8-sig'
-    return 'utf-8'
-
-
 ###############################################################################
 #######           Helper for colors and button styles                   #######    
 ###############################################################################
@@ -150,7 +102,10 @@ def apply_style(btn: QPushButton,
 ###############################################################################
 
 class OverlayWindow(QWidget):
-    
+
+    # Reader-Thread -> GUI: Queue ist nicht mehr leer (queued, kein Polling)
+    events_ready = pyqtSignal()
+
     ###--- Start: initializing functions and update of the overlay ---###
     # ── init overlay on startup ──
     def __init__(self):
@@ -158,9 +113,8 @@ class OverlayWindow(QWidget):
         self._adjust_fonts_for_dpi()         # adjust fonts to dpi to handle different windows scaling
         self.settings = load_settings()      # load user-settings (path to combat log and user pet names
         self._save_settings = save_settings  # save settings to settings.json in the same folder 
-        if DEBUG_PARSE:
-            print("[CFG] CMBT_LOG_DIR:", config.CMBT_LOG_DIR)
-            print("[CFG] PET_NAMES:", PET_NAMES)
+        CFG.info("CMBT_LOG_DIR: %s", config.CMBT_LOG_DIR)
+        CFG.debug("PET_NAMES: %s", PET_NAMES)
         self.stat_mode = 'dps'               # default mode
         self._create_stat_mode_buttons()     # 1a) add a chose mode snippet for damage, heal or damage taken
         #self._create_settings_button()       # 1b) add a setting menu
@@ -249,11 +203,16 @@ class OverlayWindow(QWidget):
     # ── 3) init any kind of needed data for parsing ──
     def _init_data(self):
         self._drag_start = None
-        self.modes = {
-            'dps': {'events': [], 'total': 0, 'max': 0, 'max_skill': '--'},
-            'hps': {'events': [], 'total': 0, 'max': 0, 'max_skill': '--'},
-            'dts': {'events': [], 'total': 0, 'max': 0, 'max_skill': '--'},
-        }
+        # --- per-mode events & totals live in the Qt-free aggregator ---
+        self._entities = EntityRegistry()  # session-wide name ids (parser + aggregates + snapshots)
+        # --- one aggregator per followed log (several clients); key None = single log ---
+        self._streams = {}
+        self._stream_key = None
+        self.combat = self._stream(None)['combat']    # shown stream
+        self.modes = self.combat.modes
+        # --- view results (table, summary, details, dropdown) until combat.version moves ---
+        self._view_cache = {}          # part -> (key, value), see _cached_view
+        self._tick_state = None        # last repainted state, see _tick
         
         # --- current selection on target dropdown menu (None = Total) ---
         self.sel_target = None 
@@ -270,13 +229,25 @@ class OverlayWindow(QWidget):
         self.manual_waiting = False
         self.manual_start_time = None
 
-        # --- Tail-Thread State ---
-        self._current_log_path = None
-        self._tail_thread = None
-        self._tail_should_run = False
-        
-        # --- results from tail-thread ---
-        self._event_queue = queue.Queue()
+        # --- tail position (line classifiers live in the supervisor: one per log / client language) ---
+        self._checkpoint = TailCheckpoint(CHECKPOINT_FILE)   # tail position across restarts
+        self._resume_pending = True        # only the first tail after launch resumes
+
+        # --- backfill of existing logs (worker thread, polled in _tick) ---
+        self._backfill = None
+        self._backfill_result = None
+        self._backfill_dialog = None
+
+        # --- results from tail-thread: (generation, seq, log path, EventBatch, end offset) ---
+        # bounded; when full the tail thread waits and the log file buffers
+        self._event_queue = EventQueue(on_ready=self.events_ready.emit)
+        self._drain_partial = None     # (generation, seq) des zurückgelegten Rests, siehe _drain_events
+        self.events_ready.connect(self._drain_events, Qt.QueuedConnection)
+        # --- Tail-Thread State (start/stop/restart, stale batches) ---
+        # parse_process: Reader in einem Worker-Prozess, Events über Shared Memory (poll() pumpt)
+        self._ingest = IngestSupervisor(
+            self._event_queue.put, self._entities, self._checkpoint,
+            mode=MODE_PROCESS if self.settings.get("parse_process") else MODE_THREAD)
         self._last_event_time = None
         self._last_log_check = 0.0
  
@@ -325,6 +296,14 @@ class OverlayWindow(QWidget):
         self.PST_FGHT_DD.setFixedHeight(DROPDOWN_HEIGHT)
         self.PST_FGHT_DD.addItem("Select combat")
 
+        # --- log selection (several clients), only shown with more than one log ---
+        self.LOG_DD = QComboBox(self)
+        self.LOG_DD.setFont(FONT_TEXT)
+        self.LOG_DD.setFixedHeight(DROPDOWN_HEIGHT)
+        self.LOG_DD.currentIndexChanged.connect(self._on_log_selected)
+        self.LOG_DD.hide()
+        self._log_dd_shown = False
+
         # --- start/stop button ---
         self.start_stop_btn = QPushButton("Start", self)
         self.start_stop_btn.setFont(FONT_BTN_TEXT)
@@ -378,6 +357,7 @@ class OverlayWindow(QWidget):
         }
         """
         self.PST_FGHT_DD.setStyleSheet(common_dd_style)
+        self.LOG_DD.setStyleSheet(common_dd_style)
         self.manual_combo.setStyleSheet(common_dd_style)
         
         # --- checkbox for auto combat stop ---
@@ -459,6 +439,14 @@ class OverlayWindow(QWidget):
         dd_x = FRAME_PADDING
         dd_w = self.width() - 2 * (FRAME_PADDING)
 
+        # --- select log dropdown (several clients) ---
+        if self._log_dd_shown:
+            self.LOG_DD.setGeometry(dd_x, y, dd_w, DROPDOWN_HEIGHT)
+            self.LOG_DD.show()
+            y += DROPDOWN_HEIGHT + 6
+        else:
+            self.LOG_DD.hide()
+
         # --- select combat dropdown ---
         self.label.hide()
         self.PST_FGHT_DD.setGeometry(dd_x, y, dd_w, DROPDOWN_HEIGHT)
@@ -557,6 +545,23 @@ class OverlayWindow(QWidget):
         p.setBrush(header_bg)
         p.setPen(header_border)
         p.drawRect(info_rect)
+
+        # live rates (1-s ring, O(1) je Tick): Sparkline der letzten 60 s hinter dem Text
+        live = self._live_rates()
+        if live:
+            spark = live['spark']
+            peak = max(spark)
+            if peak > 0:
+                inner = info_rect.adjusted(1, 1, 0, 0)
+                bin_w = inner.width() / len(spark)
+                p.setPen(Qt.NoPen)
+                p.setBrush(QColor(180, 140, 60, 70))
+                for i, v in enumerate(spark):
+                    if v > 0:
+                        h = max(1, int(inner.height() * v / peak))
+                        p.drawRect(QRect(int(inner.x() + i * bin_w), inner.bottom() - h + 1,
+                                         max(1, int(bin_w)), h))
+
         title = self._current_target_label()
         p.setFont(QFont("Arial", 10, QFont.Bold))
         p.setPen(header_text)
@@ -567,6 +572,9 @@ class OverlayWindow(QWidget):
         )
         mode_txt = self._metric_short()
         info_txt = f"{mode_txt} mode - Duration | {self.combat_time:.1f}s"
+        if live and self._is_live_fight():
+            r = live['rates']
+            info_txt = f"{mode_txt} 5s {int(r[5]):,} | 60s {int(r[60]):,} | {self.combat_time:.1f}s"
         p.setFont(QFont("Arial", 9))
         p.drawText(
             info_rect.adjusted(8, 0, -8, 0),
@@ -620,15 +628,11 @@ class OverlayWindow(QWidget):
         p.setPen(header_border)
         p.drawLine(bar_left, header_y2 + 2, right, header_y2 + 2)
 
-        # --- get data ---
+        # --- get data (cached until events / mode / target / skill change) ---
         stats = self._build_skill_stats()
         has_stats = bool(stats)
-
-        if has_stats:
-            max_val = max(s['total'] for s in stats) or 1
-        else:
-            # dummy value
-            max_val = 1
+        summary = self._view_summary()
+        max_val = summary['max_val']
 
         # --- color for bars related to parsing mode
         if self.stat_mode == 'dps':
@@ -641,31 +645,17 @@ class OverlayWindow(QWidget):
             bar_base_col = QColor(40, 40, 130, 230)
             bar_highlight_col = QColor(90, 90, 200, 255)
 
-    # --- global summary values for all skills ---
-        # DoT hits will not count into summary hitcounter ...
-        total_hits_sum = sum(
-            s['hits'] for s in stats
-            if s['skill'] != "DoT damage"
-        )
-        total_val_sum = sum(s['total'] for s in stats)  # ... whereas total damage includes dot damage
-
-        all_min = None
-        all_max = None
-       
-        for s in stats:
-            s_min = s.get('min')
-            s_max = s.get('max')
-            if s_min is not None:
-                all_min = s_min if all_min is None else min(all_min, s_min)
-            if s_max is not None:
-                all_max = s_max if all_max is None else max(all_max, s_max)
-
-
-        overall_avg = (total_val_sum / total_hits_sum) if total_hits_sum else 0.0
+        # --- global summary values for all skills ---
+        total_hits_sum = summary['hits']
+        total_val_sum = summary['total']
+        all_min = summary['min']
+        all_max = summary['max']
+        overall_avg = summary['avg']
 
         # --- define are for table and summary ---
         bottom_y = self.height() - STARTSTOP_BTN_HEIGHT - FRAME_PADDING
-        summary_block_h = row_h * 3 + 10           # line + summary + detail
+        detail_lines = 3 if self.selected_skill else 2   # + Quantile/Histogramm
+        summary_block_h = row_h * (1 + detail_lines) + 10   # line + summary + detail
 
         extra_bottom_gap = 10                      # space between detail lines and buttons
 
@@ -899,7 +889,7 @@ class OverlayWindow(QWidget):
         p.drawText(total_sum_rect, Qt.AlignCenter, f"{total_val_sum:,}")
         p.drawText(avg_sum_rect, Qt.AlignCenter, f"{int(overall_avg):,}")
 
-        # --- detail area below summary (two lines) ---
+        # --- detail area below summary (two lines, three with a selected skill) ---
         detail_y = sum_top + row_h + 4
         line_h = row_h
 
@@ -913,6 +903,7 @@ class OverlayWindow(QWidget):
         col_w = int(total_w * 0.22)  
         baseline1 = detail_y + int(0.7 * line_h)
         baseline2 = detail_y + line_h + int(0.7 * line_h)
+        baseline3 = detail_y + 2 * line_h + int(0.7 * line_h)
 
         if self.selected_skill:
             details = self._compute_skill_details(self.selected_skill)
@@ -972,6 +963,28 @@ class OverlayWindow(QWidget):
                 x = bar_left
                 part = f"Hits: {hits}"
                 p.drawText(x, baseline2, part)
+
+                # line 3: median / p90 / p99 (left), hit histogram min..max (right)
+                q_txt = "  ".join(f"{lbl}: {int(round(details[k])):,}"
+                                  for lbl, k in (("med", 'median'), ("p90", 'p90'), ("p99", 'p99')))
+                p.drawText(bar_left, baseline3, q_txt)
+
+                hist = details['hist']
+                peak = max(hist) if hist else 0
+                if peak:
+                    hist_w = 2 * col_w
+                    hist_x = right - hist_w - 10
+                    hist_top = detail_y + 2 * line_h + 3
+                    hist_h = line_h - 6
+                    bin_w = hist_w / len(hist)
+                    p.setPen(Qt.NoPen)
+                    p.setBrush(QColor(180, 140, 60, 200))
+                    for i, n in enumerate(hist):
+                        if not n:
+                            continue
+                        h = max(1, int(hist_h * n / peak))
+                        p.drawRect(QRect(int(hist_x + i * bin_w), hist_top + hist_h - h,
+                                         max(1, int(bin_w) - 1), h))
         else:
             # all skills
             skill_name = "All skills"
@@ -1031,9 +1044,9 @@ class OverlayWindow(QWidget):
         p.setPen(header_border)
         p.drawLine(
             bar_left,
-            detail_y + 2 * line_h + 2,
+            detail_y + detail_lines * line_h + 2,
             right,
-            detail_y + 2 * line_h + 2
+            detail_y + detail_lines * line_h + 2
         )
 
         p.end()
@@ -1090,414 +1103,165 @@ class OverlayWindow(QWidget):
     ###--- Start: helper functions for interaction with overlay ---###
     
     # --- Tail Lifecycle ---
+    def _tail_paths(self):
+        """Zu verfolgende Logs: das neueste, oder alle aktiven (mehrere Clients)."""
+        if self.settings.get("multi_log"):
+            return get_active_combat_logs(config.CMBT_LOG_DIR)
+        path = get_latest_combat_log(config.CMBT_LOG_DIR)
+        return [path] if path else []
+
     def _ensure_log_thread(self):
-        # Wenn der Thread noch lebt: nichts zu tun
-        if self._tail_thread and self._tail_thread.is_alive():
+        paths = self._tail_paths()
+        if not paths:
+            TAIL.info("no combat log yet – will retry")
             return
 
-        path = get_latest_combat_log()
-        if not path:
-            if DEBUG_PARSE:
-                print("[LOG] no combat log yet – will retry")
+        # Reader läuft (oder Neustart nach Fehler ist geplant) für genau diese Logs: nichts zu tun
+        if self._ingest.active and self._ingest.follows(paths):
             return
+        if self._ingest.active:
+            # Log-Rotation / Client dazu oder weg: gleiche Logs lesen am alten Offset weiter
+            TAIL.info("switching to combat log(s): %s", ", ".join(paths))
 
-        self._current_log_path = path
-        self._tail_should_run = True
-
-        def _tail_loop(pth: str):
-            try:
-                enc = _detect_encoding(pth)
-                with open(pth, 'r', encoding=enc, errors='ignore') as f:
-                    f.seek(0, os.SEEK_END)
-                    while self._tail_should_run:
-                        line = f.readline()
-                        if not line:
-                            time.sleep(0.05)
-                            continue
-
-                        parsed = self._parse_line(line)
-                        if not parsed:
-                            continue
-
-                        # WICHTIG: keine UI-Aufrufe hier, nur Queue!
-                        try:
-                            if hasattr(self, "_event_queue"):
-                                self._event_queue.put(parsed)
-                        except Exception as e:
-                            if DEBUG_PARSE:
-                                print(f"[ERR] enqueue failed: {e!r}")
-                            continue
-            except Exception as e:
-                if DEBUG_PARSE:
-                    print(f"[ERR] tail-loop outer: {e!r}")
-            finally:
-                # markieren, dass der Thread beendet ist
-                self._tail_thread = None
-
-        import threading
-        self._tail_thread = threading.Thread(
-            target=_tail_loop,
-            args=(path,),
-            daemon=True,
-        )
-        self._tail_thread.start()
+        # nach Absturz/Neustart: ab Checkpoint weiterlesen (Reader holt in großen Blöcken auf)
+        self._ingest.start(paths, resume=self._resume_pending)
+        self._resume_pending = False
+        self._rebuild_log_dropdown()
 
     def _stop_log_thread(self):
-        self._tail_should_run = False
-        # daemon thread – kein join nötig
-        
-    # --- Logzeile -> Event ---
-    def _parse_line(self, line):
-        # 1) Eigener Schaden?
-        hit = self._parse_damage_line(line)   # <- das ist dein bisheriger DPS-Parser-Inhalt aus _parse_line
-        if hit:  # ('hit', dmg, enemy, skill)
-            return hit
-        # 2) Eigenes Heal?
-        heal = self._parse_heal_line(line)
-        if heal:  # ('heal', amount, target, skill)
-            return heal
-        # 3) Eingehender Schaden?
-        taken = self._parse_taken_line(line)
-        if taken:  # ('taken', amount, attacker, skill, dtype)
-            return taken
-        return None
-    
-    def _parse_damage_line(self, line):
-        text = line.strip()
-        if not text: return None
-        
-        
-        # --- Deutscher Client: "Ihr trefft ..." ---
-        low = text.lower()
-        if "ihr trefft" in low:
-            # Variante mit Skill:
-            # [PREFIX/Timestamp:] ... Ihr trefft <Ziel> mit der Fertigkeit '<Skill>' und (ihre|seine) Moral nimmt N Punkte Schaden (<dtype>).
-            m = re.search(
-                r"Ihr trefft\s+(?P<target>.+?)\s+mit der Fertigkeit\s+'(?P<skill>[^']+)'\s+und\s+(?:ihre|seine)\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
-                text,
-                re.IGNORECASE,
-            )
-            if m:
-                enemy = m.group("target").strip()
-                skill = m.group("skill").strip()
-                dmg = int(re.sub(r"[^\d]", "", m.group("amt")))
-
-                # Autoattacks erkennst du weiterhin über AA_SKILLS
-                # (hier kannst du die deutschen Skillnamen ergänzen)
-                if skill in AA_SKILLS:
-                    s_low = skill.lower()
-                    if "bow" in s_low or "bogen" in s_low:
-                        skill = "Autoattack (ranged)"
-                    else:
-                        skill = "Autoattack (melee)"
-
-                return ("hit", dmg, enemy, skill)
-
-            # Variante ohne Skill (DoT):
-            # Ihr trefft <Ziel> und (ihre|seine) Moral nimmt N Punkte Schaden (<dtype>).
-            m = re.search(
-                r"Ihr trefft\s+(?P<target>.+?)\s+und\s+(?:ihre|seine)\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
-                text,
-                re.IGNORECASE,
-            )
-            if m:
-                enemy = m.group("target").strip()
-                dmg = int(re.sub(r"[^\d]", "", m.group("amt")))
-                skill = "DoT damage"
-                return ("hit", dmg, enemy, skill)
-
-            # Falls die deutsche Variante doch nicht gepasst hat, weiter mit EN-Parser
-            # (z.B. wenn die Zeile doch was anderes war)
-        
-        
-        hit_kw = " hit " if " hit " in text else (" hits " if " hits " in text else None)
-        if not hit_kw: return None
-        try:
-            actor, rest = text.split(hit_kw, 1)
-        except ValueError:
-            return None
-        actor_lc = actor.strip().lower()
-        if actor_lc.startswith("the "): actor_lc = actor_lc[4:].lstrip()
-        is_you = actor_lc.startswith("you")
-        is_pet = actor_lc in PET_NAMES
-        if DEBUG_PARSE:
-            print(f"[HIT] actor={actor_lc!r} is_pet={is_pet} PET_NAMES={PET_NAMES}")
-        if not (is_you or is_pet): return None
-        if rest.lower().startswith("the "): rest = rest[4:].lstrip()
-        if " for " not in rest or " points" not in rest: return None
-        try:
-            before_for, after_for = rest.rsplit(" for ", 1)
-            dmg_token = after_for.split(" points", 1)[0]
-            dmg = int(re.sub(r"[^\d]", "", dmg_token))
-        except Exception:
-            return None
-        if " with " in before_for:
-            enemy_part, skill_part = before_for.split(" with ", 1)
-            skill = skill_part.strip().rstrip(".")
-            if skill in AA_SKILLS:
-                # Unterscheide nach Name – z.B. "Bow Attack" → Autoattack (ranged)
-                if "bow" in skill.lower():
-                    skill = "Autoattack (ranged)"
-                else:
-                    skill = "Autoattack (melee)"
-        else:
-            enemy_part = before_for; skill = "DoT damage"
-        enemy = enemy_part.strip().rstrip(".")
-        return ("hit", dmg, enemy, skill, is_pet)
-
-    def _parse_heal_line(self, line: str):
-        """
-        Liefert:
-        ('heal', amount:int, target:str, skill:str, rtype:str|None)
-        rtype ∈ {'Morale','Power'} wenn vorhanden.
-        """
-        text = line.strip()
-        if not text:
-            return None
+        # stoppt den Reader; was er danach noch liefert, verwirft _tick
+        self._ingest.stop()
         
-         # --- Deutscher Client: "Ihr heilt N Punkte des Schadens (Moral) ..." ---
-        low = text.lower()
-        if low.startswith("ihr heilt"):
-            m = re.match(
-                r"Ihr heilt\s+(?P<amt>[\d\.]+)\s+Punkte des Schadens\s+\((?P<res>[^)]+)\),\s+den\s+(?P<target>.+?)\s+genommen ha(?:t|bt)\.",
-                text,
-                re.IGNORECASE,
-            )
-            if m:
-                amt = int(re.sub(r"[^\d]", "", m.group("amt")))
-                res_raw = m.group("res").strip().lower()
-                if "moral" in res_raw:
-                    rtype = "Morale"
-                elif "kraft" in res_raw:
-                    rtype = "Power"
-                else:
-                    rtype = None
-
-                target = m.group("target").strip()
-                # Selbstheilung auf "You" mappen
-                if target.lower() in ("ihr", "euch", "euer", "euch selbst"):
-                    target = "You"
-
-                skill = "Heal"
-                return ("heal", amt, target, skill, rtype)
-        
-
-        def strip_the(s: str) -> str:
-            s = s.strip()
-            return s[4:].lstrip() if s.lower().startswith("the ") else s
-
-        def to_int(num: str) -> int:
-            return int(re.sub(r"[^\d]", "", num))
-
-        t = text.rstrip()
-
-        # Hilfs-Teil für Ressource:
-        # … (Morale points) | (Power points) | (points of Morale/Power) | points
-        res_part = r"(?:(?P<res1>Morale|Power)\s+points?|points?\s+of\s+(?P<res2>Morale|Power)|points?)"
-
-        # A) "<actor> heal(s|ed) <target> for N <res_part>"
-        m = re.search(
-            rf"^(?P<actor>.+?)\s+heal(?:s|ed)?\s+(?P<target>.+?)\s+for\s+(?P<amt>[\d,]+)\s+{res_part}(?:\.\s*)?$",
-            t, re.IGNORECASE)
-        if m:
-            actor = strip_the(m.group("actor"))
-            actor_lc = actor.lower()
-            is_you = actor_lc.startswith("you")
-            is_pet = actor_lc in PET_NAMES
-            if not (is_you or is_pet):
-                return None  # nur eigene Heals zählen
-
-            target = strip_the(m.group("target"))
-            if target.lower() in ("yourself", "you"):
-                target = "You"
-
-            amt = to_int(m.group("amt"))
-            rtype = (m.group("res1") or m.group("res2"))  # None wenn nur "points"
-            skill = "Heal"
-            return ("heal", amt, target, skill, rtype)
-
-        # B) "<skill> heals <target> for N <res_part>"  (nur "Your <skill>" zählt)
-        m = re.search(
-            rf"^(?P<skill>.+?)\s+heal(?:s|ed)?\s+(?P<target>.+?)\s+for\s+(?P<amt>[\d,]+)\s+{res_part}(?:\.\s*)?$",
-            t, re.IGNORECASE)
-        if m:
-            skill = m.group("skill").strip()
-            if not skill.lower().startswith("your "):
-                return None
-            skill = skill[5:].lstrip()
-
-            target = strip_the(m.group("target"))
-            if target.lower() in ("yourself", "you"):
-                target = "You"
-
-            amt = to_int(m.group("amt"))
-            rtype = (m.group("res1") or m.group("res2"))
-            return ("heal", amt, target, skill, rtype)
-
-        return None
-
-    def _parse_taken_line(self, line: str):
+    def _handle_event_batch(self, batch, path=None):
         """
-        Erkenne eingehenden Schaden.
-        Beispiele:
-        "The Downs Wildcat hits you with Melee Common Low for 45 points of Common damage to Morale"
-        "Goblin hits you for 12 points of Fire damage to Morale."
-        Rückgabe: ("taken", amount:int, attacker:str, skill:str, dtype:str|None) oder None
+        Wird im UI-Thread aufgerufen, um einen Block geparster Events
+        (EventBatch aus dem Tail-Thread) in die Aggregates seines Logs einzubauen.
+        Rückgabe: True = angezeigtes Log hat neue Events (Anzeige neu aufbauen).
         """
-        text = line.strip()
-        if not text:
-            return None
-        
-        
-        low = text.lower()
-
-        # --- Deutscher Client: "<Mob> trifft Euch mit der Fertigkeit '...'" ---
-        if "trifft euch" in low and "moral nimmt" in low:
-            # Beispiel:
-            # "Plündernder Bär trifft Euch mit der Fertigkeit 'Doppelter Schaden (Nahkampf)' und
-            #  Eure Moral nimmt 19 Punkte Schaden (allgemein)."
-            m = re.search(
-                r"(?P<attacker>.+?)\s+trifft\s+Euch\s+mit der Fertigkeit\s+'(?P<skill>[^']+)'\s+und\s+Eur\w*\s+Moral nimmt\s+(?P<amt>[\d\.]+)\s+Punkte Schaden\s+\((?P<dtype>[^)]+)\)\.",
-                text,
-                re.IGNORECASE,
-            )
-            if not m:
-                return None
-
-            attacker = m.group("attacker").strip()
-            raw_skill = m.group("skill").strip()
-            amt = int(re.sub(r"[^\d]", "", m.group("amt")))
-            dtype_raw = m.group("dtype").strip().lower()   # z.B. "allgemein", "schatten", "feuer"
-
-            # Damage-Type aus deutschem Typnamen mappen
-            if "allgemein" in dtype_raw:
-                dtype = "common"
-            elif "schatten" in dtype_raw:
-                dtype = "shadow"
-            elif "feuer" in dtype_raw:
-                dtype = "fire"
-            else:
-                dtype = "other"
+        if not batch:
+            return False
 
-            # Skill ggf. normalisieren (optional)
-            skill_lower = raw_skill.lower()
-            skill = raw_skill
-            if "schaden" in skill_lower:
-                skill = "Hit"
-
-            if DEBUG_PARSE:
-                print(f"[TAKEN-DE] attacker={attacker} skill={skill} amt={amt} dtype={dtype}")
-
-            return ("taken", amt, attacker, skill, dtype)
-        
-        
-
-        def strip_the(s: str) -> str:
-            s = s.strip()
-            return s[4:].lstrip() if s.lower().startswith("the ") else s
-
-        # Grundmuster: <actor> hits you [with <skill>] for N points [of <dtype>] damage to Morale
-        m = re.search(
-            r"^(?P<actor>.+?)\s+hits?\s+you(?:rself)?(?:\s+with\s+(?P<skill>.+?))?\s+for\s+(?P<amt>[\d,]+)\s+points?(?:\s+of\s+(?P<dtype>[A-Za-z]+))?\s+damage\s+to\s+Morale\.?$",
-            text, re.IGNORECASE)
-        if not m:
-            return None
-
-        actor = strip_the(m.group("actor"))
-        amt = int(re.sub(r"[^\d]", "", m.group("amt")))
-        skill = (m.group("skill") or "Hit").strip()
-        dtype = (m.group("dtype") or "").strip() or None
-
-        # Nur eingehenden Schaden, also Ziel = du; passt durch Regex (… hits you …)
-        return ("taken", amt, actor, skill, dtype)
-
-    def _handle_parsed_event(self, parsed):
-        """
-        Wird im UI-Thread aufgerufen, um ein geparstes Event
-        in die Aggregates einzubauen.
-        """
-        if not parsed:
-            return
-
-        now = time.time()
-        self._last_event_time = now
+        self._last_event_time = time.time()
 
         # Wenn der Parser „aus“ ist, ignorieren wir neue Events
         if not self.manual_running:
-            return
-
-        et = parsed[0]
-
-        if et == 'hit':
-            # neue Variante mit is_pet
-            if len(parsed) == 5:
-                _, val, target, skill, is_pet = parsed
-            else:
-                # Fallback für alte Tuples
-                _, val, target, skill = parsed
-                is_pet = False
-
-            self._on_hit(val, target, skill, is_pet)
-
-        elif et == 'heal':
-            if len(parsed) == 5:
-                _, val, target, skill, rtype = parsed
-            else:
-                _, val, target, skill = parsed
-                rtype = None
-            self._on_heal(val, target, skill, rtype)
-
-        elif et == 'taken':
-            if len(parsed) == 5:
-                _, val, attacker, skill, dtype = parsed
-            else:
-                _, val, attacker, skill = parsed
-                dtype = None
-            self._on_taken(val, attacker, skill, dtype)
-
+            return False
 
-    def _on_hit(self, dmg, enemy, skill, is_pet: bool = False):
-        if not self.manual_running: return
-        now = time.time()
-        if self.manual_waiting:
-            self.manual_waiting = False; self.manual_start_time = now
-        rel_t = (now - self.manual_start_time) if self.manual_start_time else 0.0
-        evt = {"time": rel_t, "dmg": dmg, "enemy": enemy, "skill": skill, "is_pet": bool(is_pet)}
-        self._append_evt('dps', evt)
-        # Anzeige auf **aktuellen** Modus mappen
-        self._refresh_view_from_mode()
-
-    def _on_heal(self, amount: int, target: str, skill: str, rtype: str | None):
-        if not self.manual_running:
-            return
-        now = time.time()
-        if self.manual_waiting:
-            self.manual_waiting = False
-            self.manual_start_time = now
+        # erstes Event eines Logs startet dessen Kampf; Zeiten relativ zum Lesezeitpunkt
+        key = path if self.settings.get("multi_log") else None
+        st = self._stream(key)
+        if st['start'] is None:
+            st['start'] = batch.time[0]
+        self.manual_waiting = False
+        st['combat'].add_batch(batch, st['start'])
 
-        rel_t = (now - self.manual_start_time) if self.manual_start_time else 0.0
+        if key != self._stream_key:
+            # angezeigtes Log noch leer -> zum Log mit Aktivität wechseln
+            if not self.combat.has_events():
+                self._select_stream(key)
+            return False
 
-        evt = {
-            "time": rel_t,
-            "dmg": amount,
-            "enemy": target,
-            "skill": skill,
-            "rtype": rtype or "Morale"   # <-- Default setzen
-        }
-        self._append_evt('hps', evt)
-        self._refresh_view_from_mode()
+        self.manual_start_time = st['start']
+        # Anzeige aktualisiert _drain_events einmal pro Tick
+        return True
 
-    def _on_taken(self, amount, attacker, skill, dtype):
-        if not self.manual_running: return
-        now = time.time()
-        if self.manual_waiting:
-            self.manual_waiting = False; self.manual_start_time = now
-        rel_t = (now - self.manual_start_time) if self.manual_start_time else 0.0
-        evt = {"time": rel_t, "dmg": amount, "enemy": attacker, "skill": skill}
-        if dtype: evt["dtype"] = dtype
-        if dtype: evt["max_skill_override"] = f"{skill} ({dtype})"
-        self._append_evt('dts', evt)
+    def _drain_events(self):
+        """
+        Baut Blöcke aus der Queue ein, bis DRAIN_BUDGET s verbraucht sind; der Rest
+        wartet auf den nächsten Tick. Läuft im Tick und sobald events_ready kommt.
+        Große Blöcke (Aufholen) werden in DRAIN_CHUNK Events geteilt, damit ein
+        Lag-Spike die UI nicht einfriert.
+        """
+        q = self._event_queue
+        t0 = time.perf_counter()
+        deadline = t0 + DRAIN_BUDGET
+        dirty = False
+        n = 0
+        while time.perf_counter() < deadline:
+            item = q.get_nowait()
+            if item is None:
+                break
+            gen, seq, path, batch, offset = item
+            # Rest eines geteilten Items wurde schon akzeptiert (nicht doppelt zählen)
+            if (gen, seq) != self._drain_partial and not self._ingest.accept(gen, seq):
+                continue
+            split = len(batch) > DRAIN_CHUNK
+            if split:
+                q.unget((gen, seq, path, batch.slice(DRAIN_CHUNK), offset), len(batch) - DRAIN_CHUNK)
+                batch = batch.slice(0, DRAIN_CHUNK)
+            self._drain_partial = (gen, seq) if split else None
+            dirty |= bool(self._handle_event_batch(batch, path))
+            n += len(batch)
+            if not split:
+                # Block ganz eingebaut: erst jetzt darf der Checkpoint dahinter stehen
+                self._ingest.consumed(path, offset)
+
+        if not len(q):
+            # Checkpoint nur bei leerer Queue schreiben (höchstens alle CHECKPOINT_INTERVAL s)
+            self._checkpoint.flush()
+        if dirty:
+            # Anzeige auf **aktuellen** Modus mappen (einmal pro Tick)
+            self._refresh_view_from_mode()
+        if len(q) and UI.debug_on:
+            st = q.stats()
+            UI.debug("drain budget used: %d events in %.1f ms, %d events left, oldest %.0f ms",
+                     n, (time.perf_counter() - t0) * 1000, st['depth_events'], st['oldest_ms'])
+
+    # --- several logs (one per client) ---
+    def _stream(self, key):
+        """Aggregates + Kampfbeginn eines Logs (key: Pfad, None = Einzel-Log)."""
+        st = self._streams.get(key)
+        if st is None:
+            label = f"Log {sum(1 for k in self._streams if k is not None) + 1}" if key else ""
+            st = self._streams[key] = {
+                'combat': CombatAggregator(self._entities),
+                'start': None,          # Zeit des ersten Events (je Log)
+                'label': label,
+            }
+        return st
+
+    def _select_stream(self, key):
+        """Zeigt die Aggregates eines Logs an."""
+        st = self._stream(key)
+        self._stream_key = key
+        self.combat = st['combat']
+        self.modes = self.combat.modes
+        self.manual_start_time = st['start']
+        if st['start'] is None:
+            self.combat_time = 0.0
+        self.selected_skill = None
+        self._rebuild_target_dropdown()
         self._refresh_view_from_mode()
+        self._rebuild_log_dropdown()
+
+    def _rebuild_log_dropdown(self):
+        """Log-Auswahl: nur sichtbar, wenn mehrere Logs verfolgt werden."""
+        multi = bool(self.settings.get("multi_log"))
+        if multi:
+            for path in self._ingest.paths:
+                self._stream(path)
+        keys = [k for k in self._streams if k is not None] if multi else []
+
+        self.LOG_DD.blockSignals(True)
+        self.LOG_DD.clear()
+        for key in keys:
+            st = self._streams[key]
+            self.LOG_DD.addItem(f"{st['label']}:  {os.path.basename(key)}", userData=key)
+        if self._stream_key in keys:
+            self.LOG_DD.setCurrentIndex(keys.index(self._stream_key))
+        self.LOG_DD.blockSignals(False)
+
+        shown = len(keys) > 1
+        if shown != self._log_dd_shown:
+            self._log_dd_shown = shown
+            self._update_layout()
+        if multi and keys and self._stream_key not in keys:
+            self._select_stream(keys[0])
+
+    def _on_log_selected(self, idx: int):
+        key = self.LOG_DD.currentData()
+        if key is not None and key != self._stream_key:
+            self._select_stream(key)
 
     
     def _toggle_startstop(self):
@@ -1508,7 +1272,11 @@ class OverlayWindow(QWidget):
             self.manual_waiting = True
             self.manual_start_time = None
 
-            # Alle Aggregates & Anzeige zurücksetzen
+            # Alle Aggregates (jedes Log) & Anzeige zurücksetzen
+            self._streams = {}
+            self.combat = self._stream(None)['combat']
+            self.modes = self.combat.modes
+            self._stream_key = None
             self._reset_all_modes()
 
             # UI: Start-Button aktiv stylen
@@ -1517,6 +1285,7 @@ class OverlayWindow(QWidget):
 
             # Tailer aktivieren
             self._ensure_log_thread()
+            self._rebuild_log_dropdown()
 
             # Target-Dropdown neu (nur "Total" oder aus aktuellem Mode)
 
@@ -1530,11 +1299,7 @@ class OverlayWindow(QWidget):
                 label = self._combat_dd_label_for_mode(it)
                 self.PST_FGHT_DD.addItem(label, userData=it['id'])
             self.PST_FGHT_DD.blockSignals(False)
-
-            # History-Handler nur EINMAL verbinden
-            if not getattr(self, "_history_signal_bound", False):
-                self.PST_FGHT_DD.currentIndexChanged.connect(self._on_select_combat_changed)
-                self._history_signal_bound = True
+            self._bind_history_signal()
 
             # UI sofort aktualisieren (alles 0)
             self._refresh_view_from_mode()
@@ -1548,72 +1313,62 @@ class OverlayWindow(QWidget):
 
             # Tailer im Manual-Mode beenden (spart IO). Du kannst ihn anlassen, wenn du willst.
             self._stop_log_thread()
+            # bewusst gestoppt: nach einem Neustart nicht nachlesen
+            self._checkpoint.clear()
 
             # Dropdown mit Zielen füllen
             self._rebuild_target_dropdown()
 
-            # Combat-Time finalisieren (unverändert okay)
-            any_events = any(self.modes[m]['events'] for m in ('dps','hps','dts'))
-
-            # --- Snapshot bauen, nur wenn es wirklich Events gab ---
-            if any_events:
-                start_ts = time.localtime(time.time())
-                ts_label = time.strftime("%Y-%m-%d %H:%M", start_ts)
-
-             
-                # Label: bevorzugt Gegner aus DPS, sonst Quellen aus DTS, sonst Targets aus HPS
-                def names_from(mode):
-                    ev = self.modes[mode]['events']
-                    return sorted({e['enemy'] for e in ev}) if ev else []
-
-                names = names_from('dps') or names_from('dts') or names_from('hps')
-                enemy_label = names[0] if len(names) == 1 else ("Multi" if names else "--")
-
-                # Dauer = max letztes Event über alle Modi
-                last_times = []
-                for key in ("dps", "dts"):
-                    mm = self.modes.get(key)
-                    if mm and mm['events']:
-                        last_times.append(mm['events'][-1]['time'])
-                if not last_times:
-                    # reiner Heal-Kampf: nimm irgendeinen Mode
-                    last_times = [mm['events'][-1]['time'] for mm in self.modes.values() if mm['events']]
-                duration_all = max(last_times) if last_times else 0.0
-
-                #label = f"{ts_label} | {enemy_label}"
-                base_label = enemy_label
-                time_label = time.strftime("%H:%M", start_ts)
-
-                def _mode_view(v):
-                    return {
-                        'events': list(v['events']),
-                        'total':  v['total'],
-                        'max':    v['max'],
-                        'max_skill': v['max_skill'],
-                    }
-
-                snap = {
-                    'id': self.fight_seq,
-                    'enemy_label': base_label,
-                    'time_label': time_label,
-                    'modes': { k: _mode_view(v) for k, v in self.modes.items() },
-                    'duration': duration_all,
-                }
-                snap['label'] =  f"{base_label} | {time_label}"
+            # --- Snapshot je Log bauen, nur wenn es wirklich Events gab ---
+            time_label = time.strftime("%H:%M", time.localtime(time.time()))
+            multi = sum(1 for st in self._streams.values() if st['combat'].has_events()) > 1
+            for st in self._streams.values():
+                if not st['combat'].has_events():
+                    continue
+                snap = self._fight_snapshot(st['combat'], time_label)
+                if multi:
+                    snap['stream'] = st['label']
+                self._add_history_entry(snap)
 
-                self.fight_seq += 1
-                self.fight_history.append(snap)
-                
                 # Timer nach Kampfende zurück auf "letztes relevantes Event"
-                self.combat_time = duration_all
-
-                # Dropdown: "current" bleibt Index 0; neuen Eintrag darunter einfügen.
-                self.PST_FGHT_DD.blockSignals(True)
-                label_for_mode = self._combat_dd_label_for_mode(snap)
-                self.PST_FGHT_DD.insertItem(1, label_for_mode, userData=snap['id'])
-                self.PST_FGHT_DD.blockSignals(False)
+                if st['combat'] is self.combat:
+                    self.combat_time = snap['duration']
 
             self.update()
+
+    def _fight_snapshot(self, combat, time_label):
+        """Snapshot-Dict für 'Select combat' aus einem CombatAggregator (vergibt die ID)."""
+        # Label: bevorzugt Gegner aus DPS, sonst Quellen aus DTS, sonst Targets aus HPS
+        names = (combat.target_names('dps')
+                 or combat.target_names('dts')
+                 or combat.target_names('hps'))
+        enemy_label = names[0] if len(names) == 1 else ("Multi" if names else "--")
+
+        snap = {
+            'id': self.fight_seq,
+            'enemy_label': enemy_label,
+            'time_label': time_label,
+            'modes': combat.snapshot(),
+            # Dauer = letztes Event (DPS/DTS, bei reinem Heal-Kampf HPS)
+            'duration': combat.fight_duration(),
+        }
+        snap['label'] = f"{enemy_label} | {time_label}"
+        self.fight_seq += 1
+        return snap
+
+    def _add_history_entry(self, snap):
+        self.fight_history.append(snap)
+        # Dropdown: "current" bleibt Index 0; neuen Eintrag darunter einfügen.
+        self.PST_FGHT_DD.blockSignals(True)
+        self.PST_FGHT_DD.insertItem(1, self._combat_dd_label_for_mode(snap), userData=snap['id'])
+        self.PST_FGHT_DD.blockSignals(False)
+        self._bind_history_signal()
+
+    def _bind_history_signal(self):
+        # History-Handler nur EINMAL verbinden
+        if not getattr(self, "_history_signal_bound", False):
+            self.PST_FGHT_DD.currentIndexChanged.connect(self._on_select_combat_changed)
+            self._history_signal_bound = True
        
     
     def _on_manual_selection(self):
@@ -1641,26 +1396,10 @@ class OverlayWindow(QWidget):
             return
 
         # --- HIER: Snapshot -> per-Mode-States laden ---
-        if 'modes' in item:
-            m = item['modes']
-            for k in ('dps','hps','dts'):
-                self.modes[k]['events'] = list(m[k]['events'])
-                self.modes[k]['total'] = m[k]['total']
-                self.modes[k]['max'] = m[k]['max']
-                self.modes[k]['max_skill'] = m[k]['max_skill']
-            # Dauer: letztes Event über alle Modi
-            last_times = [mm['events'][-1]['time'] for mm in self.modes.values() if mm['events']]
-            self.combat_time = max(last_times) if last_times else 0.0
-        else:
-            # Fallback für alte Snaps
-            evts = item['events']
-            agg = self.modes[self.stat_mode]
-            agg['events'] = list(evts)
-            agg['total']  = sum(e['dmg'] for e in evts)
-            mx = max(evts, key=lambda e: e['dmg']) if evts else None
-            agg['max'] = mx['dmg'] if mx else 0
-            agg['max_skill'] = mx['skill'] if mx else '--'
-            self.combat_time = evts[-1]['time'] if evts else 0.0
+        self.combat.load_snapshot(item['modes'])
+        # Dauer: letztes Event über alle Modi
+        last_times = [mm['events'].last_time for mm in self.modes.values() if mm['events']]
+        self.combat_time = max(last_times) if last_times else 0.0
 
         self.sel_target = None
         self._rebuild_target_dropdown()
@@ -1668,41 +1407,27 @@ class OverlayWindow(QWidget):
    
     # --- runtime ticker ---
     def _tick(self):
-        # 1) Events aus dem Log-Thread holen (thread-safe über Queue)
+        # 1) abgestürzte Reader mit Back-off neu starten; im Prozess-Modus Ring -> Queue
+        self._ingest.poll()
+        # Events aus dem Log-Thread holen (thread-safe über Queue, mit Zeitbudget)
         if hasattr(self, "_event_queue"):
-            import queue as _qmod
-            while True:
-                try:
-                    parsed = self._event_queue.get_nowait()
-                except _qmod.Empty:
-                    break
-                self._handle_parsed_event(parsed)
+            self._drain_events()
 
         now = time.time()
 
+        # 1b) Fortschritt / Ergebnis eines laufenden Backfills
+        if self._backfill is not None:
+            self._poll_backfill()
+
         # 2) Combat-Log-Überwachung (neue Datei / File entsteht erst später)
         if self.manual_running:
             last_check = getattr(self, "_last_log_check", 0.0)
             if now - last_check >= LOG_CHECK_INTERVAL:
                 self._last_log_check = now
 
-                # Wenn ein Thread läuft, prüfen wir auf Log-Rotation
-                if self._tail_thread and self._tail_thread.is_alive():
-                    latest = get_latest_combat_log()
-                    if (
-                        latest
-                        and self._current_log_path
-                        and os.path.normcase(latest) != os.path.normcase(self._current_log_path)
-                    ):
-                        if DEBUG_PARSE:
-                            print(f"[LOG] switching to new combat log: {latest}")
-                        self._stop_log_thread()
-                        self._tail_thread = None
-                        self._current_log_path = None
-
-                # Sicherstellen, dass ein Tail-Thread läuft
-                if (self._tail_thread is None) or (not self._tail_thread.is_alive()):
-                    self._ensure_log_thread()
+                # Sicherstellen, dass ein Tail-Reader für die aktuellen Logs läuft
+                # (Log-Rotation, weitere Clients)
+                self._ensure_log_thread()
 
             # 2a) Live-Timer: solange der Kampf läuft, Zeit seit Start anzeigen
             if not self.manual_waiting and self.manual_start_time is not None:
@@ -1735,8 +1460,7 @@ class OverlayWindow(QWidget):
             and getattr(self, "_last_event_time", None)
             and now - self._last_event_time >= AUTO_STOP_SECONDS
         ):
-            if DEBUG_PARSE:
-                print(f"[AUTO] segment combat after {AUTO_STOP_SECONDS}s of inactivity")
+            UI.info("segment combat after %ss of inactivity", AUTO_STOP_SECONDS)
 
             # 1) aktuellen Kampf beenden (Snapshot anlegen etc.)
             self._toggle_startstop()
@@ -1744,8 +1468,12 @@ class OverlayWindow(QWidget):
             # 2) sofort neue Session starten (leerer Kampf, aber Parser bleibt „armed“)
             self._toggle_startstop()
 
-        # 4) Repaint
-        self.update()
+        # 4) Repaint nur, wenn sich etwas Sichtbares geändert hat (Events, Auswahl, Live-Uhr);
+        #    ein ruhendes Overlay malt so gar nicht neu
+        state = self._view_key() + (round(self.combat_time, 1), self._is_live_fight())
+        if state != self._tick_state:
+            self._tick_state = state
+            self.update()
             
     # --- overwrite mouse wheel function for table scrolling
     
@@ -1774,10 +1502,7 @@ class OverlayWindow(QWidget):
     def _copy_to_clipboard(self):
         # ---- Events je nach Code-Stand holen ----
 
-        evts = list(self._agg()['events'])
         sel = getattr(self, "sel_target", None)
-        if sel:
-            evts = [e for e in evts if e['enemy'] == sel]
         target_total_label = (
             "all allies" if self.stat_mode == 'hps'
             else "all sources" if self.stat_mode == 'dts'
@@ -1785,13 +1510,8 @@ class OverlayWindow(QWidget):
         )
         selected_label = sel or target_total_label
         
-        # Dauer
-        if not evts:
-            duration = 0.0
-        else:
-            duration = (evts[-1]['time'] - evts[0]['time']) if sel and len(evts) > 1 else evts[-1]['time']
-
-        total = sum(e['dmg'] for e in evts)
+        # Summe + Dauer (bei Ziel: erstes bis letztes Event)
+        total, duration, _, _ = self.combat.target_view(self.stat_mode, sel)
         rate  = int(total / (duration or 1))
 
         # ---- Nachricht pro Modus ----
@@ -1800,11 +1520,8 @@ class OverlayWindow(QWidget):
             base_target = selected_label if 'selected_label' in locals() else (
                 ("all allies" if self.manual_combo.currentText() == "Total" else self.manual_combo.currentText())
             )
-            # Breakdown nach Ressource
-            type_totals = {}
-            for e in evts:
-                rt = e.get('rtype') or "Morale"  # default Morale, falls nicht geloggt
-                type_totals[rt] = type_totals.get(rt, 0) + e['dmg']
+            # Breakdown nach Ressource (default Morale, falls nicht geloggt)
+            type_totals = self.combat.type_totals('hps', sel)
 
             parts = []
             for rt, amt in sorted(type_totals.items(), key=lambda kv: kv[1], reverse=True):
@@ -1820,10 +1537,7 @@ class OverlayWindow(QWidget):
 
         elif self.stat_mode == 'dts':
             # Breakdown nach dtype
-            type_totals = {}
-            for e in evts:
-                dt = e.get('dtype') or "Unknown"
-                type_totals[dt] = type_totals.get(dt, 0) + e['dmg']
+            type_totals = self.combat.type_totals('dts', sel)
 
             # sortiert nach Menge absteigend
             parts = []
@@ -1854,199 +1568,49 @@ class OverlayWindow(QWidget):
             return "All targets"
 
     
-    def _build_skill_stats(self):
-        """
-        Aggregiert Events des aktuellen Modus in tabellenfähige Zeilen.
-
-        DPS / DTPS:
-            - Gruppierung nach Skill
-            - Felder: skill, hits, total, avg, min, max
-            - DTPS zusätzlich: by_dtype = {'common': ..., 'shadow': ..., 'fire': ..., 'other': ...}
+    # --- view cache: results stay valid until combat.version (events, reset, snapshot) moves ---
+    def _view_key(self):
+        return (self.combat, self.combat.version, self.stat_mode, self.sel_target, self.selected_skill)
+
+    def _cached_view(self, part, build, *extra):
+        """Ergebnis von build() für den aktuellen View-Schlüssel (+ extra), sonst neu berechnen."""
+        key = self._view_key() + extra
+        hit = self._view_cache.get(part)
+        if hit is not None and hit[0] == key:
+            return hit[1]
+        value = build()
+        self._view_cache[part] = (key, value)
+        return value
 
-        HPS:
-            - Gruppierung nach (ally, rtype)  (ally = Ziel, rtype = 'morale' / 'power')
-            - Felder: skill (Label), ally, rtype, hits, total, avg, min, max
-        """
-        evts = self._agg()['events']
-        
-        if self.sel_target:
-            evts = [e for e in evts if e['enemy'] == self.sel_target]
-        
-        
-        if not evts:
-            return []
-
-        mode = self.stat_mode
-
-        # --- HPS: nach Ally + Ressourcentyp gruppieren ---
-        if mode == 'hps':
-            by_row = {}  # key: (ally, rtype)
-            for e in evts:
-                ally = e.get('enemy') or "Unknown"
-                r_raw = (e.get('rtype') or "").lower()
-                rtype = 'power' if 'power' in r_raw else 'morale'
-
-                key = (ally, rtype)
-                d = by_row.setdefault(key, {
-                    'ally': ally,
-                    'rtype': rtype,
-                    'hits': 0,
-                    'total': 0,
-                    'vals': [],
-                })
-
-                dmg = e['dmg']
-                d['hits'] += 1
-                d['total'] += dmg
-                d['vals'].append(dmg)
-
-            stats = []
-            for (ally, rtype), d in by_row.items():
-                vals = d['vals']
-                hits = d['hits']
-                total = d['total']
-                avg = total / hits if hits else 0.0
-                s_min = min(vals) if vals else None
-                s_max = max(vals) if vals else None
-
-                label = f"{ally} ({'Power' if rtype == 'power' else 'Heal'})"
-
-                stats.append({
-                    'skill': label,
-                    'ally': ally,
-                    'rtype': rtype,
-                    'hits': hits,
-                    'total': total,
-                    'avg': avg,
-                    'min': s_min,
-                    'max': s_max,
-                })
-
-            stats.sort(key=lambda s: s['total'], reverse=True)
-            return stats
-
-        # --- DPS / DTPS: nach Skill gruppieren ---
-        by_skill = {}
-        for e in evts:
-            sname = e['skill']
-
-            key = sname
-            dtype_key = None
-
-            if mode == 'dts':
-                dtype_raw = (e.get('dtype') or "").lower()
-                dtype_key = 'other'
-                if 'common' in dtype_raw or 'allgemein' in dtype_raw:
-                    dtype_key = 'common'
-                elif 'shadow' in dtype_raw or 'schatten' in dtype_raw:
-                    dtype_key = 'shadow'
-                elif 'fire' in dtype_raw or 'feuer' in dtype_raw:
-                    dtype_key = 'fire'
-
-                # Speziell: "Hit" nach Schadenstyp splitten
-                if sname == "Hit":
-                    key = (sname, dtype_key)
-
-            d = by_skill.setdefault(key, {
-                'hits': 0,
-                'total': 0,
-                'vals': [],
-                'by_dtype': {},
-            })
-
-            dmg = e['dmg']
-            d['hits'] += 1
-            d['total'] += dmg
-            d['vals'].append(dmg)
-
-            if mode == 'dts' and dtype_key is not None:
-                bymap = d.setdefault('by_dtype', {})
-                bymap[dtype_key] = bymap.get(dtype_key, 0) + dmg
-
-        stats = []
-        for key, d in by_skill.items():
-            vals = d['vals']
-            hits = d['hits']
-            total = d['total']
-            avg = total / hits if hits else 0.0
-            s_min = min(vals) if vals else None
-            s_max = max(vals) if vals else None
-
-            sname = key
-            dtype_for_label = None
-            if mode == 'dts' and isinstance(key, tuple):
-                sname, dtype_for_label = key
-
-            # Anzeigename
-            display_name = sname
-            if mode == 'dts' and sname == "Hit":
-                base = "Standard attack"
-                if dtype_for_label:
-                    type_label = {
-                        'common': "Common",
-                        'shadow': "Shadow",
-                        'fire':   "Fire",
-                        'other':  "Other",
-                    }.get(dtype_for_label, dtype_for_label.title())
-                    display_name = f"{base} ({type_label})"
-                else:
-                    display_name = base
+    def _build_skill_stats(self):
+        """Tabellenzeilen für aktuellen Modus + Ziel (siehe CombatAggregator.skill_stats)."""
+        return self._cached_view(
+            'table', lambda: self.combat.skill_stats(self.stat_mode, self.sel_target))
 
-            entry = {
-                'skill': display_name,
+    def _compute_skill_details(self, skill_name: str):
+        """Detaildaten für eine Zeile aus _build_skill_stats() oder None."""
+        return self._cached_view(
+            'details', lambda: self.combat.skill_details(self.stat_mode, skill_name, self.sel_target),
+            skill_name)
+
+    def _view_summary(self):
+        """Summary-Zeile + Balken-Maßstab aus den Tabellenzeilen."""
+        def build():
+            stats = self._build_skill_stats()
+            # DoT hits will not count into summary hitcounter ...
+            hits = sum(s['hits'] for s in stats if s['skill'] != "DoT damage")
+            total = sum(s['total'] for s in stats)  # ... whereas total damage includes dot damage
+            mins = [s['min'] for s in stats if s.get('min') is not None]
+            maxs = [s['max'] for s in stats if s.get('max') is not None]
+            return {
                 'hits': hits,
                 'total': total,
-                'avg': avg,
-                'min': s_min,
-                'max': s_max,
-            }
-
-            if mode == 'dts':
-                entry['by_dtype'] = d.get('by_dtype', {})
-
-            stats.append(entry)
-
-        stats.sort(key=lambda s: s['total'], reverse=True)
-        return stats
-
-    def _compute_skill_details(self, skill_name: str):
-        """
-        Liefert Detaildaten für eine Zeile aus _build_skill_stats()
-        Rückgabe: dict oder None
-            {
-                'skill': ...,
-                'hits': ...,
-                'min': ...,
-                'max': ...,
-                'avg': ...,
-                'total': ...,
+                'avg': (total / hits) if hits else 0.0,
+                'min': min(mins) if mins else None,
+                'max': max(maxs) if maxs else None,
+                'max_val': (max(s['total'] for s in stats) or 1) if stats else 1,
             }
-        """
-        stats = self._build_skill_stats()
-        if not stats:
-            return None
-
-        row = None
-        for s in stats:
-            if s['skill'] == skill_name:
-                row = s
-                break
-
-        if not row:
-            return None
-
-        hits = row['hits']
-        avg = row['avg']
-        total = row['total']
-
-        return {
-            'skill': row['skill'],
-            'hits': hits,
-            'min': row['min'],
-            'max': row['max'],
-            'avg': avg,
-            'total': total,
-        }
+        return self._cached_view('summary', build)
 
 
     def _auto_adjust_height(self):
@@ -2054,6 +1618,8 @@ class OverlayWindow(QWidget):
         stats = self._build_skill_stats()
         row_h = 22
         header_rows = 2      # Spaltenkopf + Summary
+        if self.selected_skill:
+            header_rows += 1     # Quantil-/Histogrammzeile im Detailbereich
         visible_rows = max(1, len(stats)) + header_rows
 
         needed = self._table_top_y + visible_rows * row_h \
@@ -2064,6 +1630,20 @@ class OverlayWindow(QWidget):
             self.resize(self.width(), new_h)
 
     def _rebuild_target_dropdown(self):
+        items = self._cached_view('dropdown', self._target_dropdown_items)
+
+        self.manual_combo.blockSignals(True)
+        self.manual_combo.clear()
+        # Eintrag 0 = All
+        for txt, data in items:
+            self.manual_combo.addItem(txt, userData=data)
+
+        self.manual_combo.setCurrentIndex(0)
+        self.manual_combo.blockSignals(False)
+        self.sel_target = None
+
+    def _target_dropdown_items(self):
+        """Einträge (Label, Ziel) für das Ziel-Dropdown; Eintrag 0 = All."""
         agg = self._agg()
         evts = agg['events']
 
@@ -2079,71 +1659,44 @@ class OverlayWindow(QWidget):
         # --- All targets ---
         if evts:
             # Dauer für "All" = bis letztes Event dieses Modes
-            dur_all = evts[-1]['time']
+            dur_all = evts.last_time
             rate_all = int(agg['total'] / (dur_all or 1)) if dur_all else 0
             all_label = f"{base}   ({rate_all} {metric_short})"
         else:
             all_label = base
+        items = [(all_label, None)]
 
-        # --- pro Target gruppieren ---
-        by_enemy = {}
-        for e in evts:
-            by_enemy.setdefault(e['enemy'], []).append(e)
-
-        self.manual_combo.blockSignals(True)
-        self.manual_combo.clear()
-        # Eintrag 0 = All
-        self.manual_combo.addItem(all_label, userData=None)
-
-        for enemy in sorted(by_enemy.keys()):
-            lst = by_enemy[enemy]
-            total = sum(x['dmg'] for x in lst)
-            if len(lst) > 1:
-                dur = lst[-1]['time'] - lst[0]['time']
-            else:
-                dur = lst[-1]['time']
+        # --- pro Target ---
+        for enemy, total, dur in self.combat.target_summaries(self.stat_mode):
             rate = int(total / (dur or 1)) if dur else 0
-            txt = f"{enemy}   ({rate} {metric_short})"
-            self.manual_combo.addItem(txt, userData=enemy)
-
-        self.manual_combo.setCurrentIndex(0)
-        self.manual_combo.blockSignals(False)
-        self.sel_target = None
+            items.append((f"{enemy}   ({rate} {metric_short})", enemy))
+        return items
 
     def _refresh_view_from_mode(self):
-        agg = self._agg()
-        evts = agg['events']
-        if self.sel_target:  # „per Target“ Ansicht
-            flt = [e for e in evts if e['enemy'] == self.sel_target]
-            total = sum(e['dmg'] for e in flt)
-            dur = (flt[-1]['time'] - flt[0]['time']) if len(flt) > 1 else (flt[-1]['time'] if flt else 0.0)
-            mx_e = max(flt, key=lambda e: e['dmg']) if flt else None
-        else:                # „Total“
-            total = agg['total']
-            # Dauer = bis letztes Event in diesem Mode (nicht global)
-            dur = evts[-1]['time'] if evts else 0.0
-            mx_e = None
-            
+        # „per Target“ oder „Total“ (Dauer = bis letztes Event in diesem Mode)
+        _, dur, self.max_hit, self.max_hit_skill = self.combat.target_view(
+            self.stat_mode, self.sel_target)
+
         # Timer nur überschreiben, wenn der Kampf NICHT gerade live läuft.
         if not self.manual_running:
             self.combat_time = dur
-        if mx_e:
-            self.max_hit = mx_e['dmg']; 
-            self.max_hit_skill = mx_e.get('max_skill_override', mx_e['skill'])
-        else:
-            self.max_hit = agg['max']; 
-            self.max_hit_skill = agg['max_skill']
         # Pulse-Referenz aus Mode-Recent spiegeln
         self._auto_adjust_height()
         self.update()
 
+    def _is_live_fight(self) -> bool:
+        """True = laufender Kampf wird angezeigt (nicht wartend, kein History-Eintrag)."""
+        return (self.manual_running and not self.manual_waiting
+                and self.manual_start_time is not None
+                and self.PST_FGHT_DD.currentIndex() == 0)
+
+    def _live_rates(self):
+        """Gleitende Raten für Modus + Ziel (Uhr läuft im Live-Kampf weiter) oder None."""
+        now = self.combat_time if self._is_live_fight() else None
+        return self.combat.live_rates(self.stat_mode, self.sel_target, now, spark=LIVE_SPARK_SECONDS)
+
     def _append_evt(self, mode, evt):
-        agg = self.modes[mode]
-        agg['events'].append(evt)
-        agg['total'] += evt['dmg']
-        if evt['dmg'] > agg['max']:
-            agg['max'] = evt['dmg']
-            agg['max_skill'] = evt.get('max_skill_override', evt['skill'])
+        self.combat.append(mode, evt)
 
     def _metric_short(self, mode=None):
         """
@@ -2166,20 +1719,23 @@ class OverlayWindow(QWidget):
 
         # z.B. "Common Forest-boar (09:30)   245 DPS"
         left = f"{enemy}"
+        if snap.get('stream'):
+            # mehrere Clients: aus welchem Log
+            left = f"{snap['stream']}: {enemy}"
         middle = f"({time_s})" if time_s else ""
         right = f"{rate} {metric_short}" if total else ""
 
+        # Backfill: Log ohne Zeitstempel -> keine Rate, Summe anzeigen
+        if total and not dur:
+            right = f"{total:,}"
+
         # wir machen es einfach in einer Zeile, leicht „LotRO-Style“
         parts = [p for p in (left, middle, right) if p]
         return "  ".join(parts)
     
     def _reset_all_modes(self):
-        if hasattr(self, "modes"):
-            for k in ('dps', 'hps', 'dts'):
-                self.modes[k]['events'].clear()
-                self.modes[k]['total'] = 0
-                self.modes[k]['max'] = 0
-                self.modes[k]['max_skill'] = '--'
+        if hasattr(self, "combat"):
+            self.combat.reset()
         # Anzeige-/Laufzeit-Reset
         self.max_hit = 0
         self.max_hit_skill = '--'
@@ -2196,6 +1752,15 @@ class OverlayWindow(QWidget):
         menu = QMenu(self)
         act_folder = menu.addAction("Combat log folder…")
         act_pets = menu.addAction("Custom pet names…")
+        act_backfill = menu.addAction("Load combat log…")
+        act_backfill.setEnabled(self._backfill is None)
+        act_multi = menu.addAction("Follow all active logs (several clients)")
+        act_multi.setCheckable(True)
+        act_multi.setChecked(bool(self.settings.get("multi_log")))
+        act_process = menu.addAction("Parse in separate process")
+        act_process.setCheckable(True)
+        act_process.setChecked(bool(self.settings.get("parse_process")))
+        log_actions = self._add_debug_log_menu(menu.addMenu("Debug log"))
 
         pos = self.settings_btn.mapToGlobal(self.settings_btn.rect().bottomRight())
         action = menu.exec_(pos)
@@ -2204,7 +1769,129 @@ class OverlayWindow(QWidget):
             self._change_log_folder()
         elif action == act_pets:
             self._edit_custom_pet_names()
+        elif action == act_backfill:
+            self._start_backfill()
+        elif action == act_multi:
+            self._toggle_multi_log()
+        elif action == act_process:
+            self._toggle_parse_process()
+        elif action in log_actions:
+            self._change_debug_log(*log_actions[action])
+
+    def _toggle_multi_log(self):
+        self.settings["multi_log"] = not self.settings.get("multi_log")
+        self._save_settings(self.settings)
+        CFG.info("multi_log: %s", self.settings["multi_log"])
+        if self.manual_running:
+            # laufenden Kampf abschließen, neu starten mit den neuen Logs
+            self._toggle_startstop()
+            self._toggle_startstop()
+        else:
+            self._rebuild_log_dropdown()
+
+    def _toggle_parse_process(self):
+        self.settings["parse_process"] = not self.settings.get("parse_process")
+        self._save_settings(self.settings)
+        CFG.info("parse_process: %s", self.settings["parse_process"])
+        # laufender Reader wird am aktuellen Offset im anderen Modus ersetzt
+        self._ingest.set_mode(MODE_PROCESS if self.settings["parse_process"] else MODE_THREAD)
+
+    def _add_debug_log_menu(self, sub):
+        """Level / Kategorien / Datei-Ausgabe; Rückgabe: {QAction: (key, value)}"""
+        actions = {}
+        level = self.settings.get("log_level", debuglog.DEFAULT_LEVEL)
+        for name in debuglog.LEVELS:
+            act = sub.addAction(name.capitalize())
+            act.setCheckable(True)
+            act.setChecked(name == level)
+            actions[act] = ("log_level", name)
+
+        sub.addSeparator()
+        active = self.settings.get("log_categories", debuglog.CATEGORIES)
+        for cat in debuglog.CATEGORIES:
+            act = sub.addAction(f"Category: {cat}")
+            act.setCheckable(True)
+            act.setChecked(cat in active)
+            actions[act] = ("log_categories", cat)
+
+        sub.addSeparator()
+        act = sub.addAction("Write to log file")
+        act.setCheckable(True)
+        act.setChecked(bool(self.settings.get("log_to_file")))
+        actions[act] = ("log_to_file", None)
+        return actions
+
+    def _change_debug_log(self, key, value):
+        if key == "log_categories":
+            cats = list(self.settings.get("log_categories", debuglog.CATEGORIES))
+            if value in cats:
+                cats.remove(value)
+            else:
+                cats.append(value)
+            self.settings[key] = [c for c in debuglog.CATEGORIES if c in cats]
+        elif key == "log_to_file":
+            self.settings[key] = not self.settings.get(key)
+        else:
+            self.settings[key] = value
+
+        apply_log_settings(self.settings)
+        self._save_settings(self.settings)
+        CFG.info("debug log: level=%s categories=%s file=%s", self.settings["log_level"],
+                 self.settings["log_categories"], self.settings["log_to_file"])
     
+    # --- backfill: existing combat log -> "Select combat" ---
+    def _start_backfill(self, path=None):
+        if self._backfill is not None:
+            return
+        if path is None:
+            start = get_latest_combat_log(config.CMBT_LOG_DIR) or config.CMBT_LOG_DIR
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Load combat log", start, "Combat logs (*.txt);;All files (*)")
+            if not path:
+                return
+
+        bf = Backfill(path, self._entities)
+        self._backfill = bf
+        self._backfill_result = None
+
+        dlg = QProgressDialog(f"Parsing {os.path.basename(path)} …", "Cancel", 0, 1000, self)
+        dlg.setWindowTitle("Load combat log")
+        dlg.setMinimumDuration(300)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.canceled.connect(bf.cancel)
+        self._backfill_dialog = dlg
+
+        def _run():
+            try:
+                self._backfill_result = bf.run()
+            except Exception as e:
+                TAIL.error("backfill failed: %r", e)
+                self._backfill_result = []
+
+        import threading
+        threading.Thread(target=_run, daemon=True).start()
+
+    def _poll_backfill(self):
+        bf = self._backfill
+        self._backfill_dialog.setValue(int(bf.fraction * 1000))
+        fights = self._backfill_result
+        if fights is None:
+            return
+
+        self._backfill = None
+        self._backfill_result = None
+        self._backfill_dialog.close()
+        self._backfill_dialog = None
+
+        # älteste zuerst einfügen -> neuester Kampf steht oben
+        first = bf.fights_seen - len(fights) + 1
+        for n, combat in enumerate(fights, first):
+            self._add_history_entry(self._fight_snapshot(combat, f"log #{n}"))
+        st = bf.stats()
+        UI.info("backfill: %d of %d fights loaded, %.1f MB in %.2fs (%.1f MB/s)",
+                len(fights), st['fights'], st['bytes'] / 1e6, st['seconds'], st['mb_per_s'])
+
     def _change_log_folder(self):
         start_dir = self.settings.get("cmbt_log_dir") or config.CMBT_LOG_DIR
 
@@ -2222,11 +1909,9 @@ class OverlayWindow(QWidget):
         self.settings["cmbt_log_dir"] = folder_norm
         self._save_settings(self.settings)
 
-        if DEBUG_PARSE:
-            print("[CFG] CMBT_LOG_DIR updated to:", config.CMBT_LOG_DIR)
+        CFG.info("CMBT_LOG_DIR updated to: %s", config.CMBT_LOG_DIR)
 
         self._stop_log_thread()
-        self._current_log_path = None
         self._ensure_log_thread()
 
         QMessageBox.information(
@@ -2260,13 +1945,13 @@ class OverlayWindow(QWidget):
             # Intern lowercase
             lowered = [n.lower() for n in names]
             PET_NAMES[:] = lowered
+            self._ingest.clear_caches()
 
             # Persistieren
             self.settings["pet_names"] = list(lowered)
             self._save_settings(self.settings)
 
-            if DEBUG_PARSE:
-                print("[CFG] PET_NAMES updated:", PET_NAMES)
+            CFG.info("PET_NAMES updated: %s", PET_NAMES)
 
             QMessageBox.information(self, "Pet names", "Pet names updated and saved.")
     
@@ -2363,13 +2048,13 @@ class OverlayWindow(QWidget):
             n for n in custom if n not in default_set
         ]
         PET_NAMES[:] = combined
+        self._ingest.clear_caches()
 
         # In Settings speichern (nur Custom!)
         self.settings["custom_pet_names"] = list(custom)
         self._save_settings(self.settings)
 
-        if DEBUG_PARSE:
-            print("[CFG] PET_NAMES (defaults+custom):", PET_NAMES)   
+        CFG.info("PET_NAMES (defaults+custom): %s", PET_NAMES)
 
     def _adjust_fonts_for_dpi(self):
         """Sorgt dafür, dass Fonts auf High-DPI-Systemen nicht „riesig“ werden."""
@@ -2394,8 +2079,7 @@ class OverlayWindow(QWidget):
             if ps > 0:
                 f.setPointSizeF(ps / scale)
 
-        if DEBUG_PARSE:
-            print(f"[DPI] logical DPI = {dpi}, scale={scale:.2f} -> fonts scaled down")
+        UI.info("logical DPI = %s, scale=%.2f -> fonts scaled down", dpi, scale)
 
 
     
@@ -2471,9 +2155,17 @@ class OverlayWindow(QWidget):
         self._drag_start = None; super().mouseReleaseEvent(e)
 
     def closeEvent(self, event):
-        # Log-Tailer korrekt stoppen, damit kein Thread überlebt
-        if hasattr(self, "_stop_log_thread"):
+        # Timer zuerst: _tick würde sonst gleich wieder einen Reader starten
+        if hasattr(self, "_ui_timer"):
+            self._ui_timer.stop()
+        # Log-Tailer korrekt stoppen, damit kein Thread überlebt (stop() wartet kurz auf ihn)
+        if hasattr(self, "_ingest"):
             self._stop_log_thread()
+        if getattr(self, "_backfill", None) is not None:
+            self._backfill.cancel()
+        # letzte eingebaute Tail-Position sichern (nicht Eingebautes in der Queue wird beim Resume neu gelesen)
+        if hasattr(self, "_checkpoint"):
+            self._checkpoint.flush(force=True)
 
         super().closeEvent(event)
         
@@ -2494,6 +2186,8 @@ class OverlayWindow(QWidget):
 ###############################################################################    
 
 if __name__ == "__main__":
+    # Worker-Prozesse (Bulk-Import, parse_process) in der PyInstaller-exe
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     ov = OverlayWindow()
     ov.show(); sys.exit(app.exec_())
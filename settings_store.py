@@ -2,6 +2,8 @@ import os
 import sys
 import json
 import config
+from combatlog import debuglog
+from combatlog.debuglog import CFG
 
 
 def _get_app_dir() -> str:
@@ -14,10 +16,17 @@ def _get_app_dir() -> str:
 
 
 SETTINGS_FILE = os.path.join(_get_app_dir(), "settings.json")
+DEBUG_LOG_FILE = os.path.join(_get_app_dir(), "eoa_dps_parser.log")
+CHECKPOINT_FILE = os.path.join(_get_app_dir(), "tail_checkpoint.json")
 
 DEFAULT_SETTINGS = {
     "cmbt_log_dir": config.CMBT_LOG_DIR,
     "custom_pet_names": [],  # nur nicht-default-Namen
+    "multi_log": False,      # alle aktiven Logs verfolgen (mehrere Clients)
+    "parse_process": False,  # Parsen in eigenem Prozess (Shared-Memory-Ring)
+    "log_level": debuglog.DEFAULT_LEVEL,              # off / error / warning / info / debug
+    "log_categories": list(debuglog.CATEGORIES),      # parse / tail / ui / cfg
+    "log_to_file": False,                             # True: DEBUG_LOG_FILE statt stdout
 }
 
 
@@ -29,8 +38,7 @@ def load_settings() -> dict:
     except FileNotFoundError:
         pass
     except Exception as e:
-        if getattr(config, "DEBUG_PARSE", False):
-            print("[CFG] Failed to load settings.json:", e)
+        CFG.warning("failed to load settings.json: %s", e)
 
     merged = DEFAULT_SETTINGS.copy()
     for k, v in data.items():
@@ -56,9 +64,28 @@ def load_settings() -> dict:
 
     # den bereinigten Stand zurück in die Settings spiegeln
     merged["custom_pet_names"] = custom_lower
+
+    apply_log_settings(merged)
     return merged
 
 
+def apply_log_settings(settings: dict) -> None:
+    """Überträgt log_level / log_categories / log_to_file auf combatlog.debuglog."""
+    level = settings.get("log_level")
+    if level not in debuglog.LEVELS:
+        level = settings["log_level"] = debuglog.DEFAULT_LEVEL
+    try:
+        debuglog.configure(
+            level=level,
+            categories=settings.get("log_categories", debuglog.CATEGORIES),
+            path=DEBUG_LOG_FILE if settings.get("log_to_file") else None,
+        )
+    except OSError as e:
+        # Log-Datei nicht schreibbar -> stdout
+        debuglog.configure(level=level, categories=settings.get("log_categories", debuglog.CATEGORIES))
+        CFG.warning("cannot write %s: %s", DEBUG_LOG_FILE, e)
+
+
 def save_settings(settings: dict) -> None:
     out = {}
     for k in DEFAULT_SETTINGS.keys():
@@ -68,8 +95,6 @@ def save_settings(settings: dict) -> None:
     try:
         with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
             json.dump(out, f, ensure_ascii=False, indent=2)
-        if getattr(config, "DEBUG_PARSE", False):
-            print(f"[CFG] Saved settings.json to {SETTINGS_FILE}")
+        CFG.info("saved settings.json to %s", SETTINGS_FILE)
     except Exception as e:
-        if getattr(config, "DEBUG_PARSE", False):
-            print("[CFG] Failed to save settings.json:", e)
\ No newline at end of file
+        CFG.warning("failed to save settings.json: %s", e)
\ No newline at end of file
@@ -0,0 +1,26 @@
+from PyQt5.QtGui import QColor, QFont
+
+# Fonts
+FONT_TITLE        = QFont('Arial', 12, QFont.Bold)
+FONT_SUBTITLE     = QFont('Arial', 12, QFont.Bold)
+FONT_BTN_TEXT     = QFont('Arial', 12, QFont.Bold)
+FONT_TEXT         = QFont('Arial', 11)
+FONT_TEXT_CLS_BTN = QFont('Arial', 14, QFont.Bold)
+
+# Colors
+COLORS = {
+    'background':          QColor(0, 0, 0, int(0.5*255)),
+    'MODE_BTN_BG_DPS':     QColor(255, 100, 100, int(0.3*255)),
+    'MODE_BTN_BG_HPS':     QColor(100, 255, 100, int(0.3*255)),
+    'MODE_BTN_BG_DTS':     QColor(100, 100, 255, int(0.3*255)),
+    'title_bar':       QColor(70, 50,  30, int(0.8*255)),
+    'title_bar_dps':       QColor(160, 80,  80, int(0.6*255)),
+    'title_bar_hps':       QColor(80,  160,  80, int(0.6*255)),
+    'title_bar_dts':       QColor(80,  80,  160, int(0.6*255)),
+    'line_col':      QColor( 50,  50,  50, int(0.8*255)),
+    'button_active':   QColor(80,  200,  80, int(0.5*255)),
+    'button_noactive': QColor(200,  80,  80, int(0.5*255)),
+    'text':            QColor( 25,  25,  25),
+    'subtext':         QColor(  0,   0,   0),
+    'white':           QColor(255, 255, 255, int(1.0*255)),
+}